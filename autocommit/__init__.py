@@ -2,21 +2,40 @@
 GravityCommit - Automatic commit package for Python projects
 """
 
+import importlib
+
 __version__ = "1.5.5"
 __author__ = "BlackBoxAI"
 
-from .config_manager import ConfigManager
-from .commit_generator import CommitGenerator
-from .git_operations import GitOperations
-from .scheduler import Scheduler
-from .daemon_manager import DaemonManager
-from .project_monitor import ProjectMonitor
+# Public classes are imported on first access so that `import autocommit`
+# (and therefore the CLI) does not load GitPython or psutil up front.
+_LAZY_IMPORTS = {
+    "ConfigManager": ".config_manager",
+    "CommitGenerator": ".commit_generator",
+    "GitOperations": ".git_operations",
+    "Scheduler": ".scheduler",
+    "DaemonRuntime": ".runtime",
+    "DaemonManager": ".daemon_manager",
+    "ProjectMonitor": ".project_monitor",
+}
 
 __all__ = [
     "ConfigManager",
     "CommitGenerator",
     "GitOperations",
     "Scheduler",
+    "DaemonRuntime",
     "DaemonManager",
     "ProjectMonitor",
 ]
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,81 @@
+import logging
+from typing import Any, Dict
+
+class AdaptiveInterval:
+    """Tick interval that follows how fast a project changes
+
+    After idle_ticks consecutive ticks that found nothing to commit the
+    interval is multiplied by widen_factor; after busy_ticks consecutive
+    ticks that committed at least busy_files files it is divided by
+    tighten_factor. Ticks in between reset both streaks and leave the
+    interval alone, so a project that changes at a steady rate settles
+    instead of oscillating. The result always stays within
+    [minimum, maximum]. Disabled, it is just the configured interval.
+    """
+
+    def __init__(self, base: float, minimum: float = 1.0, maximum: float = 60.0, enabled: bool = True,
+                 idle_ticks: int = 3, busy_ticks: int = 2, busy_files: int = 20,
+                 widen_factor: float = 1.5, tighten_factor: float = 2.0):
+        self.idle_ticks = idle_ticks
+        self.busy_ticks = busy_ticks
+        self.busy_files = busy_files
+        self.widen_factor = widen_factor
+        self.tighten_factor = tighten_factor
+        self.logger = logging.getLogger(__name__)
+        self.base = None
+        self.current = None
+        self.configure(base, minimum, maximum, enabled)
+
+    def configure(self, base: float, minimum: float, maximum: float, enabled: bool):
+        """Apply configuration; a new base interval restarts from it"""
+        self.minimum = min(minimum, maximum)
+        self.maximum = max(minimum, maximum)
+        self.enabled = enabled
+        if base != self.base or not enabled:
+            self.base = base
+            self.current = base
+            self.idle_streak = 0
+            self.busy_streak = 0
+        if enabled:
+            self.current = self._clamp(self.current)
+
+    def observe(self, committed: int) -> bool:
+        """Feed the number of files a scheduled tick committed; True if the interval changed"""
+        if not self.enabled:
+            return False
+        if committed == 0:
+            self.idle_streak += 1
+            self.busy_streak = 0
+        elif committed >= self.busy_files:
+            self.busy_streak += 1
+            self.idle_streak = 0
+        else:
+            self.idle_streak = 0
+            self.busy_streak = 0
+            return False
+
+        previous = self.current
+        if self.idle_streak >= self.idle_ticks:
+            self.current = self._clamp(self.current * self.widen_factor)
+            self.idle_streak = 0
+        elif self.busy_streak >= self.busy_ticks:
+            self.current = self._clamp(self.current / self.tighten_factor)
+            self.busy_streak = 0
+        if self.current == previous:
+            return False
+        self.logger.info(f"Adaptive interval {previous:g} -> {self.current:g} minutes")
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'base': self.base,
+            'current': self.current,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'idle_streak': self.idle_streak,
+            'busy_streak': self.busy_streak,
+        }
+
+    def _clamp(self, minutes: float) -> float:
+        return round(max(self.minimum, min(self.maximum, minutes)), 3)
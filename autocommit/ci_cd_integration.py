@@ -1,13 +1,71 @@
 import os
 import json
+import time
+import threading
 import requests
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 
+class HookLatencyHistogram:
+    """Cumulative latency histogram for a single hook"""
+
+    BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000, 30000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.failures = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, failed: bool = False, timed_out: bool = False):
+        with self._lock:
+            index = len(self.BUCKETS_MS)
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    index = i
+                    break
+            self.counts[index] += 1
+            self.total += 1
+            self.sum_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if failed:
+                self.failures += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f"<={bound}ms": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+            buckets[f">{self.BUCKETS_MS[-1]}ms"] = self.counts[-1]
+            return {
+                'count': self.total,
+                'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+                'max_ms': self.max_ms,
+                'failures': self.failures,
+                'timeouts': self.timeouts,
+                'buckets': buckets
+            }
+
+def _timed_call(hook: Callable, args: tuple, kwargs: Dict[str, Any]):
+    """Run a hook and return (result, elapsed seconds); module-level so process pools can pickle it"""
+    start = time.perf_counter()
+    result = hook(*args, **kwargs)
+    return result, time.perf_counter() - start
+
 class CICDPipeline:
-    def __init__(self, project_path: str):
+    # Hooks that gate a commit run in registration order and stop at the first failure;
+    # every other hook type is fire-and-forget.
+    ORDERED_HOOKS = ('pre_commit',)
+
+    def __init__(self, project_path: str, max_workers: int = 4, default_timeout: float = 30.0):
         self.project_path = Path(project_path)
         self.logger = logging.getLogger(__name__)
         self.hooks = {
@@ -16,33 +74,170 @@ class CICDPipeline:
             'on_success': [],
             'on_failure': []
         }
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.hook_settings = {}
+        self.hook_latency = {}
+        self._thread_pool = None
+        self._process_pool = None
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook_type: str, callback: Callable, timeout: Optional[float] = None,
+                 use_process: bool = False, inline: bool = False):
+        """Add a hook for a specific event
 
-    def add_hook(self, hook_type: str, callback: Callable):
-        """Add a hook for a specific event"""
+        timeout overrides the pipeline default for this hook. use_process runs
+        the hook in a process pool, for CPU-heavy hooks; the callback must then
+        be picklable (a module-level function). inline runs a trivial,
+        non-blocking hook on the calling thread so it sees events in order.
+        """
         if hook_type in self.hooks:
             self.hooks[hook_type].append(callback)
+            self.hook_settings[(hook_type, len(self.hooks[hook_type]) - 1)] = {
+                'timeout': timeout,
+                'use_process': use_process,
+                'inline': inline
+            }
             self.logger.info(f"Added {hook_type} hook")
         else:
             self.logger.error(f"Unknown hook type: {hook_type}")
 
-    def trigger_hooks(self, hook_type: str, *args, **kwargs):
-        """Trigger all hooks of a specific type"""
-        if hook_type in self.hooks:
-            for hook in self.hooks[hook_type]:
-                try:
-                    hook(*args, **kwargs)
-                except Exception as e:
-                    self.logger.error(f"Hook execution failed: {e}")
+    def trigger_hooks(self, hook_type: str, *args, **kwargs) -> bool:
+        """Trigger all hooks of a specific type
+
+        pre_commit hooks run in order, each bounded by its timeout, and the
+        first one that raises, times out or returns False stops the chain and
+        makes this return False. Other hook types are submitted to the
+        executor and return immediately; use wait_for_hooks() to join them.
+        """
+        if hook_type not in self.hooks:
+            return False
+
+        if hook_type in self.ORDERED_HOOKS:
+            for index, hook in enumerate(self.hooks[hook_type]):
+                if not self._run_hook(hook_type, index, hook, args, kwargs):
+                    self.logger.warning(f"{hook_type} hook {self._hook_name(hook)} failed, stopping")
+                    return False
+            return True
+
+        for index, hook in enumerate(self.hooks[hook_type]):
+            self._submit_hook(hook_type, index, hook, args, kwargs)
+        return True
+
+    def wait_for_hooks(self, timeout: Optional[float] = None) -> bool:
+        """Wait for fire-and-forget hooks to finish; returns False on timeout"""
+        with self._lock:
+            pending = list(self._inflight)
+        done, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def get_hook_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-hook latency histograms, keyed by 'hook_type:hook_name'"""
+        with self._lock:
+            histograms = dict(self.hook_latency)
+        return {name: histogram.snapshot() for name, histogram in histograms.items()}
+
+    def shutdown(self, wait_for_hooks: bool = True):
+        """Shut down the hook executors"""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool:
+                pool.shutdown(wait=wait_for_hooks)
+        self._thread_pool = None
+        self._process_pool = None
+
+    def _run_hook(self, hook_type: str, index: int, hook: Callable, args: tuple, kwargs: Dict[str, Any]) -> bool:
+        settings = self.hook_settings.get((hook_type, index), {})
+        timeout = settings.get('timeout') or self.default_timeout
+        histogram = self._histogram(hook_type, hook)
+        start = time.perf_counter()
+        future = self._executor(settings).submit(_timed_call, hook, args, kwargs)
+        try:
+            result, elapsed = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # The hook keeps running in its worker but no longer holds up the commit
+            histogram.record((time.perf_counter() - start) * 1000, failed=True, timed_out=True)
+            self.logger.error(f"Hook {self._hook_name(hook)} timed out after {timeout}s")
+            return False
+        except Exception as e:
+            histogram.record((time.perf_counter() - start) * 1000, failed=True)
+            self.logger.error(f"Hook execution failed: {e}")
+            return False
+
+        histogram.record(elapsed * 1000, failed=result is False)
+        return result is not False
+
+    def _submit_hook(self, hook_type: str, index: int, hook: Callable, args: tuple, kwargs: Dict[str, Any]):
+        settings = self.hook_settings.get((hook_type, index), {})
+        timeout = settings.get('timeout') or self.default_timeout
+        histogram = self._histogram(hook_type, hook)
+        name = self._hook_name(hook)
+        if settings.get('inline'):
+            try:
+                result, elapsed = _timed_call(hook, args, kwargs)
+                histogram.record(elapsed * 1000, failed=result is False)
+            except Exception as e:
+                histogram.record(0.0, failed=True)
+                self.logger.error(f"Hook execution failed: {e}")
+            return
+
+        future = self._executor(settings).submit(_timed_call, hook, args, kwargs)
+        with self._lock:
+            self._inflight.add(future)
+
+        def on_done(done_future):
+            with self._lock:
+                self._inflight.discard(done_future)
+            try:
+                result, elapsed = done_future.result()
+                elapsed_ms = elapsed * 1000
+                timed_out = elapsed > timeout
+                histogram.record(elapsed_ms, failed=result is False or timed_out, timed_out=timed_out)
+                if timed_out:
+                    self.logger.warning(f"Hook {name} took {elapsed:.1f}s (timeout {timeout}s)")
+            except Exception as e:
+                histogram.record(0.0, failed=True)
+                self.logger.error(f"Hook execution failed: {e}")
+
+        future.add_done_callback(on_done)
+
+    def _executor(self, settings: Dict[str, Any]):
+        with self._lock:
+            if settings.get('use_process'):
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='autocommit-hook')
+            return self._thread_pool
+
+    def _histogram(self, hook_type: str, hook: Callable) -> HookLatencyHistogram:
+        key = f"{hook_type}:{self._hook_name(hook)}"
+        with self._lock:
+            if key not in self.hook_latency:
+                self.hook_latency[key] = HookLatencyHistogram()
+            return self.hook_latency[key]
+
+    @staticmethod
+    def _hook_name(hook: Callable) -> str:
+        return getattr(hook, '__qualname__', None) or getattr(hook, '__name__', None) or repr(hook)
 
 class GitHubActions(CICDPipeline):
-    def __init__(self, project_path: str, repo_owner: str, repo_name: str, token: str):
+    # ETag-cached responses kept for conditional requests, least recently used dropped first
+    STATUS_CACHE_SIZE = 256
+
+    def __init__(self, project_path: str, repo_owner: str, repo_name: str, token: str,
+                 api_url: str = "https://api.github.com"):
         super().__init__(project_path)
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.token = token
-        self.api_base = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+        self.api_base = f"{api_url.rstrip('/')}/repos/{repo_owner}/{repo_name}"
+        self.session = requests.Session()
+        self._status_cache = OrderedDict()
+        self._status_cache_lock = threading.Lock()
 
-    def trigger_workflow(self, workflow_name: str, inputs: Dict[str, Any] = None):
+    def trigger_workflow(self, workflow_name: str, inputs: Dict[str, Any] = None, ref: str = 'main'):
         """Trigger a GitHub Actions workflow"""
         url = f"{self.api_base}/actions/workflows/{workflow_name}/dispatches"
         headers = {
@@ -50,7 +245,7 @@ class GitHubActions(CICDPipeline):
             'Accept': 'application/vnd.github.v3+json'
         }
         data = {
-            'ref': 'main',  # or current branch
+            'ref': ref,
             'inputs': inputs or {}
         }
 
@@ -67,23 +262,190 @@ class GitHubActions(CICDPipeline):
             return False
 
     def get_workflow_status(self, run_id: str):
-        """Get the status of a workflow run"""
-        url = f"{self.api_base}/actions/runs/{run_id}"
+        """Get the status of a workflow run
+
+        Uses a conditional request against the last response's ETag, so an
+        unchanged run costs a 304 that does not count against the rate limit.
+        """
+        try:
+            return self.conditional_get(f"/actions/runs/{run_id}")
+        except Exception as e:
+            self.logger.error(f"Error getting workflow status: {e}")
+            return None
+
+    def conditional_get(self, path: str, params: Dict[str, Any] = None):
+        """GET an API path with If-None-Match, returning the cached body on 304"""
+        url = f"{self.api_base}{path}"
+        cache_key = (path, tuple(sorted((params or {}).items())))
         headers = {
             'Authorization': f'token {self.token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        with self._status_cache_lock:
+            cached = self._status_cache.get(cache_key)
+            if cached:
+                self._status_cache.move_to_end(cache_key)
+        if cached:
+            headers['If-None-Match'] = cached[0]
+
+        response = self.session.get(url, headers=headers, params=params, timeout=10)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code == 200:
+            data = response.json()
+            etag = response.headers.get('ETag')
+            if etag:
+                with self._status_cache_lock:
+                    self._status_cache[cache_key] = (etag, data)
+                    self._status_cache.move_to_end(cache_key)
+                    while len(self._status_cache) > self.STATUS_CACHE_SIZE:
+                        self._status_cache.popitem(last=False)
+            return data
+
+        self.logger.error(f"Failed to get workflow status: {response.text}")
+        return None
+
+    def cancel_superseded_runs(self, workflow_name: str, ref: str = 'main') -> int:
+        """Cancel queued and in-progress runs of a workflow on a ref"""
+        url = f"{self.api_base}/actions/workflows/{workflow_name}/runs"
+        headers = {
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+
+        cancelled = 0
+        for status in ('queued', 'in_progress'):
+            try:
+                response = requests.get(url, headers=headers, params={'branch': ref, 'status': status}, timeout=10)
+                if response.status_code != 200:
+                    self.logger.error(f"Failed to list workflow runs: {response.text}")
+                    continue
+                for run in response.json().get('workflow_runs', []):
+                    cancel = requests.post(f"{self.api_base}/actions/runs/{run['id']}/cancel", headers=headers, timeout=10)
+                    if cancel.status_code == 202:
+                        cancelled += 1
+            except Exception as e:
+                self.logger.error(f"Error cancelling superseded workflow runs: {e}")
+
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} superseded run(s) of '{workflow_name}'")
+        return cancelled
+
+class WorkflowStatusPoller:
+    """Track the status of many GitHub Actions runs with few API requests
+
+    Each poll makes one conditional request for the repository's recent runs
+    and answers every tracked run found there; only runs that have aged out
+    of that page are fetched individually. Runs are polled less often as they
+    age and dropped from polling once completed, keeping their last status.
+    """
+
+    def __init__(self, github: GitHubActions, min_interval: float = 10.0, max_interval: float = 300.0,
+                 page_size: int = 100, clock: Callable[[], float] = time.monotonic):
+        self.github = github
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.page_size = page_size
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.runs = {}
+        self.stats = {'polls': 0, 'requests': 0}
+
+    def track(self, run_id: Any):
+        """Start tracking a workflow run"""
+        run_id = str(run_id)
+        if run_id not in self.runs:
+            now = self.clock()
+            self.runs[run_id] = {'status': None, 'data': None, 'added': now, 'next_poll': now}
+
+    def untrack(self, run_id: Any):
+        """Stop tracking a workflow run"""
+        self.runs.pop(str(run_id), None)
+
+    def get_status(self, run_id: Any) -> Optional[Dict[str, Any]]:
+        """Get the last known data for a run without making a request"""
+        run = self.runs.get(str(run_id))
+        return run['data'] if run else None
 
+    def active_runs(self) -> list:
+        """Get tracked runs that have not completed yet"""
+        return [run_id for run_id, run in self.runs.items() if run['status'] != 'completed']
+
+    def next_poll_in(self) -> Optional[float]:
+        """Seconds until the next run is due, or None when nothing is active"""
+        deadlines = [self.runs[run_id]['next_poll'] for run_id in self.active_runs()]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - self.clock())
+
+    def poll(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Refresh due runs; returns the runs whose status changed"""
+        now = self.clock()
+        due = [run_id for run_id in self.active_runs() if force or self.runs[run_id]['next_poll'] <= now]
+        if not due:
+            return {}
+
+        self.stats['polls'] += 1
+        changed = {}
+        found = set()
+        self.stats['requests'] += 1
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Failed to get workflow status: {response.text}")
-                return None
+            listing = self.github.conditional_get("/actions/runs", {'per_page': self.page_size})
         except Exception as e:
-            self.logger.error(f"Error getting workflow status: {e}")
-            return None
+            self.logger.error(f"Error listing workflow runs: {e}")
+            listing = None
+
+        if listing:
+            by_id = {str(run['id']): run for run in listing.get('workflow_runs', [])}
+            for run_id in due:
+                if run_id in by_id:
+                    found.add(run_id)
+                    if self._update(run_id, by_id[run_id], now):
+                        changed[run_id] = by_id[run_id]
+
+        for run_id in due:
+            if run_id in found:
+                continue
+            self.stats['requests'] += 1
+            data = self.github.get_workflow_status(run_id)
+            if data and self._update(run_id, data, now):
+                changed[run_id] = data
+            elif not data:
+                self._reschedule(run_id, now)
+
+        return changed
+
+    def wait_for_completion(self, timeout: Optional[float] = None, sleep: Callable[[float], None] = time.sleep) -> bool:
+        """Poll until every tracked run has completed; returns False on timeout"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while self.active_runs():
+            self.poll()
+            wait_for = self.next_poll_in()
+            if wait_for is None:
+                break
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return False
+                wait_for = min(wait_for, remaining)
+            sleep(wait_for)
+        return True
+
+    def _update(self, run_id: str, data: Dict[str, Any], now: float) -> bool:
+        run = self.runs[run_id]
+        changed = run['data'] is None or run['status'] != data.get('status') or \
+            run['data'].get('conclusion') != data.get('conclusion')
+        run['data'] = data
+        run['status'] = data.get('status')
+        self._reschedule(run_id, now)
+        return changed
+
+    def _reschedule(self, run_id: str, now: float):
+        # Young runs change state quickly; long-running ones are checked less often
+        run = self.runs[run_id]
+        age = now - run['added']
+        interval = min(self.max_interval, max(self.min_interval, age / 10.0))
+        run['next_poll'] = now + interval
 
 class GitLabCI(CICDPipeline):
     def __init__(self, project_path: str, project_id: str, token: str, gitlab_url: str = "https://gitlab.com"):
@@ -118,6 +480,22 @@ class GitLabCI(CICDPipeline):
             self.logger.error(f"Error triggering GitLab CI pipeline: {e}")
             return None
 
+    def cancel_pipeline(self, pipeline_id: Any) -> bool:
+        """Cancel a running GitLab CI pipeline"""
+        url = f"{self.api_base}/pipelines/{pipeline_id}/cancel"
+        headers = {'PRIVATE-TOKEN': self.token}
+
+        try:
+            response = requests.post(url, headers=headers, timeout=10)
+            if response.status_code in [200, 201]:
+                self.logger.info(f"GitLab CI pipeline {pipeline_id} cancelled")
+                return True
+            self.logger.error(f"Failed to cancel pipeline {pipeline_id}: {response.text}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error cancelling GitLab CI pipeline: {e}")
+            return False
+
 class JenkinsCI(CICDPipeline):
     def __init__(self, project_path: str, jenkins_url: str, job_name: str, username: str = None, token: str = None):
         super().__init__(project_path)
@@ -152,16 +530,135 @@ class JenkinsCI(CICDPipeline):
             self.logger.error(f"Error triggering Jenkins build: {e}")
             return False
 
+class TriggerCoalescer:
+    """Collapse bursts of post-commit CI triggers into one pipeline run
+
+    Events submitted for a platform are held for ``window`` seconds after
+    the first one and then sent as a single trigger carrying the latest
+    sha. With ``window=None`` nothing fires until flush() is called, which
+    the daemon does at the end of every tick (CICDManager.end_tick()). ``min_interval`` enforces
+    a minimum spacing between triggers (seconds, or a dict per platform).
+    """
+
+    def __init__(self, manager: 'CICDManager', window: Optional[float] = 30.0,
+                 min_interval: Any = 0.0, cancel_superseded: bool = False):
+        self.manager = manager
+        self.window = window
+        self.min_interval = min_interval
+        self.cancel_superseded = cancel_superseded
+        self.logger = logging.getLogger(__name__)
+        self._pending = {}
+        self._timers = {}
+        self._last_trigger = {}
+        self._last_result = {}
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'triggered': 0}
+
+    def submit(self, platform: str, sha: Optional[str] = None, **kwargs):
+        """Record a post-commit event; the trigger is sent once the window closes"""
+        with self._lock:
+            self.stats['submitted'] += 1
+            pending = self._pending.get(platform)
+            if pending is None:
+                pending = {'sha': sha, 'kwargs': kwargs, 'events': 0}
+                self._pending[platform] = pending
+            else:
+                pending['kwargs'].update(kwargs)
+                if sha:
+                    pending['sha'] = sha
+            pending['events'] += 1
+
+            if self.window is not None and platform not in self._timers:
+                delay = max(self.window, self._spacing_delay(platform))
+                self._start_timer(platform, delay)
+
+    def flush(self, platform: Optional[str] = None) -> Dict[str, Any]:
+        """Send pending triggers now, unless minimum spacing defers them"""
+        if platform:
+            platforms = [platform]
+        else:
+            with self._lock:
+                platforms = list(self._pending.keys())
+        results = {}
+        for name in platforms:
+            with self._lock:
+                if name not in self._pending:
+                    continue
+                delay = self._spacing_delay(name)
+                if delay > 0:
+                    # Too soon after the previous trigger: keep collecting
+                    if name not in self._timers:
+                        self._start_timer(name, delay)
+                    continue
+                pending = self._pending.pop(name)
+                timer = self._timers.pop(name, None)
+                if timer:
+                    timer.cancel()
+                self._last_trigger[name] = time.monotonic()
+                previous = self._last_result.get(name)
+
+            if self.cancel_superseded:
+                self.manager.cancel_ci(name, previous, **pending['kwargs'])
+
+            self.logger.info(
+                f"Triggering {name} CI/CD for {pending['events']} commit(s)"
+                + (f" up to {pending['sha'][:8]}" if pending['sha'] else "")
+            )
+            result = self.manager.trigger_ci(name, sha=pending['sha'], **pending['kwargs'])
+            with self._lock:
+                self._last_result[name] = result
+                self.stats['triggered'] += 1
+            results[name] = result
+        return results
+
+    def pending_platforms(self) -> list:
+        """Get platforms with events waiting to be triggered"""
+        with self._lock:
+            return list(self._pending.keys())
+
+    def cancel(self):
+        """Drop all pending events and timers"""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers = {}
+            self._pending = {}
+
+    def _spacing_delay(self, platform: str) -> float:
+        if isinstance(self.min_interval, dict):
+            spacing = self.min_interval.get(platform, 0.0)
+        else:
+            spacing = self.min_interval or 0.0
+        last = self._last_trigger.get(platform)
+        if last is None or not spacing:
+            return 0.0
+        return max(0.0, last + spacing - time.monotonic())
+
+    def _start_timer(self, platform: str, delay: float):
+        timer = threading.Timer(delay, self._on_timer, args=(platform,))
+        timer.daemon = True
+        self._timers[platform] = timer
+        timer.start()
+
+    def _on_timer(self, platform: str):
+        with self._lock:
+            self._timers.pop(platform, None)
+        try:
+            self.flush(platform)
+        except Exception as e:
+            self.logger.error(f"Coalesced CI trigger failed for {platform}: {e}")
+
 class CICDManager:
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
         self.logger = logging.getLogger(__name__)
         self.integrations = {}
+        self.coalescer = TriggerCoalescer(self)
 
-    def add_github_actions(self, repo_owner: str, repo_name: str, token: str):
+    def add_github_actions(self, repo_owner: str, repo_name: str, token: str, api_url: str = "https://api.github.com"):
         """Add GitHub Actions integration"""
         self.integrations['github'] = GitHubActions(
-            str(self.project_path), repo_owner, repo_name, token
+            str(self.project_path), repo_owner, repo_name, token, api_url
         )
         self.logger.info("GitHub Actions integration added")
 
@@ -179,10 +676,17 @@ class CICDManager:
         )
         self.logger.info("Jenkins integration added")
 
-    def trigger_ci(self, platform: str, **kwargs):
-        """Trigger CI/CD pipeline for a specific platform"""
+    def trigger_ci(self, platform: str, sha: Optional[str] = None, **kwargs):
+        """Trigger CI/CD pipeline for a specific platform
+
+        When a commit sha is given it is passed to GitLab as the
+        AUTOCOMMIT_SHA variable; GitHub and Jenkins receive it only if a
+        ``sha_input`` or ``sha_parameter`` name is configured, since they
+        reject undeclared inputs.
+        """
         if platform in self.integrations:
             integration = self.integrations[platform]
+            kwargs = self._with_sha(platform, sha, kwargs)
 
             if platform == 'github':
                 return integration.trigger_workflow(**kwargs)
@@ -194,6 +698,56 @@ class CICDManager:
             self.logger.error(f"No integration configured for platform: {platform}")
             return False
 
+    def cancel_ci(self, platform: str, previous_result: Any = None, **kwargs) -> bool:
+        """Cancel pipelines superseded by a newer trigger, where the platform allows it"""
+        integration = self.integrations.get(platform)
+        if not integration:
+            return False
+
+        if platform == 'github' and kwargs.get('workflow_name'):
+            return integration.cancel_superseded_runs(kwargs['workflow_name'], kwargs.get('ref', 'main')) > 0
+        elif platform == 'gitlab' and isinstance(previous_result, dict) and previous_result.get('id'):
+            return integration.cancel_pipeline(previous_result['id'])
+
+        self.logger.debug(f"Cancelling superseded pipelines is not supported for {platform}")
+        return False
+
+    def configure_trigger_coalescing(self, window: Optional[float] = 30.0, min_interval: Any = 0.0,
+                                     cancel_superseded: bool = False):
+        """Configure how post-commit triggers are collapsed (window=None: flush per tick)"""
+        self.coalescer.cancel()
+        self.coalescer = TriggerCoalescer(self, window, min_interval, cancel_superseded)
+
+    def flush_triggers(self) -> Dict[str, Any]:
+        """Send any coalesced post-commit triggers now"""
+        return self.coalescer.flush()
+
+    def post_commit(self, sha: Optional[str]):
+        """Run every integration's post_commit hooks for a new commit"""
+        for integration in self.integrations.values():
+            integration.trigger_hooks('post_commit', sha)
+
+    def end_tick(self) -> Dict[str, Any]:
+        """Send the triggers held for this tick when coalescing per tick (window=None)"""
+        if self.coalescer.window is not None:
+            return {}
+        return self.coalescer.flush()
+
+    def _with_sha(self, platform: str, sha: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = dict(kwargs)
+        sha_input = kwargs.pop('sha_input', None)
+        sha_parameter = kwargs.pop('sha_parameter', None)
+        if not sha:
+            return kwargs
+
+        if platform == 'github' and sha_input:
+            kwargs['inputs'] = dict(kwargs.get('inputs') or {}, **{sha_input: sha})
+        elif platform == 'gitlab':
+            kwargs['variables'] = dict(kwargs.get('variables') or {}, AUTOCOMMIT_SHA=sha)
+        elif platform == 'jenkins' and sha_parameter:
+            kwargs['parameters'] = dict(kwargs.get('parameters') or {}, **{sha_parameter: sha})
+        return kwargs
+
     def get_available_platforms(self):
         """Get list of configured CI/CD platforms"""
         return list(self.integrations.keys())
@@ -207,11 +761,18 @@ class CICDManager:
 
             self.integrations[platform].add_hook('pre_commit', pre_commit_trigger)
 
-    def setup_post_commit_hook(self, platform: str, **kwargs):
-        """Setup post-commit hook to trigger CI/CD"""
+    def setup_post_commit_hook(self, platform: str, coalesce: bool = True, **kwargs):
+        """Setup post-commit hook to trigger CI/CD
+
+        By default commits are coalesced so a burst of autocommits results in
+        one pipeline run for the latest sha.
+        """
         if platform in self.integrations:
-            def post_commit_trigger():
-                self.logger.info(f"Triggering {platform} CI/CD after commit")
-                self.trigger_ci(platform, **kwargs)
+            def post_commit_trigger(sha: Optional[str] = None, *args, **hook_kwargs):
+                if coalesce:
+                    self.coalescer.submit(platform, sha, **kwargs)
+                else:
+                    self.logger.info(f"Triggering {platform} CI/CD after commit")
+                    self.trigger_ci(platform, sha=sha, **kwargs)
 
-            self.integrations[platform].add_hook('post_commit', post_commit_trigger)
+            self.integrations[platform].add_hook('post_commit', post_commit_trigger, inline=coalesce)
@@ -5,20 +5,47 @@ Command Line Interface for GravityCommit
 
 import sys
 import os
+import importlib
 from pathlib import Path
 import click
-from .config_manager import ConfigManager
-from .commit_generator import CommitGenerator
-from .git_operations import GitOperations
-from .scheduler import Scheduler
-from .daemon_manager import DaemonManager
-from .project_monitor import ProjectMonitor
-from .undo_manager import UndoManager
-from .statistics import Statistics
-from .notifications import NotificationManager
-from .ci_cd_integration import CICDManager
-
-@click.group()
+from .config_manager import ConfigManager, COMMIT_MODES, COMMIT_STRATEGIES
+from .control_socket import ControlClient, ControlError
+
+# Modules that pull in GitPython, psutil, requests or smtplib are imported
+# inside the commands that need them, so `autocommit --help`, `version` and
+# the daemon-client commands start without paying for them.
+
+class LazyGroup(click.Group):
+    """click.Group that imports some subcommands only when they are used
+
+    ``lazy_subcommands`` maps a command name to ``"module:attribute"``.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name):
+        module_name, attribute = self.lazy_subcommands.pop(cmd_name).split(':')
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy command {module_name}:{attribute} is not a click command")
+        self.add_command(command, cmd_name)
+        return command
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    'container-setup': 'autocommit.container_commands:container_setup',
+    'container-start': 'autocommit.container_commands:container_start',
+    'container-stop': 'autocommit.container_commands:container_stop',
+})
 def cli():
     """GravityCommit - Automatic commit tool for your projects"""
     pass
@@ -29,8 +56,14 @@ def cli():
 @click.option('--manual-override-open', is_flag=True, help='Manually override project open detection')
 @click.option('--additional-editors', default='', help='Comma-separated list of additional editor process names')
 @click.option('--custom-env-vars', default='', help='Comma-separated list of custom environment variables for detection')
-def setup(project_path, interval, manual_override_open, additional_editors, custom_env_vars):
+@click.option('--commit-strategy', type=click.Choice(COMMIT_STRATEGIES), default=None,
+              help='How each tick splits changes into commits (default: per-file)')
+@click.option('--commit-mode', type=click.Choice(COMMIT_MODES), default=None,
+              help='Commit to the branch, or snapshot to refs/autocommit/<branch> (default: branch)')
+def setup(project_path, interval, manual_override_open, additional_editors, custom_env_vars, commit_strategy, commit_mode):
     """Setup automatic commits for a project"""
+    from .daemon_manager import DaemonManager
+    from .project_registry import ProjectRegistry
     project_path = Path(project_path).resolve()
 
     # Check if it's a git repository
@@ -40,16 +73,23 @@ def setup(project_path, interval, manual_override_open, additional_editors, cust
 
     # Create configuration
     config = ConfigManager(str(project_path))
-    config.set_interval(interval)
-    config.set_manual_override_open(manual_override_open)
+    with config.batch():
+        config.set_interval(interval)
+        config.set_manual_override_open(manual_override_open)
+        if commit_strategy:
+            config.set_commit_strategy(commit_strategy)
+        if commit_mode:
+            config.set_commit_mode(commit_mode)
 
-    if additional_editors:
-        editors_list = [e.strip() for e in additional_editors.split(',') if e.strip()]
-        config.set_additional_editor_processes(editors_list)
+        if additional_editors:
+            editors_list = [e.strip() for e in additional_editors.split(',') if e.strip()]
+            config.set_additional_editor_processes(editors_list)
 
-    if custom_env_vars:
-        env_vars_list = [e.strip() for e in custom_env_vars.split(',') if e.strip()]
-        config.set_custom_env_vars(env_vars_list)
+        if custom_env_vars:
+            env_vars_list = [e.strip() for e in custom_env_vars.split(',') if e.strip()]
+            config.set_custom_env_vars(env_vars_list)
+
+    ProjectRegistry().register(str(project_path), mode='service', interval=interval)
 
     # Install service
     daemon = DaemonManager(str(project_path))
@@ -64,6 +104,8 @@ def setup(project_path, interval, manual_override_open, additional_editors, cust
 @click.argument('project_path', type=click.Path(exists=True))
 def remove(project_path):
     """Remove automatic commits from a project"""
+    from .daemon_manager import DaemonManager
+    from .project_registry import ProjectRegistry
     project_path = Path(project_path).resolve()
 
     # Stop and remove service
@@ -72,6 +114,7 @@ def remove(project_path):
         # Remove configuration
         config = ConfigManager(str(project_path))
         config.remove_config()
+        ProjectRegistry().unregister(str(project_path))
 
         click.echo(f"✓ AutoCommit removed from {project_path}")
     else:
@@ -83,6 +126,49 @@ def status(project_path):
     """Check the status of AutoCommit for a project"""
     project_path = Path(project_path).resolve()
 
+    # Ask the running daemon first; it already knows everything below
+    client = ControlClient(str(project_path))
+    if client.is_available():
+        try:
+            state = client.request('status')
+        except ControlError as e:
+            click.echo(f"✗ Daemon did not answer: {e}")
+        else:
+            click.echo(f"Project: {project_path}")
+            adaptive = state.get('adaptive_interval') or {}
+            if adaptive.get('enabled'):
+                click.echo(f"Interval: {state['interval']:g} minutes (adaptive, configured {state['configured_interval']:g}, "
+                           f"range {adaptive['minimum']:g}-{adaptive['maximum']:g})")
+            else:
+                click.echo(f"Interval: {state['interval']} minutes")
+            click.echo(f"Service running: True (pid {state['pid']})")
+            click.echo(f"Project open: {state['project_open']}")
+            pause = state.get('pause') or {}
+            if pause.get('paused'):
+                import datetime
+                until = (f"until {datetime.datetime.fromtimestamp(pause['until']):%H:%M}" if pause['until']
+                         else "until resumed")
+                click.echo(f"Paused: True ({pause['reason']}, {until})")
+            elif pause.get('condition'):
+                click.echo(f"Paused: True (while {pause['condition']})")
+            else:
+                click.echo(f"Paused: {state['paused']}")
+            if state['next_tick_in'] is not None:
+                click.echo(f"Next tick in: {state['next_tick_in']:.0f} seconds")
+            if state['last_result']:
+                click.echo(f"Last tick: {state['last_result'].get('committed', 0)} file(s) committed")
+            latency = state.get('tick_latency')
+            if latency and latency['duration']['count']:
+                start_delay = latency['start_delay'] or {'mean_ms': 0.0, 'max_ms': 0.0}
+                click.echo(f"Tick latency: start +{start_delay['mean_ms']:.0f}ms "
+                           f"(max {start_delay['max_ms']:.0f}ms), "
+                           f"slot wait {latency['slot_wait']['mean_ms']:.0f}ms "
+                           f"(max {latency['slot_wait']['max_ms']:.0f}ms, limit {state['max_concurrent_ticks'] or 'none'}), "
+                           f"duration {latency['duration']['mean_ms']:.0f}ms")
+            return
+
+    from .daemon_manager import DaemonManager
+    from .project_monitor import ProjectMonitor
     config = ConfigManager(str(project_path))
     daemon = DaemonManager(str(project_path))
     monitor = ProjectMonitor(str(project_path))
@@ -93,90 +179,19 @@ def status(project_path):
     click.echo(f"Project open: {monitor.is_project_open()}")
 
 @cli.command()
-@click.argument('project_path', type=click.Path(exists=True))
-def daemon(project_path):
-    """Run the daemon process (internal use)"""
-    project_path = Path(project_path).resolve()
-
-    config = ConfigManager(str(project_path))
-    git_ops = GitOperations(str(project_path))
-    commit_gen = CommitGenerator(str(project_path))
-    monitor = ProjectMonitor(str(project_path))
-    scheduler = Scheduler(config.get_interval())
-
-    def commit_callback():
-        if monitor.is_project_open():
-            if git_ops.has_changes():
-                status = git_ops.check_status()
-                changed_files = status['unstaged'] + status['untracked']
-
-                if changed_files:
-                    committed_count = 0
-                    for file_path in changed_files:
-                        # Determine change type
-                        if file_path in status['untracked']:
-                            change_type = 'added'
-                        elif file_path in status['unstaged']:
-                            change_type = 'modified'
-                        else:
-                            change_type = 'modified'  # fallback
-
-                        # Generate commit message for this file
-                        message = commit_gen.generate_single_file_commit(file_path, change_type)
-
-                        # Commit this file separately
-                        if git_ops.commit_single_file(file_path, message):
-                            click.echo(f"✓ Committed {file_path}: {message}")
-                            committed_count += 1
-                        else:
-                            click.echo(f"✗ Failed to commit {file_path}")
-
-                    if committed_count == 0:
-                        click.echo("✗ No files were committed")
-                    else:
-                        click.echo(f"✓ Committed {committed_count} file(s)")
-                else:
-                    click.echo("No changes to commit")
-            else:
-                click.echo("No changes detected")
-        else:
-            click.echo("Project not open, skipping commit")
-
-    click.echo(f"Starting AutoCommit daemon for {project_path}")
-    scheduler.start(commit_callback)
-
-    # Keep the daemon running
-    try:
-        while True:
-            import time
-            time.sleep(1)
-    except KeyboardInterrupt:
-        click.echo("Stopping daemon...")
-        scheduler.stop()
-
-@cli.command()
-@click.argument('project_path', type=click.Path(exists=True))
-@click.option('--interval', default=5, help='Commit interval in minutes')
-@click.option('--background', is_flag=True, help='Run in background (detached from terminal)')
-def container_setup(project_path, interval, background):
-    """Setup auto-commit for container environments (no systemd required)"""
-    from .container_commands import container_setup as _container_setup
-    _container_setup.callback(project_path, interval, background)
-
-@cli.command()
-@click.argument('project_path', type=click.Path(exists=True))
-@click.option('--background', is_flag=True, help='Run in background (detached from terminal)')
-def container_start(project_path, background):
-    """Start auto-commit daemon for container environments"""
-    from .container_commands import container_start as _container_start
-    _container_start.callback(project_path, background)
-
-@cli.command()
-@click.argument('project_path', type=click.Path(exists=True))
-def container_stop(project_path):
-    """Stop auto-commit daemon for container environments"""
-    from .container_commands import container_stop as _container_stop
-    _container_stop.callback(project_path)
+@click.argument('project_paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--workers', default=4, help='Threads shared by all projects for ticks and other blocking work')
+def daemon(project_paths, workers):
+    """Run the daemon process for one or more projects (internal use)"""
+    from .project_daemon import ProjectDaemon
+    from .runtime import DaemonRuntime
+
+    daemons = []
+    for project_path in project_paths:
+        project_path = Path(project_path).resolve()
+        click.echo(f"Starting AutoCommit daemon for {project_path}")
+        daemons.append(ProjectDaemon(str(project_path), echo=click.echo))
+    DaemonRuntime(daemons, max_workers=workers, echo=click.echo).run_forever()
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
@@ -184,6 +199,7 @@ def container_stop(project_path):
 @click.option('--keep-changes', is_flag=True, help='Keep changes staged after undo')
 def undo(project_path, count, keep_changes):
     """Undo recent commits"""
+    from .undo_manager import UndoManager
     undo_manager = UndoManager(str(project_path))
 
     if count == 1:
@@ -203,6 +219,7 @@ def undo(project_path, count, keep_changes):
 @click.argument('project_path', type=click.Path(exists=True))
 def undo_preview(project_path):
     """Preview recent commits that can be undone"""
+    from .undo_manager import UndoManager
     undo_manager = UndoManager(str(project_path))
     undo_manager.show_undo_preview()
 
@@ -210,6 +227,7 @@ def undo_preview(project_path):
 @click.argument('project_path', type=click.Path(exists=True))
 def stats(project_path):
     """Show commit statistics"""
+    from .statistics import Statistics
     stats = Statistics(str(project_path))
     commit_stats = stats.get_commit_stats()
     progress = stats.get_progress_report()
@@ -235,6 +253,7 @@ def stats(project_path):
 @click.option('--message', default='Test notification', help='Custom message')
 def notify(project_path, notification_type, message):
     """Send a test notification"""
+    from .notifications import NotificationManager
     notifier = NotificationManager(str(project_path))
 
     # Setup basic desktop notification for testing
@@ -259,6 +278,7 @@ def notify(project_path, notification_type, message):
 @click.option('--ref', default='main', help='Git reference/branch')
 def trigger_ci(project_path, platform, workflow, job, ref):
     """Trigger CI/CD pipeline for a platform"""
+    from .ci_cd_integration import CICDManager
     ci_manager = CICDManager(str(project_path))
 
     kwargs = {'ref': ref}
@@ -275,128 +295,323 @@ def trigger_ci(project_path, platform, workflow, job, ref):
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
-def commit_now(project_path):
+@click.option('--dry-run', is_flag=True, help='Show what would be committed without committing')
+@click.option('--strategy', type=click.Choice(COMMIT_STRATEGIES), default=None,
+              help='Override the configured commit strategy for this run')
+def commit_now(project_path, dry_run, strategy):
     """Force immediate commit of current changes"""
     project_path = Path(project_path).resolve()
+
+    # Let a running daemon do it so it doesn't race with its own tick
+    client = ControlClient(str(project_path), timeout=300)
+    if client.is_available() and not strategy:
+        try:
+            result = client.request('commit_now', dry_run=dry_run)
+        except ControlError as e:
+            click.echo(f"✗ Daemon commit failed: {e}")
+            return
+        from .commit_pipeline import echo_result
+        echo_result(result, click.echo)
+        return
+
+    from .commit_pipeline import CommitPipeline, echo_run
     config = ConfigManager(str(project_path))
-    git_ops = GitOperations(str(project_path))
-    commit_gen = CommitGenerator(str(project_path))
-
-    if git_ops.has_changes():
-        status = git_ops.check_status()
-        changed_files = status['unstaged'] + status['untracked']
-
-        if changed_files:
-            committed_count = 0
-            for file_path in changed_files:
-                # Determine change type
-                if file_path in status['untracked']:
-                    change_type = 'added'
-                elif file_path in status['unstaged']:
-                    change_type = 'modified'
-                else:
-                    change_type = 'modified'
+    strategy = strategy or config.get_commit_strategy()
+    pipeline = CommitPipeline(str(project_path), strategy=strategy, mode=config.get_commit_mode(),
+                              large_file_threshold=int(config.get_large_file_threshold_mb() * 1024 * 1024),
+                              large_file_policy=config.get_large_file_policy(),
+                              backend=config.get_commit_backend())
+    run = pipeline.run(dry_run=dry_run)
+    echo_run(run, click.echo)
 
-                # Generate commit message for this file
-                message = commit_gen.generate_single_file_commit(file_path, change_type)
+@cli.command()
+@click.argument('project_path', type=click.Path(exists=True))
+@click.option('--squash', is_flag=True, help='Add one commit with the latest snapshot instead of fast-forwarding')
+@click.option('--message', default=None, help='Message for the squashed commit')
+@click.option('--discard', is_flag=True, help='Delete the snapshots without touching the branch')
+def materialize(project_path, squash, message, discard):
+    """Move snapshot-mode commits onto the current branch"""
+    from .git_operations import GitOperations
+    git_ops = GitOperations(str(Path(project_path).resolve()))
+    ref = git_ops.get_shadow_ref()
+    shadow_sha = git_ops.resolve_ref(ref)
+    if shadow_sha is None:
+        click.echo(f"No snapshots on {ref}")
+        return
 
-                # Commit this file separately
-                if git_ops.commit_single_file(file_path, message):
-                    click.echo(f"✓ Committed {file_path}: {message}")
-                    committed_count += 1
-                else:
-                    click.echo(f"✗ Failed to commit {file_path}")
+    head_sha = git_ops.resolve_ref('HEAD')
+    count = git_ops.count_commits(f"{head_sha}..{shadow_sha}" if head_sha else shadow_sha)
+    if discard:
+        git_ops.discard_snapshots(ref)
+        click.echo(f"✓ Discarded {count} snapshot(s) from {ref}")
+        return
 
-            if committed_count == 0:
-                click.echo("✗ No files were committed")
-            else:
-                click.echo(f"✓ Committed {committed_count} file(s) immediately")
-        else:
-            click.echo("No changes to commit")
+    from .repo_lock import RepoBusyError, RepoLock
+    try:
+        with RepoLock(str(Path(project_path).resolve())):
+            new_sha = git_ops.materialize_snapshots(ref, squash=squash, message=message)
+    except (ValueError, RepoBusyError) as e:
+        click.echo(f"✗ {e}")
+        return
+    if squash:
+        click.echo(f"✓ Squashed {count} snapshot(s) into {new_sha[:8]}")
     else:
-        click.echo("No changes detected")
+        click.echo(f"✓ Fast-forwarded branch by {count} snapshot(s) to {new_sha[:8]}")
+
+@cli.command()
+@click.argument('project_path', type=click.Path(exists=True))
+@click.option('--budget', type=float, default=None, help='Seconds to spend before stopping (default: from config)')
+@click.option('--cancel', is_flag=True, help="Cancel the running daemon's maintenance")
+def maintenance(project_path, budget, cancel):
+    """Repack, write the commit-graph and prune the repository now"""
+    project_path = Path(project_path).resolve()
+
+    client = ControlClient(str(project_path))
+    if client.is_available() and budget is None:
+        try:
+            if cancel:
+                result = client.request('maintenance_cancel')
+                click.echo("✓ Maintenance cancelled" if result['cancelled'] else "No maintenance running")
+            else:
+                result = client.request('maintenance')
+                click.echo("✓ Maintenance started by the daemon" if result['started'] else "Maintenance already running")
+        except ControlError as e:
+            click.echo(f"✗ Daemon did not answer: {e}")
+        return
+    if cancel:
+        click.echo("No daemon running for this project")
+        return
+
+    from .maintenance import MaintenanceRunner
+    config = ConfigManager(str(project_path))
+    runner = MaintenanceRunner(str(project_path), budget or config.get_maintenance_budget_seconds())
+    try:
+        result = runner.run()
+    except KeyboardInterrupt:
+        click.echo("✗ Maintenance interrupted")
+        return
+    for name, seconds in result['timings'].items():
+        status = '✓' if name in result['completed'] else '✗'
+        click.echo(f"{status} {name} ({seconds:.1f}s)")
+    if result['stopped']:
+        click.echo(f"Stopped ({result['stopped']}); {len(result['pending'])} task(s) left for next time")
+
+CATCH_UP_OPTION = click.option('--catch-up', type=click.Choice(['once', 'skip']), default=None,
+                               help='Run a time missed while the host slept once, or skip it '
+                                    '(default: schedule_catch_up from config)')
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 @click.argument('time_str')
-def schedule_at(project_path, time_str):
-    """Schedule commits at a specific time (HH:MM format)"""
-    scheduler = Scheduler(0)  # Time-based scheduling
-    scheduler.schedule_at_time(time_str, lambda: click.echo(f"Scheduled commit executed at {time_str}"))
-    click.echo(f"✓ Scheduled daily commit at {time_str}")
+@CATCH_UP_OPTION
+def schedule_at(project_path, time_str, catch_up):
+    """Schedule daily commits at a specific time (HH:MM format)"""
+    _add_schedule(project_path, {'type': 'daily', 'time': time_str, 'catch_up': catch_up})
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 @click.argument('day')
 @click.argument('time_str')
-def schedule_weekly(project_path, day, time_str):
+@CATCH_UP_OPTION
+def schedule_weekly(project_path, day, time_str, catch_up):
     """Schedule weekly commits on specific day and time"""
-    scheduler = Scheduler(0)  # Time-based scheduling
-    scheduler.schedule_weekly(day, time_str, lambda: click.echo(f"Weekly commit executed on {day} at {time_str}"))
-    click.echo(f"✓ Scheduled weekly commit on {day} at {time_str}")
+    _add_schedule(project_path, {'type': 'weekly', 'day': day, 'time': time_str, 'catch_up': catch_up})
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 def schedule_list(project_path):
     """List all scheduled jobs"""
-    scheduler = Scheduler(0)
-    jobs = scheduler.get_scheduled_jobs()
-    if jobs:
-        click.echo("Scheduled jobs:")
-        for job in jobs:
-            click.echo(f"  - {job}")
-    else:
+    import datetime
+    client = ControlClient(str(Path(project_path).resolve()))
+    try:
+        # The daemon already knows when each schedule fires next
+        jobs = client.request('schedule_list')
+        running = True
+    except ControlError:
+        from .schedule_store import ScheduleStore
+        from .scheduler import describe_schedule
+        store = ScheduleStore(str(Path(project_path).resolve()))
+        jobs = [{'description': describe_schedule(spec), 'catch_up': spec['catch_up'],
+                 'last_run': store.last_run(spec['id'])} for spec in store.list()]
+        running = False
+    if not jobs:
         click.echo("No scheduled jobs")
+        return
+    click.echo("Scheduled jobs:" if running else "Scheduled jobs (daemon not running):")
+    for job in jobs:
+        line = f"  - {job['description']} (catch-up: {job['catch_up']})"
+        if job.get('next_run'):
+            line += f", next {datetime.datetime.fromtimestamp(job['next_run']):%Y-%m-%d %H:%M}"
+        if job.get('last_run'):
+            line += f", last {datetime.datetime.fromtimestamp(job['last_run']):%Y-%m-%d %H:%M}"
+        click.echo(line)
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 def schedule_clear(project_path):
     """Clear all scheduled jobs"""
-    scheduler = Scheduler(0)
-    scheduler.clear_schedule()
+    from .schedule_store import ScheduleStore
+    ScheduleStore(str(Path(project_path).resolve())).clear()
+    _reload_daemon(project_path)
     click.echo("✓ All scheduled jobs cleared")
 
+def _add_schedule(project_path, spec):
+    from .schedule_store import ScheduleStore
+    from .scheduler import describe_schedule
+    try:
+        spec = ScheduleStore(str(Path(project_path).resolve())).add(spec)
+    except ValueError as e:
+        click.echo(f"✗ {e}")
+        return
+    _reload_daemon(project_path)
+    click.echo(f"✓ Scheduled commit {describe_schedule(spec)}")
+
+def _reload_daemon(project_path):
+    """Make a running daemon pick up configuration written by this process"""
+    client = ControlClient(str(Path(project_path).resolve()))
+    if client.is_available():
+        try:
+            client.request('reload')
+        except ControlError as e:
+            click.echo(f"✗ Daemon did not reload: {e}")
+
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
-@click.option('--duration', default=30, help='Pause duration in minutes')
+@click.option('--duration', default=30, help='Pause duration in minutes (0 = until resumed)')
 def pause(project_path, duration):
-    """Pause auto-commits temporarily"""
-    scheduler = Scheduler(0)
-    scheduler.pause_scheduling()
-    click.echo(f"✓ Auto-commits paused for {duration} minutes")
+    """Pause auto-commits temporarily
+
+    To hold commits back automatically, e.g. during builds, set
+    pause_when_processes and pause_when_load_above with `config --set`.
+    """
+    if _daemon_request(project_path, 'pause', duration=duration or None) is not None:
+        if duration:
+            click.echo(f"✓ Auto-commits paused for {duration} minutes")
+        else:
+            click.echo("✓ Auto-commits paused until resumed")
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 def resume(project_path):
     """Resume paused auto-commits"""
-    scheduler = Scheduler(0)
-    scheduler.resume_scheduling()
-    click.echo("✓ Auto-commits resumed")
+    if _daemon_request(project_path, 'resume') is not None:
+        click.echo("✓ Auto-commits resumed")
+
+@cli.command()
+@click.argument('project_path', type=click.Path(exists=True))
+def reload(project_path):
+    """Make the running daemon re-read its configuration"""
+    result = _daemon_request(project_path, 'reload')
+    if result is not None:
+        click.echo(f"✓ Configuration reloaded (interval: {result['interval']} minutes)")
+
+@cli.command()
+@click.argument('project_path', type=click.Path(exists=True))
+def watch(project_path):
+    """Stream live tick events from the running daemon"""
+    client = ControlClient(str(Path(project_path).resolve()))
+    try:
+        for event in client.subscribe():
+            if event.get('type') == 'tick':
+                if event.get('skipped'):
+                    click.echo(f"tick: skipped ({event['skipped']})")
+                else:
+                    click.echo(f"tick: {event.get('committed', 0)} committed, {event.get('failed', 0)} failed "
+                               f"in {event.get('duration', 0):.2f}s")
+            else:
+                click.echo(f"{event.get('type')}: {event}")
+    except ControlError as e:
+        click.echo(f"✗ {e}")
+    except KeyboardInterrupt:
+        pass
+
+def _daemon_request(project_path, cmd, **args):
+    """Send a control command to the project's daemon, printing an error if it isn't running"""
+    client = ControlClient(str(Path(project_path).resolve()))
+    try:
+        return client.request(cmd, **args)
+    except ControlError as e:
+        click.echo(f"✗ No running AutoCommit daemon for {project_path} ({e})")
+        return None
 
 @cli.command()
 def list_projects():
     """List all configured projects"""
-    # This would need to scan for config files
+    import datetime
+    from .project_registry import ProjectRegistry
+    projects = ProjectRegistry().list_projects()
+    if not projects:
+        click.echo("No configured projects")
+        return
+
     click.echo("Configured projects:")
-    click.echo("Note: This feature requires config file scanning implementation")
+    for project in projects:
+        running = ProjectRegistry.is_pid_running(project['daemon_pid'])
+        last_tick = 'never'
+        if project['last_tick']:
+            last_tick = datetime.datetime.fromtimestamp(project['last_tick']).strftime('%Y-%m-%d %H:%M:%S')
+        open_state = {True: 'open', False: 'closed', None: 'unknown'}[project['project_open']]
+        sha = (project['last_commit_sha'] or '')[:8] or '-'
+        click.echo(f"  {project['path']}")
+        click.echo(f"    mode: {project['mode']}  daemon: {'running (pid ' + str(project['daemon_pid']) + ')' if running else 'stopped'}"
+                   f"  project: {open_state}  last tick: {last_tick}  last commit: {sha}")
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
-def config(project_path):
+@click.option('--set', 'assignments', multiple=True, help='Set a value (KEY=VALUE, VALUE parsed as JSON when possible)')
+@click.option('--global', 'global_scope', is_flag=True, help='Apply --set to the user-global defaults instead of the project')
+def config(project_path, assignments, global_scope):
     """Show/edit configuration for a project"""
+    import json
     config = ConfigManager(str(project_path))
 
+    if assignments:
+        values = {}
+        for assignment in assignments:
+            if '=' not in assignment:
+                click.echo(f"✗ Expected KEY=VALUE, got: {assignment}")
+                return
+            key, raw_value = assignment.split('=', 1)
+            try:
+                values[key.strip()] = json.loads(raw_value)
+            except ValueError:
+                values[key.strip()] = raw_value
+        try:
+            if global_scope:
+                for key, value in values.items():
+                    config.set_global_value(key, value)
+            else:
+                config.update(values)
+        except ValueError as e:
+            click.echo(f"✗ {e}")
+            return
+        scope = f"global defaults ({config.global_layer.path})" if global_scope else "project"
+        click.echo(f"✓ Updated {scope}: {', '.join(values)}")
+
     click.echo(f"Configuration for {project_path}:")
-    click.echo(f"  Interval: {config.get_interval()} minutes")
-    click.echo(f"  Manual override: {config.get_manual_override_open()}")
-    click.echo(f"  Additional editors: {config.get_additional_editor_processes()}")
-    click.echo(f"  Custom env vars: {config.get_custom_env_vars()}")
+    click.echo(f"  Interval: {config.get_interval()} minutes ({config.get_value_source('interval')})")
+    click.echo(f"  Adaptive interval: {config.get_adaptive_interval()}, {config.get_min_interval()}-"
+               f"{config.get_max_interval()} minutes ({config.get_value_source('adaptive_interval')})")
+    click.echo(f"  Manual override: {config.get_manual_override_open()} ({config.get_value_source('manual_override_open')})")
+    click.echo(f"  Additional editors: {config.get_additional_editor_processes()} ({config.get_value_source('additional_editor_processes')})")
+    click.echo(f"  Custom env vars: {config.get_custom_env_vars()} ({config.get_value_source('custom_env_vars')})")
+    click.echo(f"  Commit strategy: {config.get_commit_strategy()} ({config.get_value_source('commit_strategy')})")
+    click.echo(f"  Commit mode: {config.get_commit_mode()} ({config.get_value_source('commit_mode')})")
+    click.echo(f"  Commit backend: {config.get_commit_backend()} ({config.get_value_source('commit_backend')})")
+    click.echo(f"  Large files: {config.get_large_file_policy()} above {config.get_large_file_threshold_mb()} MB "
+               f"({config.get_value_source('large_file_policy')})")
+    click.echo(f"  Tick spread: {config.get_tick_spread()}, jitter {config.get_tick_jitter_seconds()}s, "
+               f"at most {config.get_max_concurrent_ticks() or 'unlimited'} concurrent "
+               f"({config.get_value_source('max_concurrent_ticks')})")
+    click.echo(f"  Pause while: processes {config.get_pause_when_processes()}, load above "
+               f"{config.get_pause_when_load_above() or 'never'} ({config.get_value_source('pause_when_processes')})")
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True))
 @click.option('--limit', default=10, help='Number of recent commits to show')
 def logs(project_path, limit):
     """Show recent commit logs"""
+    from .undo_manager import UndoManager
     undo_manager = UndoManager(str(project_path))
     recent_commits = undo_manager.get_recent_commits(limit)
 
@@ -415,10 +630,18 @@ def logs(project_path, limit):
 def version():
     """Show GravityCommit version"""
     try:
-        import pkg_resources
-        version = pkg_resources.get_distribution('gravitycommit').version
-    except:
-        version = "1.5.5"  # fallback from setup.py
+        from importlib.metadata import version as distribution_version, PackageNotFoundError
+    except ImportError:  # Python 3.7
+        distribution_version = None
+
+    version = None
+    if distribution_version is not None:
+        try:
+            version = distribution_version('gravitycommit')
+        except PackageNotFoundError:
+            pass
+    if version is None:
+        from . import __version__ as version  # running from a source checkout
 
     click.echo(f"GravityCommit v{version}")
 
@@ -3,6 +3,9 @@ from pathlib import Path
 from typing import List, Dict, Tuple
 
 class CommitGenerator:
+    # How much of a file is scanned for content keywords
+    CONTENT_SCAN_CHARS = 64 * 1024
+
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
 
@@ -37,7 +40,12 @@ class CommitGenerator:
 
         # Analyze changes and categorize by commit type
         categorized_changes = self._categorize_changes_by_type(changes)
+        return self.generate_grouped_commit(categorized_changes)
 
+    def generate_grouped_commit(self, categorized_changes: Dict[str, List[str]]) -> str:
+        """
+        Generate one message for files already grouped by commit type
+        """
         message_parts = []
         for commit_type, files in categorized_changes.items():
             if files:
@@ -117,13 +125,15 @@ class CommitGenerator:
             categories[category] = categories.get(category, 0) + 1
         return categories
 
-    def generate_single_file_commit(self, file_path: str, change_type: str) -> str:
+    def generate_single_file_commit(self, file_path: str, change_type: str, commit_type: str = None) -> str:
         """
         Generate a commit message for a single file change
         change_type: 'added', 'modified', or 'deleted'
+        commit_type: already detected type, to avoid classifying the file twice
         """
         file_desc = self._get_file_description(file_path)
-        commit_type = self._detect_commit_type(file_path, change_type)
+        if commit_type is None:
+            commit_type = self._detect_commit_type(file_path, change_type)
 
         # Use progress-oriented format with appropriate action verbs
         type_label = self._get_type_label(commit_type)
@@ -153,7 +163,7 @@ class CommitGenerator:
         for change_type, files in changes.items():
             for file_path in files:
                 commit_type = self._detect_commit_type(file_path, change_type)
-                categorized[commit_type].append(file_path)
+                categorized.setdefault(commit_type, []).append(file_path)
 
         return categorized
 
@@ -230,7 +240,9 @@ class CommitGenerator:
         try:
             full_path = self.project_path / file_path
             if full_path.exists() and full_path.is_file():
-                content = full_path.read_text().lower()
+                # Only the start of the file, so huge files are never read whole
+                with open(full_path, 'r') as f:
+                    content = f.read(self.CONTENT_SCAN_CHARS).lower()
 
                 # Prioritize specific types over progress for content detection
                 priority_types = ['complete', 'deploy', 'review', 'start', 'milestone']
@@ -0,0 +1,317 @@
+import heapq
+import mmap
+import struct
+import logging
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from gitdb.exc import BadName, BadObject
+
+SIGNATURE = b'CGPH'
+
+CHUNK_OID_FANOUT = b'OIDF'
+CHUNK_OID_LOOKUP = b'OIDL'
+CHUNK_COMMIT_DATA = b'CDAT'
+CHUNK_EXTRA_EDGES = b'EDGE'
+
+HASH_LEN = 20
+PARENT_NONE = 0x70000000
+EXTRA_EDGES_NEEDED = 0x80000000
+LAST_EDGE = 0x80000000
+
+# Generation of commits the graph does not know about (newer than the graph)
+GENERATION_INFINITY = float('inf')
+
+class _GraphFile:
+    """One memory-mapped commit-graph file (a single graph or one layer of a chain)"""
+
+    def __init__(self, path: Path, base_count: int):
+        self.path = path
+        self.base_count = base_count
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self.data
+        if data[:4] != SIGNATURE or data[4] != 1 or data[5] != 1:
+            self.close()
+            raise ValueError(f"{path} is not a version 1 SHA-1 commit-graph")
+
+        num_chunks = data[6]
+        chunks = {}
+        for i in range(num_chunks):
+            chunk_id, offset = struct.unpack_from('>4sQ', data, 8 + 12 * i)
+            chunks[chunk_id] = offset
+        for required in (CHUNK_OID_FANOUT, CHUNK_OID_LOOKUP, CHUNK_COMMIT_DATA):
+            if required not in chunks:
+                self.close()
+                raise ValueError(f"{path} has no {required.decode()} chunk")
+
+        self.fanout = chunks[CHUNK_OID_FANOUT]
+        self.oids = chunks[CHUNK_OID_LOOKUP]
+        self.commit_data = chunks[CHUNK_COMMIT_DATA]
+        self.edges = chunks.get(CHUNK_EXTRA_EDGES)
+        self.num_commits = struct.unpack_from('>I', data, self.fanout + 4 * 255)[0]
+
+    def find(self, binsha: bytes) -> Optional[int]:
+        first = binsha[0]
+        lo = struct.unpack_from('>I', self.data, self.fanout + 4 * (first - 1))[0] if first else 0
+        hi = struct.unpack_from('>I', self.data, self.fanout + 4 * first)[0]
+        oids = self.oids
+        data = self.data
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = oids + mid * HASH_LEN
+            current = data[start:start + HASH_LEN]
+            if current < binsha:
+                lo = mid + 1
+            elif current > binsha:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def close(self):
+        self.data.close()
+
+class CommitGraph:
+    """Read-only view of a repository's commit-graph, through mmap
+
+    Supports both a single objects/info/commit-graph file and a split
+    commit-graph chain. Commits are addressed by their position in the
+    graph; parents, commit times and generation numbers (topological
+    levels) are read straight from the file without parsing any object.
+    """
+
+    def __init__(self, layers: List[_GraphFile]):
+        self.layers = layers
+        self._starts = [layer.base_count for layer in layers]
+
+    @classmethod
+    def load(cls, git_dir: Union[str, Path]) -> Optional['CommitGraph']:
+        """Open the graph of a git directory; None if it has none or it cannot be used"""
+        git_dir = Path(git_dir)
+        # A linked worktree's objects live in the common directory
+        common_dir = git_dir / 'commondir'
+        if common_dir.exists():
+            git_dir = (git_dir / common_dir.read_text().strip()).resolve()
+        info = git_dir / 'objects' / 'info'
+        # Shallow clones and grafts change parents; git ignores the graph then
+        if (git_dir / 'shallow').exists() or (info / 'grafts').exists():
+            return None
+
+        chain = info / 'commit-graphs' / 'commit-graph-chain'
+        if chain.exists():
+            paths = [info / 'commit-graphs' / f"graph-{line.strip()}.graph"
+                     for line in chain.read_text().splitlines() if line.strip()]
+        elif (info / 'commit-graph').exists():
+            paths = [info / 'commit-graph']
+        else:
+            return None
+
+        layers = []
+        try:
+            base_count = 0
+            for path in paths:
+                layer = _GraphFile(path, base_count)
+                if layer.num_commits == 0:
+                    layer.close()
+                    continue
+                layers.append(layer)
+                base_count += layer.num_commits
+        except (OSError, ValueError, struct.error) as e:
+            logging.getLogger(__name__).warning(f"Ignoring unreadable commit-graph: {e}")
+            for layer in layers:
+                layer.close()
+            return None
+        return cls(layers) if layers else None
+
+    def __len__(self) -> int:
+        last = self.layers[-1]
+        return last.base_count + last.num_commits
+
+    def position(self, sha: str) -> Optional[int]:
+        """Position of a commit in the graph, or None if it is not in it"""
+        binsha = bytes.fromhex(sha)
+        for layer in self.layers:
+            index = layer.find(binsha)
+            if index is not None:
+                return layer.base_count + index
+        return None
+
+    def sha(self, position: int) -> str:
+        layer, index = self._locate(position)
+        start = layer.oids + index * HASH_LEN
+        return layer.data[start:start + HASH_LEN].hex()
+
+    def parents(self, position: int) -> List[int]:
+        layer, index = self._locate(position)
+        offset = layer.commit_data + index * (HASH_LEN + 16) + HASH_LEN
+        parent1, parent2 = struct.unpack_from('>II', layer.data, offset)
+        parents = []
+        if parent1 != PARENT_NONE:
+            parents.append(parent1)
+        if parent2 == PARENT_NONE:
+            return parents
+        if not parent2 & EXTRA_EDGES_NEEDED:
+            parents.append(parent2)
+            return parents
+        # Octopus merge: the rest of the parents are listed in the EDGE chunk
+        edge = layer.edges + 4 * (parent2 & ~EXTRA_EDGES_NEEDED)
+        while True:
+            value = struct.unpack_from('>I', layer.data, edge)[0]
+            parents.append(value & ~LAST_EDGE)
+            if value & LAST_EDGE:
+                return parents
+            edge += 4
+
+    def commit_time(self, position: int) -> int:
+        return self._generation_and_time(position)[1]
+
+    def generation(self, position: int) -> int:
+        return self._generation_and_time(position)[0]
+
+    def close(self):
+        for layer in self.layers:
+            layer.close()
+        self.layers = []
+
+    def _generation_and_time(self, position: int) -> Tuple[int, int]:
+        layer, index = self._locate(position)
+        offset = layer.commit_data + index * (HASH_LEN + 16) + HASH_LEN + 8
+        high, low = struct.unpack_from('>II', layer.data, offset)
+        return high >> 2, ((high & 0x3) << 32) | low
+
+    def _locate(self, position: int) -> Tuple[_GraphFile, int]:
+        layer = self.layers[bisect_left(self._starts, position + 1) - 1]
+        return layer, position - layer.base_count
+
+Key = Union[int, str]
+
+class CommitHistory:
+    """History queries answered from the commit-graph where possible
+
+    Commits in the graph are handled by position with no object parsing.
+    Commits the graph does not cover yet, typically the ones made since the
+    last maintenance, are parsed through GitPython and cached, and walks
+    switch back to the graph as soon as they reach a commit it knows.
+    """
+
+    def __init__(self, repo, graph: Optional[CommitGraph] = None):
+        self.repo = repo
+        self.graph = graph if graph is not None else CommitGraph.load(repo.git_dir)
+        self._parsed = {}  # sha -> (parent keys, commit time)
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """sha of the commit a revision names, or None if it does not exist"""
+        try:
+            return self.repo.commit(rev).hexsha
+        except (ValueError, BadName, BadObject):
+            return None
+
+    def count(self, rev: str = 'HEAD') -> int:
+        """Number of commits reachable from rev"""
+        start = self.resolve(rev)
+        if start is None:
+            return 0
+        seen = {self._key(start)}
+        stack = list(seen)
+        while stack:
+            for parent in self._parents(stack.pop()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return len(seen)
+
+    def walk(self, rev: str = 'HEAD', limit: Optional[int] = None) -> Iterator[str]:
+        """Yield commit shas reachable from rev, newest first (git log order)"""
+        start = self.resolve(rev)
+        if start is None:
+            return
+        key = self._key(start)
+        seen = {key}
+        counter = 0
+        queue = [(-self._time(key), counter, key)]
+        emitted = 0
+        while queue and (limit is None or emitted < limit):
+            _, _, key = heapq.heappop(queue)
+            yield self._sha(key)
+            emitted += 1
+            for parent in self._parents(key):
+                if parent not in seen:
+                    seen.add(parent)
+                    counter += 1
+                    heapq.heappush(queue, (-self._time(parent), counter, parent))
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """Whether ancestor is reachable from descendant
+
+        Commits with a lower generation than the ancestor cannot reach it,
+        so the walk never goes below the ancestor's generation.
+        """
+        target_sha = self.resolve(ancestor)
+        start_sha = self.resolve(descendant)
+        if target_sha is None or start_sha is None:
+            return False
+        target = self._key(target_sha)
+        target_generation = self._generation(target)
+        start = self._key(start_sha)
+        seen = {start}
+        stack = [start]
+        while stack:
+            key = stack.pop()
+            if key == target:
+                return True
+            # Graph commits only reach graph commits, so an ancestor the
+            # graph lacks (infinite generation) prunes every one of them
+            if isinstance(key, int) and self.graph.generation(key) <= target_generation:
+                continue
+            for parent in self._parents(key):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    def is_pushed(self, rev: str) -> bool:
+        """Whether a commit is reachable from any remote-tracking branch"""
+        for remote in self.repo.remotes:
+            for ref in remote.refs:
+                if self.is_ancestor(rev, ref.path):
+                    return True
+        return False
+
+    def close(self):
+        if self.graph is not None:
+            self.graph.close()
+            self.graph = None
+
+    def _key(self, sha: str) -> Key:
+        if self.graph is not None:
+            position = self.graph.position(sha)
+            if position is not None:
+                return position
+        return sha
+
+    def _sha(self, key: Key) -> str:
+        return self.graph.sha(key) if isinstance(key, int) else key
+
+    def _parents(self, key: Key) -> List[Key]:
+        if isinstance(key, int):
+            return self.graph.parents(key)
+        return self._parse(key)[0]
+
+    def _time(self, key: Key) -> int:
+        if isinstance(key, int):
+            return self.graph.commit_time(key)
+        return self._parse(key)[1]
+
+    def _generation(self, key: Key):
+        if isinstance(key, int):
+            return self.graph.generation(key)
+        return GENERATION_INFINITY
+
+    def _parse(self, sha: str) -> Tuple[List[Key], int]:
+        parsed = self._parsed.get(sha)
+        if parsed is None:
+            commit = self.repo.commit(sha)
+            parsed = ([self._key(parent.hexsha) for parent in commit.parents], commit.committed_date)
+            self._parsed[sha] = parsed
+        return parsed
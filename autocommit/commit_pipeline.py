@@ -0,0 +1,538 @@
+import os
+import stat
+import time
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from .commit_generator import CommitGenerator
+from .config_manager import COMMIT_BACKENDS, COMMIT_MODES, COMMIT_STRATEGIES, LARGE_FILE_POLICIES
+from .git_operations import GitOperations
+from .large_files import format_size
+from .repo_lock import RepoBusyError, RepoLock
+from .stat_cache import StatCache, stat_signature
+
+class FileChange:
+    """One changed path as it moves through the pipeline"""
+
+    def __init__(self, path: str, change_type: str):
+        self.path = path
+        self.change_type = change_type  # 'added', 'modified' or 'deleted'
+        self.commit_type = None
+        self.mode = None
+        self.sha = None
+        self.stat = None
+        self.lfs = False
+
+    def __repr__(self):
+        return f"FileChange({self.path!r}, {self.change_type!r})"
+
+class CommitGroup:
+    """A set of changes that will become a single commit"""
+
+    def __init__(self, changes: List[FileChange], message: str):
+        self.changes = changes
+        self.message = message
+        self.sha = None
+
+    @property
+    def paths(self) -> List[str]:
+        return [change.path for change in self.changes]
+
+class PipelineRun:
+    """State and results of one pass through a CommitPipeline"""
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.ref = None
+        self.backend = None
+        self.changes = []
+        self.groups = []
+        self.filtered = []
+        self.failed = []
+        self.large_files = []  # {'path', 'size', 'action'} for files above the threshold
+        self.timings = OrderedDict()
+        self.stopped_at = None
+        self.error = None
+
+    @property
+    def committed_groups(self) -> List[CommitGroup]:
+        return [group for group in self.groups if group.sha]
+
+    @property
+    def committed_files(self) -> List[str]:
+        return [path for group in self.committed_groups for path in group.paths]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary used by the daemon, the control socket and the CLI"""
+        return {
+            'committed': len(self.committed_files),
+            'failed': len(self.failed),
+            'files': self.committed_files,
+            'commits': [{'sha': group.sha, 'message': group.message, 'files': group.paths}
+                        for group in self.groups],
+            'dry_run': self.dry_run,
+            'ref': self.ref,
+            'large_files': self.large_files,
+            'timings': dict(self.timings),
+            'error': self.error,
+        }
+
+class CommitPipeline:
+    """The single implementation of "commit what changed"
+
+    A run passes a PipelineRun through named stages in order:
+    snapshot -> filter -> classify -> group -> write_objects -> update_refs
+    -> post_hooks. Each stage is a callable taking the run; returning False
+    stops the run early. Stages can be replaced or inserted, and each is
+    timed. In dry-run mode the stages that write to the repository are
+    skipped, so the run reports what would be committed.
+
+    ``strategy`` (one of COMMIT_STRATEGIES) decides how the group stage
+    splits changes into commits. In ``snapshot`` mode changes are measured
+    against, and committed onto, the branch's refs/autocommit/ shadow ref
+    instead of HEAD, leaving the user's index and branch alone.
+
+    Non-dry runs hold the repository's RepoLock from snapshot to post-hooks,
+    waiting up to lock_timeout seconds for other autocommit processes and
+    in-progress git operations; a repository that stays busy ends the run
+    with a single error instead of one failure per file. In branch mode the
+    snapshot is narrowed by a StatCache, which is updated with the stat data
+    taken just before each committed file was hashed.
+
+    The filter stage lstat()s every file before anything reads it. Files
+    larger than large_file_threshold bytes are handled by large_file_policy:
+    ``skip`` leaves them out, ``warn`` commits them anyway and ``lfs``
+    commits a Git LFS pointer instead, storing the content in .git/lfs and
+    tracking the path in .gitattributes. Blobs are written by git itself and
+    LFS objects are streamed, so memory use does not depend on file size.
+    Both are written by up to object_workers (default: one per CPU) at once;
+    ref updates stay serialized, in group order.
+
+    With the ``fast-import`` backend the files whose blobs are their raw
+    bytes are not written as loose objects at all: update_refs streams them,
+    with the trees and commits of the whole tick, into one git fast-import
+    process that writes a single packfile and moves the ref once. The
+    ``index`` backend is used for a detached HEAD.
+    """
+
+    STAGES = ('snapshot', 'filter', 'classify', 'group', 'write_objects', 'update_refs', 'post_hooks')
+    WRITE_STAGES = ('write_objects', 'update_refs', 'post_hooks')
+
+    def __init__(self, project_path: str, git_ops: Optional[GitOperations] = None,
+                 commit_gen: Optional[CommitGenerator] = None, strategy: str = 'per-file',
+                 mode: str = 'branch', lock_timeout: float = 30.0, use_stat_cache: bool = True,
+                 large_file_threshold: Optional[int] = 50 * 1024 * 1024, large_file_policy: str = 'skip',
+                 object_workers: Optional[int] = None, backend: str = 'index'):
+        if strategy not in COMMIT_STRATEGIES:
+            raise ValueError(f"Unknown commit strategy: {strategy}")
+        if mode not in COMMIT_MODES:
+            raise ValueError(f"Unknown commit mode: {mode}")
+        if large_file_policy not in LARGE_FILE_POLICIES:
+            raise ValueError(f"Unknown large file policy: {large_file_policy}")
+        if backend not in COMMIT_BACKENDS:
+            raise ValueError(f"Unknown commit backend: {backend}")
+        self.project_path = Path(project_path)
+        self.strategy = strategy
+        self.mode = mode
+        self.lock_timeout = lock_timeout
+        self.large_file_threshold = large_file_threshold
+        self.large_file_policy = large_file_policy
+        self.object_workers = object_workers
+        self.backend = backend
+        self.stat_cache = StatCache(str(self.project_path)) if use_stat_cache else None
+        self.git_ops = git_ops or GitOperations(str(self.project_path))
+        self.commit_gen = commit_gen or CommitGenerator(str(self.project_path))
+        self.logger = logging.getLogger(__name__)
+        self.filters = [self._is_committable]
+        self.post_hooks = []
+        self._reported_large = {}  # path -> size last warned about
+        self._lfs_pointers = {}    # path -> (stat signature, mode, pointer sha)
+        self.stages = OrderedDict((name, getattr(self, f"_{name}")) for name in self.STAGES)
+
+    def run(self, dry_run: bool = False) -> PipelineRun:
+        """Run every stage once and return the run's results"""
+        run = PipelineRun(dry_run)
+        if dry_run:
+            return self._run_stages(run)
+
+        # The user's index.lock only matters when we write the user's index
+        lock = RepoLock(str(self.project_path), timeout=self.lock_timeout,
+                        check_index_lock=(self.mode == 'branch'))
+        try:
+            run.timings['lock'] = lock.acquire()
+        except RepoBusyError as e:
+            self.logger.warning(f"Skipping commit: {e}")
+            run.error = str(e)
+            run.stopped_at = 'lock'
+            return run
+        try:
+            return self._run_stages(run)
+        finally:
+            lock.release()
+
+    def _run_stages(self, run: PipelineRun) -> PipelineRun:
+        for name, stage in list(self.stages.items()):
+            if run.dry_run and name in self.WRITE_STAGES:
+                continue
+            started = time.perf_counter()
+            try:
+                proceed = stage(run)
+            except RepoBusyError as e:
+                self.logger.warning(f"Skipping commit: {e}")
+                run.error = str(e)
+                proceed = False
+            except Exception as e:
+                self.logger.error(f"Commit pipeline stage '{name}' failed: {e}")
+                run.error = f"{name}: {e}"
+                proceed = False
+            run.timings[name] = time.perf_counter() - started
+            if proceed is False:
+                run.stopped_at = name
+                break
+        return run
+
+    def replace_stage(self, name: str, stage: Callable[[PipelineRun], Optional[bool]]):
+        """Swap the implementation of an existing stage"""
+        if name not in self.stages:
+            raise KeyError(f"Unknown pipeline stage: {name}")
+        self.stages[name] = stage
+
+    def add_stage(self, name: str, stage: Callable[[PipelineRun], Optional[bool]],
+                  after: Optional[str] = None, before: Optional[str] = None):
+        """Insert a new stage after or before an existing one (default: at the end)"""
+        if name in self.stages:
+            raise ValueError(f"Pipeline stage already exists: {name}")
+        anchor = after or before
+        if anchor is not None and anchor not in self.stages:
+            raise KeyError(f"Unknown pipeline stage: {anchor}")
+
+        items = list(self.stages.items())
+        if anchor is None:
+            position = len(items)
+        else:
+            position = [key for key, _ in items].index(anchor) + (1 if after else 0)
+        items.insert(position, (name, stage))
+        self.stages = OrderedDict(items)
+
+    def add_filter(self, predicate: Callable[[FileChange], bool]):
+        """Keep only changes for which predicate returns True"""
+        self.filters.append(predicate)
+
+    def add_post_hook(self, callback: Callable[[PipelineRun], None]):
+        """Call callback with the run after commits have been written"""
+        self.post_hooks.append(callback)
+
+    def _snapshot(self, run: PipelineRun) -> bool:
+        if self.mode == 'snapshot':
+            run.ref = self.git_ops.get_shadow_ref()
+            changes = self.git_ops.get_snapshot_changes(run.ref)
+        elif self.stat_cache is not None:
+            changes = self.git_ops.detect_changes(self.stat_cache)
+        else:
+            changes = self.git_ops.get_changes()
+        run.changes = [FileChange(path, change_type) for path, change_type in sorted(changes.items())]
+        return bool(run.changes)
+
+    def _filter(self, run: PipelineRun) -> bool:
+        kept = []
+        for change in run.changes:
+            if all(predicate(change) for predicate in self.filters):
+                kept.append(change)
+            else:
+                run.filtered.append(change)
+        run.changes = kept
+        self._apply_large_file_policy(run)
+        return bool(run.changes)
+
+    def _apply_large_file_policy(self, run: PipelineRun):
+        if self.large_file_threshold is None:
+            return
+        kept = []
+        for change in run.changes:
+            if change.change_type != 'deleted':
+                # Size comes from stat, before anything reads the file
+                try:
+                    change.stat = os.lstat(self.project_path / change.path)
+                except FileNotFoundError:
+                    if self._vanished(run, change):
+                        kept.append(change)
+                    continue
+                size = change.stat.st_size
+                if size > self.large_file_threshold and not stat.S_ISLNK(change.stat.st_mode):
+                    action = {'skip': 'skipped', 'warn': 'committed', 'lfs': 'lfs'}[self.large_file_policy]
+                    run.large_files.append({'path': change.path, 'size': size, 'action': action})
+                    self._report_large_file(change.path, size, action)
+                    if action == 'skipped':
+                        run.filtered.append(change)
+                        continue
+                    change.lfs = action == 'lfs'
+            kept.append(change)
+        run.changes = kept
+
+    def _vanished(self, run: PipelineRun, change: FileChange) -> bool:
+        """Handle a file removed since the snapshot (editor swap and temp files do this)
+
+        A path git knows about is committed as deleted; a new one is dropped.
+        Returns True if the change is kept.
+        """
+        self.logger.debug(f"{change.path} disappeared during the tick")
+        if change.change_type == 'added':
+            run.filtered.append(change)
+            return False
+        change.change_type = 'deleted'
+        change.stat = None
+        return True
+
+    def _report_large_file(self, path: str, size: int, action: str):
+        # Once per path and size, not on every tick
+        if self._reported_large.get(path) == size:
+            return
+        self._reported_large[path] = size
+        limit = format_size(self.large_file_threshold)
+        if action == 'skipped':
+            self.logger.warning(f"Not committing {path}: {format_size(size)} is above the {limit} large file threshold")
+        elif action == 'lfs':
+            self.logger.info(f"Committing {path} ({format_size(size)}) as a Git LFS pointer")
+        else:
+            self.logger.warning(f"Committing large file {path} ({format_size(size)}, threshold {limit})")
+
+    def _classify(self, run: PipelineRun):
+        for change in run.changes:
+            change.commit_type = self.commit_gen._detect_commit_type(change.path, change.change_type)
+
+    def _group(self, run: PipelineRun) -> bool:
+        if self.strategy == 'per-file':
+            run.groups = [self._typed_group([change]) for change in run.changes]
+        elif self.strategy == 'per-type':
+            by_type = OrderedDict()
+            for change in run.changes:
+                by_type.setdefault(change.commit_type, []).append(change)
+            run.groups = [self._typed_group(changes) for _, changes in sorted(by_type.items())]
+        elif self.strategy == 'per-directory':
+            by_directory = OrderedDict()
+            for change in run.changes:
+                by_directory.setdefault(Path(change.path).parent.as_posix(), []).append(change)
+            run.groups = []
+            for directory, changes in sorted(by_directory.items()):
+                group = self._typed_group(changes)
+                if directory != '.':
+                    group.message = f"{group.message} ({directory})"
+                run.groups.append(group)
+        else:
+            run.groups = [self._typed_group(run.changes)] if run.changes else []
+        return bool(run.groups)
+
+    def _typed_group(self, changes: List[FileChange]) -> CommitGroup:
+        if len(changes) == 1:
+            change = changes[0]
+            message = self.commit_gen.generate_single_file_commit(change.path, change.change_type, change.commit_type)
+            return CommitGroup(changes, message)
+        categorized = OrderedDict()
+        for change in changes:
+            categorized.setdefault(change.commit_type, []).append(change.path)
+        return CommitGroup(changes, self.commit_gen.generate_grouped_commit(categorized))
+
+    def _write_objects(self, run: PipelineRun) -> bool:
+        lfs_changes = [change for change in run.changes if change.lfs]
+        if lfs_changes:
+            self._track_lfs(run, lfs_changes)
+
+        paths = []
+        vanished = []
+        for change in run.changes:
+            if change.change_type != 'deleted':
+                # Stat before hashing: a later edit then shows up as a stat change
+                if change.stat is None:
+                    try:
+                        change.stat = os.lstat(self.project_path / change.path)
+                    except FileNotFoundError:
+                        vanished.append(change)
+                        continue
+                if not change.lfs:
+                    paths.append(change.path)
+
+        run.backend = self.backend
+        streamed = set()
+        if run.backend == 'fast-import' and self.mode == 'branch' and self.git_ops.repo.head.is_detached:
+            run.backend = 'index'
+        if run.backend == 'fast-import':
+            # Streamed into fast-import by update_refs instead
+            streamed = set(self.git_ops.get_streamable_paths(paths))
+            paths = [path for path in paths if path not in streamed]
+        objects = self.git_ops.hash_objects(paths, self.object_workers)
+        objects.update(self._hash_lfs_pointers([change for change in lfs_changes if change not in vanished]))
+        # Files removed while they were being hashed come back without an object
+        vanished.extend(change for change in run.changes if change not in vanished
+                        and change.change_type != 'deleted'
+                        and change.path not in objects and change.path not in streamed)
+        for change in run.changes:
+            if change.path in objects:
+                change.mode, change.sha = objects[change.path]
+        if vanished:
+            # Already grouped under a message, so leave them for the next tick
+            self.logger.debug(f"Not committing files that disappeared: {', '.join(change.path for change in vanished)}")
+            self._drop_changes(run, vanished)
+            lfs_changes = [change for change in lfs_changes if change not in vanished]
+            if not run.groups:
+                return False
+        if lfs_changes:
+            return self._drop_unchanged_pointers(run, lfs_changes)
+        return True
+
+    def _track_lfs(self, run: PipelineRun, lfs_changes: List[FileChange]):
+        attributes = self.project_path / '.gitattributes'
+        existed = attributes.exists()
+        if not self.git_ops.track_lfs([change.path for change in lfs_changes]):
+            return
+        # Commit the attributes together with the first pointer
+        change = next((change for change in run.changes if change.path == '.gitattributes'), None)
+        if change is None:
+            change = FileChange('.gitattributes', 'modified' if existed else 'added')
+            change.commit_type = 'chore'
+            run.changes.append(change)
+            group = next(group for group in run.groups if lfs_changes[0] in group.changes)
+            group.changes.append(change)
+        change.stat = None
+
+    def _hash_lfs_pointers(self, lfs_changes: List[FileChange]) -> Dict[str, tuple]:
+        objects = {}
+        pending = []
+        for change in lfs_changes:
+            cached = self._lfs_pointers.get(change.path)
+            if cached and cached[0] == stat_signature(change.stat):
+                objects[change.path] = cached[1:]
+            else:
+                pending.append(change)
+        written = self.git_ops.hash_lfs_pointers([change.path for change in pending], self.object_workers)
+        for change in pending:
+            if change.path not in written:
+                continue
+            self._lfs_pointers[change.path] = (stat_signature(change.stat),) + written[change.path]
+        objects.update(written)
+        return objects
+
+    def _drop_unchanged_pointers(self, run: PipelineRun, lfs_changes: List[FileChange]) -> bool:
+        # Without git-lfs installed git cannot tell that a pointer matches
+        # the file, so an unchanged file can be reported again
+        index_path = self.git_ops.get_shadow_index_path(run.ref) if self.mode == 'snapshot' else None
+        current = self.git_ops.get_index_blobs([change.path for change in lfs_changes], index_path)
+        unchanged = [change for change in lfs_changes if current.get(change.path) == change.sha]
+        if not unchanged:
+            return True
+        self._drop_changes(run, unchanged)
+        if self.mode == 'branch' and self.stat_cache is not None:
+            self.stat_cache.record_commits({change.path: (stat_signature(change.stat), None) for change in unchanged},
+                                           self.git_ops.get_head_sha())
+        return bool(run.groups)
+
+    def _drop_changes(self, run: PipelineRun, dropped: List[FileChange]):
+        for change in dropped:
+            run.changes.remove(change)
+            run.filtered.append(change)
+        for group in run.groups:
+            group.changes = [change for change in group.changes if change not in dropped]
+        run.groups = [group for group in run.groups if group.changes]
+
+    def _update_refs(self, run: PipelineRun):
+        batches = []
+        for group in run.groups:
+            entries = {}
+            for change in group.changes:
+                entries[change.path] = None if change.change_type == 'deleted' else (change.mode, change.sha, change.stat)
+            batches.append((group.message, entries))
+
+        delay = 0.05
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                if run.backend == 'fast-import':
+                    shas, blobs = self.git_ops.fast_import_groups(batches, run.ref)
+                    for change in run.changes:
+                        if change.path in blobs:
+                            change.mode, change.sha = blobs[change.path]
+                elif self.mode == 'snapshot':
+                    shas = self.git_ops.commit_snapshot_groups(batches, run.ref)
+                else:
+                    shas = self.git_ops.commit_groups(batches)
+                break
+            except RepoBusyError:
+                # git took index.lock after we checked; nothing was written yet
+                if time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(2.0, delay * 2)
+        for group, sha in zip(run.groups, shas):
+            group.sha = sha
+            if sha is None:
+                run.failed.extend(group.paths)
+
+        if self.mode == 'branch' and self.stat_cache is not None:
+            committed = {}
+            for group in run.committed_groups:
+                for change in group.changes:
+                    if change.change_type == 'deleted':
+                        committed[change.path] = None
+                    else:
+                        committed[change.path] = (stat_signature(change.stat), None if change.lfs else change.sha)
+            self.stat_cache.record_commits(committed, self.git_ops.get_head_sha())
+
+    def _post_hooks(self, run: PipelineRun):
+        for callback in self.post_hooks:
+            try:
+                callback(run)
+            except Exception as e:
+                self.logger.error(f"Commit pipeline post-hook failed: {e}")
+
+    def _is_committable(self, change: FileChange) -> bool:
+        # Nested repositories and submodules show up as directories
+        return change.change_type == 'deleted' or not os.path.isdir(self.project_path / change.path)
+
+def echo_run(run: PipelineRun, echo: Callable[[str], None] = print):
+    """Print the per-commit lines the CLI and daemons have always shown"""
+    echo_result(run.to_dict(), echo)
+
+def echo_result(result: Dict[str, Any], echo: Callable[[str], None] = print):
+    """echo_run() for a run summary, e.g. a tick result from the control socket"""
+    for large_file in result.get('large_files', []):
+        size = format_size(large_file['size'])
+        if large_file['action'] == 'skipped':
+            echo(f"⚠ Skipped large file {large_file['path']} ({size})")
+        elif large_file['action'] == 'lfs':
+            echo(f"⚠ Large file {large_file['path']} ({size}) stored with Git LFS")
+        else:
+            echo(f"⚠ Committing large file {large_file['path']} ({size})")
+    if result.get('skipped'):
+        echo(f"✗ Nothing committed: {result['skipped']}")
+        return
+    commits = result.get('commits', [])
+    if result.get('error') and not commits:
+        echo(f"✗ Nothing committed: {result['error']}")
+        return
+    if result.get('error'):
+        echo(f"✗ Commit failed ({result['error']})")
+    if not commits:
+        echo("No changes to commit")
+        return
+
+    dry_run = result.get('dry_run')
+    ref = result.get('ref')
+    for commit in commits:
+        files = ', '.join(commit['files'])
+        if dry_run:
+            echo(f"Would commit {files}: {commit['message']}")
+        elif commit['sha'] and ref:
+            echo(f"✓ Snapshot {files} to {ref}: {commit['message']}")
+        elif commit['sha']:
+            echo(f"✓ Committed {files}: {commit['message']}")
+        else:
+            echo(f"✗ Failed to commit {files}")
+
+    if not dry_run:
+        committed = result.get('committed', 0)
+        if committed == 0:
+            echo("✗ No files were committed")
+        elif ref:
+            echo(f"✓ Snapshotted {committed} file(s) to {ref}")
+        else:
+            echo(f"✓ Committed {committed} file(s)")
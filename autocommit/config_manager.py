@@ -1,64 +1,507 @@
 import os
+import re
 import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
+
+# Built-in defaults, the lowest configuration layer
+DEFAULT_CONFIG = {
+    'interval': 10,
+    'adaptive_interval': False,
+    'min_interval': 1,
+    'max_interval': 60,
+    'manual_override_open': False,
+    'additional_editor_processes': [],
+    'custom_env_vars': [],
+    'commit_strategy': 'per-file',
+    'commit_mode': 'branch',
+    'large_file_threshold_mb': 50,
+    'large_file_policy': 'skip',
+    'commit_backend': 'index',
+    'maintenance_enabled': True,
+    'maintenance_interval_hours': 24,
+    'maintenance_budget_seconds': 300,
+    'tick_spread': True,
+    'tick_jitter_seconds': 30,
+    'max_concurrent_ticks': 2,
+    'schedules': [],
+    'schedule_catch_up': 'once',
+    'pause_when_processes': [],
+    'pause_when_load_above': 0,
+}
+
+# How changes detected in one tick are split into commits
+COMMIT_STRATEGIES = ('per-file', 'per-type', 'per-directory', 'single')
+
+# Where commits go: the checked-out branch, or a refs/autocommit/ shadow ref
+COMMIT_MODES = ('branch', 'snapshot')
+
+# What happens to files above large_file_threshold_mb: left out, committed
+# with a warning, or committed as Git LFS pointers
+LARGE_FILE_POLICIES = ('skip', 'warn', 'lfs')
+
+# How commits are written: GitPython's in-memory index, or one git
+# fast-import stream per tick
+COMMIT_BACKENDS = ('index', 'fast-import')
+
+# Time-based commits kept in the 'schedules' list, and what happens to a
+# run missed while the daemon was stopped or the host was asleep: run it
+# once as soon as possible, or skip it
+SCHEDULE_TYPES = ('daily', 'weekly', 'hourly')
+CATCH_UP_POLICIES = ('once', 'skip')
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+def _is_time_of_day(value) -> bool:
+    if not isinstance(value, str) or value.count(':') != 1:
+        return False
+    hour, minute = value.split(':')
+    return hour.isdigit() and minute.isdigit() and int(hour) <= 23 and int(minute) <= 59
+
+def validate_schedule(spec) -> bool:
+    """Check one entry of 'schedules', e.g. {"type": "weekly", "day": "friday", "time": "17:30"}"""
+    if not isinstance(spec, dict) or spec.get('type') not in SCHEDULE_TYPES:
+        return False
+    if spec.get('catch_up', 'once') not in CATCH_UP_POLICIES:
+        return False
+    if spec['type'] == 'hourly':
+        minute = spec.get('minute')
+        return isinstance(minute, int) and not isinstance(minute, bool) and 0 <= minute <= 59
+    if not _is_time_of_day(spec.get('time')):
+        return False
+    return spec['type'] == 'daily' or str(spec.get('day', '')).lower() in WEEKDAYS
+
+def _positive_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+def _non_negative_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+def _non_negative_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+def _string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def _regex_list(value) -> bool:
+    if not _string_list(value):
+        return False
+    try:
+        for pattern in value:
+            re.compile(pattern)
+    except re.error:
+        return False
+    return True
+
+# key -> validator; values are checked once when a file is loaded or a setter is called
+CONFIG_SCHEMA = {
+    'interval': _positive_number,
+    'adaptive_interval': lambda value: isinstance(value, bool),
+    'min_interval': _positive_number,
+    'max_interval': _positive_number,
+    'manual_override_open': lambda value: isinstance(value, bool),
+    'additional_editor_processes': _string_list,
+    'custom_env_vars': _string_list,
+    'commit_strategy': lambda value: value in COMMIT_STRATEGIES,
+    'commit_mode': lambda value: value in COMMIT_MODES,
+    'large_file_threshold_mb': _positive_number,
+    'large_file_policy': lambda value: value in LARGE_FILE_POLICIES,
+    'commit_backend': lambda value: value in COMMIT_BACKENDS,
+    'maintenance_enabled': lambda value: isinstance(value, bool),
+    'maintenance_interval_hours': _positive_number,
+    'maintenance_budget_seconds': _positive_number,
+    'tick_spread': lambda value: isinstance(value, bool),
+    'tick_jitter_seconds': _non_negative_number,
+    'max_concurrent_ticks': _non_negative_int,
+    'schedules': lambda value: isinstance(value, list) and all(validate_schedule(spec) for spec in value),
+    'schedule_catch_up': lambda value: value in CATCH_UP_POLICIES,
+    'pause_when_processes': _regex_list,
+    'pause_when_load_above': _non_negative_number,
+}
+
+logger = logging.getLogger(__name__)
+
+def validate_config_value(key: str, value: Any) -> bool:
+    """Check a single value against the schema; unknown keys are accepted"""
+    validator = CONFIG_SCHEMA.get(key)
+    return validator is None or validator(value)
+
+def validate_config(values: Dict[str, Any], source: str = 'config') -> Dict[str, Any]:
+    """Return a copy of values with invalid entries dropped (and logged)"""
+    if not isinstance(values, dict):
+        logger.warning(f"Ignoring {source}: expected a JSON object")
+        return {}
+
+    valid = {}
+    for key, value in values.items():
+        if validate_config_value(key, value):
+            valid[key] = value
+        else:
+            logger.warning(f"Ignoring invalid value for '{key}' in {source}: {value!r}")
+    return valid
+
+def get_global_config_path() -> Path:
+    """Location of the user-global configuration file"""
+    override = os.environ.get('GRAVITYCOMMIT_CONFIG')
+    if override:
+        return Path(override)
+    if os.name == 'nt' and os.environ.get('APPDATA'):
+        return Path(os.environ['APPDATA']) / 'gravitycommit' / 'config.json'
+    base = os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config'
+    return Path(base) / 'gravitycommit' / 'config.json'
+
+class ConfigLayer:
+    """A JSON configuration file cached in memory
+
+    The file is re-read only when its stat signature (mtime_ns, size, inode)
+    changes, and is validated once per load. ``version`` increases whenever
+    the cached contents change, so merged views can tell when to recompute.
+    """
+
+    def __init__(self, path: Path, name: str = 'config'):
+        self.path = Path(path)
+        self.name = name
+        self.values = {}
+        self.signature = None
+        self.loaded = False
+        self.version = 0
+        self.lock = threading.RLock()
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed on disk; returns True if it was reloaded"""
+        with self.lock:
+            signature = self._stat_signature()
+            if self.loaded and signature == self.signature:
+                return False
+            self.load()
+            return True
+
+    def load(self):
+        with self.lock:
+            signature = self._stat_signature()
+            values = {}
+            if signature is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        values = validate_config(json.load(f), str(self.path))
+                except FileNotFoundError:
+                    signature = None
+                except ValueError as e:
+                    logger.error(f"Could not parse {self.path}: {e}")
+            self.values = values
+            self.signature = signature
+            self.loaded = True
+            self.version += 1
+
+    def save(self):
+        # Write to a temporary file in the same directory and rename it over
+        # the original, so a crash mid-write never leaves a truncated config.
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{self.path.name}.", suffix=".tmp", dir=str(self.path.parent))
+            try:
+                os.chmod(tmp_path, self._file_mode())
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.values, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self.signature = self._stat_signature()
+            self.loaded = True
+            self.version += 1
+
+    def remove(self):
+        with self.lock:
+            if self.path.exists():
+                self.path.unlink()
+            self.values = {}
+            self.signature = None
+            self.loaded = False
+            self.version += 1
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _file_mode(self) -> int:
+        try:
+            return os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+# One cached layer per global config file, shared by every ConfigManager in the process
+_global_layers = {}
+_global_layers_lock = threading.Lock()
+
+def get_global_layer(path: Optional[Path] = None) -> ConfigLayer:
+    """Get the shared, cached user-global configuration layer"""
+    path = Path(path) if path else get_global_config_path()
+    with _global_layers_lock:
+        layer = _global_layers.get(path)
+        if layer is None:
+            layer = ConfigLayer(path, 'global')
+            _global_layers[path] = layer
+        return layer
 
 class ConfigManager:
+    """Configuration for one project: defaults < user-global file < project .autocommit
+
+    Setters write the project layer. Getters read a merged view that is
+    memoized and recomputed only when one of this project's layers changes.
+    """
+
     CONFIG_FILENAME = ".autocommit"
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, global_config_path: Optional[str] = None):
         self.project_path = Path(project_path)
         self.config_path = self.project_path / self.CONFIG_FILENAME
-        self.config = {}
+        self.project_layer = ConfigLayer(self.config_path, 'project')
+        self.global_layer = get_global_layer(global_config_path)
+        self._merged = None
+        self._merged_key = None
+        self._batch_depth = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Project-level overrides as stored in .autocommit"""
+        return self.project_layer.values
 
     def set_interval(self, interval: int):
-        self.config['interval'] = interval
-        self._save_config()
+        self._set('interval', interval)
 
     def get_interval(self) -> int:
-        if not self.config:
-            self._load_config()
-        return self.config.get('interval', 10)  # default 10 minutes
+        return self._get('interval')
+
+    def set_adaptive_interval(self, enabled: bool):
+        self._set('adaptive_interval', enabled)
+
+    def get_adaptive_interval(self) -> bool:
+        return self._get('adaptive_interval')
+
+    def get_min_interval(self) -> float:
+        return self._get('min_interval')
+
+    def get_max_interval(self) -> float:
+        return self._get('max_interval')
 
     def set_manual_override_open(self, override: bool):
-        self.config['manual_override_open'] = override
-        self._save_config()
+        self._set('manual_override_open', override)
 
     def get_manual_override_open(self) -> bool:
-        if not self.config:
-            self._load_config()
-        return self.config.get('manual_override_open', False)
+        return self._get('manual_override_open')
 
     def set_additional_editor_processes(self, editors: List[str]):
-        self.config['additional_editor_processes'] = editors
-        self._save_config()
+        self._set('additional_editor_processes', editors)
 
     def get_additional_editor_processes(self) -> List[str]:
-        if not self.config:
-            self._load_config()
-        return self.config.get('additional_editor_processes', [])
+        return list(self._get('additional_editor_processes'))
 
     def set_custom_env_vars(self, env_vars: List[str]):
-        self.config['custom_env_vars'] = env_vars
-        self._save_config()
+        self._set('custom_env_vars', env_vars)
 
     def get_custom_env_vars(self) -> List[str]:
-        if not self.config:
-            self._load_config()
-        return self.config.get('custom_env_vars', [])
+        return list(self._get('custom_env_vars'))
+
+    def set_commit_strategy(self, strategy: str):
+        self._set('commit_strategy', strategy)
+
+    def get_commit_strategy(self) -> str:
+        return self._get('commit_strategy')
+
+    def set_commit_mode(self, mode: str):
+        self._set('commit_mode', mode)
+
+    def get_commit_mode(self) -> str:
+        return self._get('commit_mode')
+
+    def set_large_file_threshold_mb(self, threshold_mb: float):
+        self._set('large_file_threshold_mb', threshold_mb)
+
+    def get_large_file_threshold_mb(self) -> float:
+        return self._get('large_file_threshold_mb')
+
+    def set_large_file_policy(self, policy: str):
+        self._set('large_file_policy', policy)
+
+    def get_large_file_policy(self) -> str:
+        return self._get('large_file_policy')
+
+    def set_commit_backend(self, backend: str):
+        self._set('commit_backend', backend)
+
+    def get_commit_backend(self) -> str:
+        return self._get('commit_backend')
+
+    def set_maintenance_enabled(self, enabled: bool):
+        self._set('maintenance_enabled', enabled)
+
+    def get_maintenance_enabled(self) -> bool:
+        return self._get('maintenance_enabled')
+
+    def get_maintenance_interval_hours(self) -> float:
+        return self._get('maintenance_interval_hours')
+
+    def get_maintenance_budget_seconds(self) -> float:
+        return self._get('maintenance_budget_seconds')
+
+    def set_tick_spread(self, enabled: bool):
+        self._set('tick_spread', enabled)
+
+    def get_tick_spread(self) -> bool:
+        return self._get('tick_spread')
+
+    def set_tick_jitter_seconds(self, seconds: float):
+        self._set('tick_jitter_seconds', seconds)
+
+    def get_tick_jitter_seconds(self) -> float:
+        return self._get('tick_jitter_seconds')
+
+    def set_max_concurrent_ticks(self, limit: int):
+        self._set('max_concurrent_ticks', limit)
+
+    def get_max_concurrent_ticks(self) -> int:
+        return self._get('max_concurrent_ticks')
+
+    def set_schedules(self, schedules: List[Dict[str, Any]]):
+        self._set('schedules', schedules)
+
+    def get_schedules(self) -> List[Dict[str, Any]]:
+        return [dict(spec) for spec in self._get('schedules')]
+
+    def set_schedule_catch_up(self, policy: str):
+        self._set('schedule_catch_up', policy)
+
+    def get_schedule_catch_up(self) -> str:
+        return self._get('schedule_catch_up')
+
+    def set_pause_conditions(self, processes: List[str], load_above: float):
+        """Hold scheduled commits while a process matching one of the patterns runs or the load is above load_above (0 = ignore load)"""
+        with self.batch():
+            self._set('pause_when_processes', processes)
+            self._set('pause_when_load_above', load_above)
+
+    def get_pause_when_processes(self) -> List[str]:
+        return list(self._get('pause_when_processes'))
+
+    def get_pause_when_load_above(self) -> float:
+        return self._get('pause_when_load_above')
+
+    def get_merged_config(self) -> Dict[str, Any]:
+        """Effective configuration after applying every layer"""
+        with self._lock:
+            self.refresh()
+            return dict(self._merged_view())
+
+    def get_value_source(self, key: str) -> str:
+        """Name of the layer that supplies a key: 'project', 'global' or 'default'"""
+        with self._lock:
+            self.refresh()
+            if key in self.project_layer.values:
+                return 'project'
+            if key in self.global_layer.values:
+                return 'global'
+            return 'default'
+
+    def set_global_value(self, key: str, value: Any):
+        """Set a host-wide default in the user-global configuration file"""
+        self._validate(key, value)
+        layer = self.global_layer
+        with layer.lock:
+            layer.refresh()
+            layer.values[key] = value
+            layer.save()
+
+    @contextmanager
+    def batch(self):
+        """Group several setter calls into a single atomic write
+
+        Nothing is written if the block raises.
+        """
+        with self._lock:
+            self.refresh()
+            snapshot = dict(self.project_layer.values)
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.project_layer.values = snapshot
+                    self.project_layer.version += 1
+                    self._dirty = False
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._save_config()
+
+    def update(self, values: Dict[str, Any]):
+        """Set several configuration values with one write"""
+        with self.batch():
+            for key, value in values.items():
+                self._set(key, value)
+
+    def refresh(self) -> bool:
+        """Reload any layer that changed on disk since it was last read
+
+        Only stat signatures are checked, so this is cheap enough to call on
+        every access. Returns True if new contents were loaded.
+        """
+        with self._lock:
+            if self._batch_depth:
+                return False
+            global_changed = self.global_layer.refresh()
+            project_changed = self.project_layer.refresh()
+            return global_changed or project_changed
 
     def remove_config(self):
-        if self.config_path.exists():
-            self.config_path.unlink()
-            self.config = {}
-
-    def _load_config(self):
-        if self.config_path.exists():
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        else:
-            self.config = {}
+        with self._lock:
+            self.project_layer.remove()
+
+    def _merged_view(self) -> Dict[str, Any]:
+        key = (self.global_layer.version, self.project_layer.version)
+        if self._merged is None or self._merged_key != key:
+            merged = dict(DEFAULT_CONFIG)
+            merged.update(self.global_layer.values)
+            merged.update(self.project_layer.values)
+            self._merged = merged
+            self._merged_key = key
+        return self._merged
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self.refresh()
+            return self._merged_view().get(key, default)
+
+    def _set(self, key: str, value: Any):
+        self._validate(key, value)
+        with self._lock:
+            self.refresh()
+            self.project_layer.values[key] = value
+            self.project_layer.version += 1
+            self._dirty = True
+            if not self._batch_depth:
+                self._save_config()
+
+    def _validate(self, key: str, value: Any):
+        if not validate_config_value(key, value):
+            raise ValueError(f"Invalid value for configuration key '{key}': {value!r}")
 
     def _save_config(self):
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=4)
+        self.project_layer.save()
+        self._dirty = False
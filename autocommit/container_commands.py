@@ -5,8 +5,6 @@ Container-specific commands for GravityCommit
 
 import os
 import sys
-import time
-import signal
 import subprocess
 import tempfile
 from pathlib import Path
@@ -14,10 +12,8 @@ import click
 import psutil
 
 from .config_manager import ConfigManager
-from .commit_generator import CommitGenerator
-from .git_operations import GitOperations
-from .project_monitor import ProjectMonitor
-from .scheduler import Scheduler
+from .project_registry import ProjectRegistry
+from .project_daemon import ProjectDaemon
 
 @click.command()
 @click.argument('project_path', type=click.Path(exists=True))
@@ -34,8 +30,11 @@ def container_setup(project_path, interval, background):
 
     # Create configuration with manual override enabled
     config = ConfigManager(str(project_path))
-    config.set_interval(interval)
-    config.set_manual_override_open(True)  # Always override for containers
+    with config.batch():
+        config.set_interval(interval)
+        config.set_manual_override_open(True)  # Always override for containers
+
+    ProjectRegistry().register(str(project_path), mode='container', interval=interval)
 
     click.echo(f"✓ AutoCommit container setup complete for {project_path}")
     click.echo(f"✓ Commit interval: {interval} minutes")
@@ -81,6 +80,7 @@ def container_stop(project_path):
                 try:
                     if proc.info['name'] == 'python3' and script_name in ' '.join(proc.info['cmdline']):
                         proc.kill()
+                        ProjectRegistry().update_status(str(project_path), daemon_pid=None)
                         click.echo("✓ Daemon stopped")
                         script_path.unlink()
                         return
@@ -94,49 +94,7 @@ def container_stop(project_path):
 def start_container_daemon(project_path: str, background: bool = False):
     """Start the daemon process for container environments"""
     config = ConfigManager(project_path)
-    git_ops = GitOperations(project_path)
-    commit_gen = CommitGenerator(project_path)
-    monitor = ProjectMonitor(project_path)
-    scheduler = Scheduler(config.get_interval())
-
-    def commit_callback():
-        try:
-            # Always treat as project open due to manual override
-            if git_ops.has_changes():
-                status = git_ops.check_status()
-                changed_files = status['unstaged'] + status['untracked']
-
-                if changed_files:
-                    committed_count = 0
-                    for file_path in changed_files:
-                        # Determine change type
-                        if file_path in status['untracked']:
-                            change_type = 'added'
-                        elif file_path in status['unstaged']:
-                            change_type = 'modified'
-                        else:
-                            change_type = 'modified'  # fallback
-
-                        # Generate commit message for this file
-                        message = commit_gen.generate_single_file_commit(file_path, change_type)
-
-                        # Commit this file separately
-                        if git_ops.commit_single_file(file_path, message):
-                            click.echo(f"✓ Committed {file_path}: {message}")
-                            committed_count += 1
-                        else:
-                            click.echo(f"✗ Failed to commit {file_path}")
-
-                    if committed_count == 0:
-                        click.echo("✗ No files were committed")
-                    else:
-                        click.echo(f"✓ Committed {committed_count} file(s)")
-                else:
-                    click.echo("No changes to commit")
-            else:
-                click.echo("No changes detected")
-        except Exception as e:
-            click.echo(f"Error during commit: {e}")
+    registry = ProjectRegistry()
 
     if background:
         # Run in background using nohup
@@ -145,79 +103,12 @@ def start_container_daemon(project_path: str, background: bool = False):
         # Create a temporary script to run the daemon
         script_content = f'''
 import sys
-import os
-import time
-import signal
 sys.path.insert(0, "{Path(__file__).parent.parent}")
 
-from autocommit.config_manager import ConfigManager
-from autocommit.commit_generator import CommitGenerator
-from autocommit.git_operations import GitOperations
-from autocommit.project_monitor import ProjectMonitor
-from autocommit.scheduler import Scheduler
-
-def commit_callback():
-    try:
-        config = ConfigManager("{project_path}")
-        git_ops = GitOperations("{project_path}")
-        commit_gen = CommitGenerator("{project_path}")
-        monitor = ProjectMonitor("{project_path}")
+from autocommit.project_daemon import ProjectDaemon
 
-        # Always treat as project open due to manual override
-        if git_ops.has_changes():
-            status = git_ops.check_status()
-            changed_files = status['unstaged'] + status['untracked']
-
-            if changed_files:
-                committed_count = 0
-                for file_path in changed_files:
-                    # Determine change type
-                    if file_path in status['untracked']:
-                        change_type = 'added'
-                    elif file_path in status['unstaged']:
-                        change_type = 'modified'
-                    else:
-                        change_type = 'modified'  # fallback
-
-                    # Generate commit message for this file
-                    message = commit_gen.generate_single_file_commit(file_path, change_type)
-
-                    # Commit this file separately
-                    if git_ops.commit_single_file(file_path, message):
-                        print(f"✓ Committed {{file_path}}: {{message}}")
-                        committed_count += 1
-                    else:
-                        print(f"✗ Failed to commit {{file_path}}")
-
-                if committed_count == 0:
-                    print("✗ No files were committed")
-                else:
-                    print(f"✓ Committed {{committed_count}} file(s)")
-            else:
-                print("No changes to commit")
-        else:
-            print("No changes detected")
-    except Exception as e:
-        print(f"Error during commit: {{e}}")
-
-def signal_handler(signum, frame):
-    print("Stopping AutoCommit daemon...")
-    sys.exit(0)
-
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
-
-config = ConfigManager("{project_path}")
-scheduler = Scheduler(config.get_interval())
-scheduler.start(commit_callback)
-
-print(f"AutoCommit daemon started for {project_path}")
-try:
-    while True:
-        time.sleep(1)
-except KeyboardInterrupt:
-    print("Stopping daemon...")
-    scheduler.stop()
+# Always treat as project open due to manual override
+ProjectDaemon("{project_path}", always_open=True).run_forever()
 '''
 
         with open(script_path, 'w') as f:
@@ -225,26 +116,19 @@ except KeyboardInterrupt:
 
         # Start the script in background
         try:
-            subprocess.Popen(['python3', str(script_path)],
-                           stdout=subprocess.DEVNULL,
-                           stderr=subprocess.DEVNULL,
-                           preexec_fn=os.setsid)
+            proc = subprocess.Popen(['python3', str(script_path)],
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL,
+                                    preexec_fn=os.setsid)
+            registry.update_status(project_path, daemon_pid=proc.pid, interval=config.get_interval())
             click.echo("✓ Daemon started in background")
             click.echo(f"✓ PID file: {script_path}")
         except Exception as e:
             click.echo(f"✗ Failed to start background daemon: {e}")
     else:
-        # Run in foreground
+        # Run in foreground; always treat as project open due to manual override
         click.echo(f"Starting AutoCommit daemon for {project_path}")
-        scheduler.start(commit_callback)
-
-        # Keep the daemon running
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            click.echo("Stopping daemon...")
-            scheduler.stop()
+        ProjectDaemon(project_path, always_open=True, echo=click.echo).run_forever()
 
 if __name__ == '__main__':
     # Allow running commands directly
@@ -0,0 +1,365 @@
+import os
+import json
+import asyncio
+import socket
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterator, Optional
+from .paths import get_state_dir
+
+# sun_path is limited to 108 bytes on Linux and 104 on macOS
+MAX_SOCKET_PATH = 100
+
+class ControlError(Exception):
+    """Raised by ControlClient when the daemon is unreachable or rejects a request"""
+
+def get_control_socket_path(project_path: str) -> Path:
+    """Path of a project's daemon control socket
+
+    Lives in .git/autocommit/ when that path is short enough for a Unix
+    socket, otherwise in the temp directory under a hash of the project path.
+    """
+    project_path = Path(project_path).resolve()
+    state_dir = get_state_dir(str(project_path), create=False)
+    if state_dir is not None:
+        path = state_dir / 'control.sock'
+        if len(str(path)) <= MAX_SOCKET_PATH:
+            return path
+    digest = hashlib.sha1(str(project_path).encode('utf-8')).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"gravitycommit-{digest}.sock"
+
+class ControlServer:
+    """Local control socket served by a running daemon
+
+    The protocol is newline-delimited JSON. A request is
+    ``{"cmd": name, "args": {...}}`` and the reply is ``{"ok": true,
+    "result": ...}`` or ``{"ok": false, "error": message}``. The special
+    ``subscribe`` command keeps the connection open and streams every event
+    passed to publish() as ``{"event": ...}`` lines.
+
+    start() serves from its own threads; start_async() serves from the
+    running event loop and calls the handlers in an executor. Commands given
+    to start_async() as loop_handlers run on the loop itself, so they answer
+    even while every executor thread is busy: plain functions must not
+    block, coroutine functions are awaited.
+    """
+
+    # A subscriber that stops reading is dropped after this long instead of
+    # blocking publish(), which runs inside ticks
+    SUBSCRIBER_SEND_TIMEOUT = 1.0
+    # On the event loop, the same for one whose unsent events pass this many bytes
+    SUBSCRIBER_BUFFER_LIMIT = 1 << 20
+
+    def __init__(self, project_path: str, handlers: Dict[str, Callable[..., Any]]):
+        self.project_path = Path(project_path).resolve()
+        self.socket_path = get_control_socket_path(str(self.project_path))
+        self.handlers = handlers
+        self.logger = logging.getLogger(__name__)
+        self._sock = None
+        self._thread = None
+        self._running = False
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._executor = None
+        self._loop_handlers = {}
+
+    def start(self) -> bool:
+        """Bind the socket and start serving; returns False if unsupported or taken"""
+        sock = self._bind()
+        if sock is None:
+            return False
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name='autocommit-control', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Control socket listening on {self.socket_path}")
+        return True
+
+    async def start_async(self, executor: Optional[Executor] = None,
+                          loop_handlers: Optional[Dict[str, Callable[..., Any]]] = None) -> bool:
+        """start() for the running event loop; handlers run in executor, loop_handlers on the loop"""
+        sock = self._bind()
+        if sock is None:
+            return False
+        self._loop = asyncio.get_running_loop()
+        self._executor = executor
+        self._loop_handlers = dict(loop_handlers or {})
+        self._running = True
+        self._server = await asyncio.start_unix_server(self._handle_stream, sock=sock)
+        self.logger.info(f"Control socket listening on {self.socket_path}")
+        return True
+
+    def _bind(self) -> Optional[socket.socket]:
+        if not hasattr(socket, 'AF_UNIX'):
+            self.logger.warning("Unix domain sockets not supported, control socket disabled")
+            return None
+
+        if self.socket_path.exists():
+            if self._is_live():
+                self.logger.error(f"Another daemon is already serving {self.socket_path}")
+                return None
+            self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # socket only accessible by its owner
+        try:
+            sock.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        sock.listen(16)
+        return sock
+
+    def stop(self):
+        """Stop serving and remove the socket file"""
+        self._running = False
+        if self._server:
+            self._server.close()
+            self._server = None
+        if self._sock:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        with self._subscribers_lock:
+            for conn in self._subscribers:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+            self._subscribers = []
+        self._loop = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def publish(self, event: Dict[str, Any]):
+        """Send an event to every subscribed client"""
+        line = (json.dumps({'event': event}, default=str) + '\n').encode('utf-8')
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._broadcast, line)
+            except RuntimeError:
+                pass  # loop already closed
+            return
+        with self._subscribers_lock:
+            alive = []
+            for conn in self._subscribers:
+                try:
+                    conn.sendall(line)
+                    alive.append(conn)
+                except OSError:
+                    try:
+                        conn.close()
+                    except OSError:
+                        pass
+            self._subscribers = alive
+
+    def _is_live(self) -> bool:
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn: socket.socket):
+        reader = conn.makefile('r', encoding='utf-8')
+        keep_open = False
+        try:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    cmd = request.get('cmd')
+                    args = request.get('args') or {}
+                except (ValueError, AttributeError):
+                    self._send(conn, {'ok': False, 'error': 'malformed request'})
+                    continue
+
+                if cmd == 'subscribe':
+                    self._send(conn, {'ok': True, 'result': 'subscribed'})
+                    conn.settimeout(self.SUBSCRIBER_SEND_TIMEOUT)
+                    with self._subscribers_lock:
+                        self._subscribers.append(conn)
+                    keep_open = True
+                    return
+
+                handler = self.handlers.get(cmd)
+                if handler is None:
+                    self._send(conn, {'ok': False, 'error': f"unknown command: {cmd}"})
+                    continue
+                try:
+                    self._send(conn, {'ok': True, 'result': handler(**args)})
+                except Exception as e:
+                    self.logger.error(f"Control command '{cmd}' failed: {e}")
+                    self._send(conn, {'ok': False, 'error': str(e)})
+        except OSError:
+            pass
+        finally:
+            reader.close()
+            if not keep_open:
+                conn.close()
+
+    def _broadcast(self, line: bytes):
+        """publish() on the event loop, where subscribers are StreamWriters"""
+        alive = []
+        for writer in self._subscribers:
+            if writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > self.SUBSCRIBER_BUFFER_LIMIT:
+                self.logger.warning("Dropping a control socket subscriber that stopped reading")
+                writer.close()
+                continue
+            writer.write(line)
+            alive.append(writer)
+        self._subscribers = alive
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        keep_open = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    cmd = request.get('cmd')
+                    args = request.get('args') or {}
+                except (ValueError, AttributeError):
+                    await self._write(writer, {'ok': False, 'error': 'malformed request'})
+                    continue
+
+                if cmd == 'subscribe':
+                    await self._write(writer, {'ok': True, 'result': 'subscribed'})
+                    self._subscribers.append(writer)
+                    keep_open = True
+                    return
+
+                on_loop = cmd in self._loop_handlers
+                handler = self._loop_handlers[cmd] if on_loop else self.handlers.get(cmd)
+                if handler is None:
+                    await self._write(writer, {'ok': False, 'error': f"unknown command: {cmd}"})
+                    continue
+                try:
+                    if not on_loop:
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(self._executor, lambda: handler(**args))
+                    elif asyncio.iscoroutinefunction(handler):
+                        result = await handler(**args)
+                    else:
+                        result = handler(**args)
+                    await self._write(writer, {'ok': True, 'result': result})
+                except Exception as e:
+                    self.logger.error(f"Control command '{cmd}' failed: {e}")
+                    await self._write(writer, {'ok': False, 'error': str(e)})
+        except (OSError, ConnectionError):
+            pass
+        finally:
+            if not keep_open:
+                writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        writer.write((json.dumps(message, default=str) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    @staticmethod
+    def _send(conn: socket.socket, message: Dict[str, Any]):
+        conn.sendall((json.dumps(message, default=str) + '\n').encode('utf-8'))
+
+class ControlClient:
+    """Thin client for a daemon's control socket"""
+
+    def __init__(self, project_path: str, timeout: float = 2.0):
+        self.socket_path = get_control_socket_path(project_path)
+        self.timeout = timeout
+
+    def is_available(self) -> bool:
+        """Check whether a daemon is listening for this project"""
+        if not hasattr(socket, 'AF_UNIX') or not self.socket_path.exists():
+            return False
+        try:
+            self.request('ping')
+            return True
+        except ControlError:
+            return False
+
+    def request(self, cmd: str, **args) -> Any:
+        """Send one command and return its result; raises ControlError on failure"""
+        conn = self._connect()
+        try:
+            conn.sendall((json.dumps({'cmd': cmd, 'args': args}) + '\n').encode('utf-8'))
+            reply = self._read_line(conn)
+        finally:
+            conn.close()
+        if not reply.get('ok'):
+            raise ControlError(reply.get('error', 'request failed'))
+        return reply.get('result')
+
+    def subscribe(self) -> Iterator[Dict[str, Any]]:
+        """Yield live events from the daemon until the connection closes"""
+        conn = self._connect()
+        conn.settimeout(None)
+        try:
+            conn.sendall((json.dumps({'cmd': 'subscribe'}) + '\n').encode('utf-8'))
+            reader = conn.makefile('r', encoding='utf-8')
+            reply = json.loads(reader.readline() or '{}')
+            if not reply.get('ok'):
+                raise ControlError(reply.get('error', 'subscribe failed'))
+            for line in reader:
+                if line.strip():
+                    yield json.loads(line).get('event')
+        finally:
+            conn.close()
+
+    def _connect(self) -> socket.socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ControlError("Unix domain sockets not supported")
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(self.timeout)
+        try:
+            conn.connect(str(self.socket_path))
+        except OSError as e:
+            conn.close()
+            raise ControlError(f"No daemon listening on {self.socket_path}: {e}")
+        return conn
+
+    def _read_line(self, conn: socket.socket) -> Dict[str, Any]:
+        data = b''
+        try:
+            while not data.endswith(b'\n'):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        except OSError as e:
+            raise ControlError(f"Daemon did not reply: {e}")
+        if not data:
+            raise ControlError("Daemon closed the connection")
+        try:
+            return json.loads(data.decode('utf-8'))
+        except ValueError:
+            raise ControlError("Malformed reply from daemon")
@@ -1,8 +1,49 @@
 import os
+import stat
+import heapq
+import hashlib
+import tempfile
+import struct
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import git
-from git import Repo
+from git import Repo, IndexFile, Commit
+from git.index.typ import BaseIndexEntry, IndexEntry
+from git.util import LockedFD
+from .large_files import LFS_ATTRIBUTES, lfs_attribute_pattern, lfs_pointer, store_lfs_object
+from .paths import get_git_dir, get_state_dir
+from .repo_lock import RepoBusyError
+from .stat_cache import StatCache
+
+# Index modes for regular, executable and symlink blobs
+MODE_FILE = 0o100644
+MODE_EXECUTABLE = 0o100755
+MODE_SYMLINK = 0o120000
+
+NULL_SHA = '0' * 40
+
+# Namespace of the shadow refs written in snapshot mode
+SHADOW_REF_PREFIX = 'refs/autocommit/'
+
+# Above this many paths a pathspec-limited git status is not worth it
+MAX_PATHSPEC_PATHS = 1000
+
+# Fewer paths than this per process are not worth another git hash-object
+MIN_PATHS_PER_WORKER = 64
+
+# Per-file cost counted when balancing hash-object batches, so many small
+# files are spread out as well as a few big ones
+FILE_OVERHEAD_BYTES = 16 * 1024
+
+# Attributes that make a blob differ from the file's bytes on disk
+CONVERSION_ATTRIBUTES = ('filter', 'text', 'eol', 'ident', 'working-tree-encoding')
+
+# Read-only git commands: never take index.lock to refresh stat data, and
+# treat paths as literal names rather than globs
+READ_ONLY_ENV = {'GIT_OPTIONAL_LOCKS': '0', 'GIT_LITERAL_PATHSPECS': '1'}
 
 class GitOperations:
     def __init__(self, project_path: str):
@@ -50,16 +91,21 @@ class GitOperations:
             return False
 
     def commit_single_file(self, file_path: str, message: str) -> bool:
-        """Commit a single file with given message"""
+        """Commit a single file with given message
+
+        The blob is written by git hash-object rather than in-process, and a
+        missing file is committed as a deletion.
+        """
         if not self.repo:
             return False
 
         try:
-            # Stage only the specific file
-            self.repo.index.add([file_path])
-            # Commit only this file
-            self.repo.index.commit(message)
-            return True
+            if os.path.lexists(self.project_path / file_path):
+                mode, sha = self.hash_objects([file_path])[file_path]
+                entry = (mode, sha, os.lstat(self.project_path / file_path))
+            else:
+                entry = None
+            return self.commit_groups([(message, {file_path: entry})])[0] is not None
         except Exception as e:
             print(f"Commit failed for {file_path}: {e}")
             return False
@@ -79,8 +125,8 @@ class GitOperations:
         for item in self.repo.index.diff('HEAD', cached=True):
             status['staged'].append(item.a_path)
 
-        # Get unstaged changes
-        for item in self.repo.index.diff('HEAD'):
+        # Get unstaged changes (index against working tree)
+        for item in self.repo.index.diff(None):
             status['unstaged'].append(item.a_path)
 
         # Get untracked files
@@ -89,9 +135,21 @@ class GitOperations:
         return status
 
     def has_changes(self) -> bool:
-        """Check if there are any changes to commit"""
-        status = self.check_status()
-        return bool(status['staged'] or status['unstaged'] or status['untracked'])
+        """Check if there are any changes to commit
+
+        Answered from the StatCache when it is valid, so an unchanged tree
+        costs an lstat per tracked file and no git process.
+        """
+        return bool(self.detect_changes(StatCache(str(self.project_path))))
+
+    def get_head_sha(self) -> Optional[str]:
+        """Get the sha of HEAD, or None for an empty repository"""
+        if not self.repo:
+            return None
+        try:
+            return self.repo.head.commit.hexsha
+        except ValueError:
+            return None
 
     def get_staged_files(self) -> List[str]:
         """Get list of currently staged files"""
@@ -102,3 +160,697 @@ class GitOperations:
         for item in self.repo.index.diff('HEAD', cached=True):
             staged.append(item.a_path)
         return staged
+
+    def get_changes(self, paths: Optional[List[str]] = None) -> Dict[str, str]:
+        """Map every changed path to 'added', 'modified' or 'deleted'
+
+        Staged, unstaged and untracked changes come from a single
+        ``git status --porcelain`` call, limited to paths if given.
+        """
+        if not self.repo:
+            return {}
+
+        args = ['--porcelain', '-z', '--untracked-files=all', '--no-renames']
+        if paths:
+            args += ['--'] + [path.rstrip('/') for path in paths]
+        output = self.repo.git.status(*args, env=READ_ONLY_ENV)
+        changes = {}
+        for entry in output.split('\0'):
+            if len(entry) < 4:
+                continue
+            code, path = entry[:2], entry[3:]
+            if code == '??' or code[0] == 'A':
+                changes[path] = 'added'
+            elif 'D' in code:
+                changes[path] = 'deleted'
+            else:
+                changes[path] = 'modified'
+        return changes
+
+    def detect_changes(self, cache: StatCache) -> Dict[str, str]:
+        """get_changes(), narrowed down by a StatCache
+
+        Only paths whose stat data or directory mtime moved are passed to
+        git; an unchanged tree needs no git process at all. An invalid cache
+        (HEAD or index changed elsewhere) costs one full status and is
+        rebuilt.
+        """
+        head_sha = self.get_head_sha()
+        candidates = cache.find_candidates(head_sha)
+        if candidates is None:
+            return self._rebuild_stat_cache(cache, head_sha)
+        if not candidates:
+            cache.settle_scanned_dirs()
+            cache.save()
+            return {}
+
+        paths = list(candidates) if len(candidates) <= MAX_PATHSPEC_PATHS else None
+        changes = self.get_changes(paths)
+        cache.confirm(candidates, changes)
+        return changes
+
+    def get_tracked_blobs(self) -> Dict[str, str]:
+        """Map every tracked file to its blob id in the index (submodules excluded)"""
+        if not self.repo:
+            return {}
+        return {
+            path: entry.hexsha
+            for (path, stage), entry in self.repo.index.entries.items()
+            if stage == 0 and entry.mode != 0o160000
+        }
+
+    def get_index_blobs(self, paths: List[str], index_path: Optional[Path] = None) -> Dict[str, str]:
+        """Blob ids of paths in the index (or an alternate index file)"""
+        if not self.repo or not paths:
+            return {}
+        index = IndexFile(self.repo, str(index_path)) if index_path else self.repo.index
+        blobs = {}
+        for path in paths:
+            entry = index.entries.get((path, 0))
+            if entry is not None:
+                blobs[path] = entry.hexsha
+        return blobs
+
+    def _rebuild_stat_cache(self, cache: StatCache, head_sha: Optional[str]) -> Dict[str, str]:
+        tracked = self.get_tracked_blobs()
+        # Stat before asking git, so edits in between are never recorded as clean
+        signatures = {}
+        for path in tracked:
+            try:
+                signatures[path] = os.lstat(self.project_path / path)
+            except FileNotFoundError:
+                signatures[path] = None
+        dir_mtimes = cache.tracked_directories(tracked)
+        changes = self.get_changes()
+        cache.rebuild(tracked, changes, head_sha, signatures, dir_mtimes)
+        return changes
+
+    def hash_objects(self, paths: List[str], workers: Optional[int] = None) -> Dict[str, Tuple[int, str]]:
+        """Write working tree files as blobs; returns path -> (mode, sha)
+
+        Regular files are written by ``git hash-object -w --stdin-paths``, so
+        clean filters and autocrlf apply as they would for git add. Large
+        changesets are split by size across up to ``workers`` (default: one
+        per CPU) concurrent git processes, so compression uses every core.
+        Files that no longer exist are left out of the result.
+        """
+        if not self.repo or not paths:
+            return {}
+
+        objects = {}
+        regular = []
+        for path in paths:
+            full_path = self.project_path / path
+            try:
+                st = os.lstat(full_path)
+                if stat.S_ISLNK(st.st_mode):
+                    target = os.readlink(full_path).encode('utf-8', 'surrogateescape')
+            except FileNotFoundError:
+                continue
+            if stat.S_ISLNK(st.st_mode):
+                objects[path] = (MODE_SYMLINK, self._hash_bytes(target))
+            elif '\n' in path:
+                # --stdin-paths is newline separated; hash such names one at a time
+                objects[path] = (self._file_mode(st), self.repo.git.hash_object('-w', '--', path))
+            else:
+                regular.append((path, st))
+
+        batches = self._split_batches(regular, workers or os.cpu_count() or 1)
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+                results = list(executor.map(self._hash_batch, batches))
+        else:
+            results = [self._hash_batch(batch) for batch in batches]
+        for result in results:
+            objects.update(result)
+        return objects
+
+    def hash_lfs_pointers(self, paths: List[str], workers: Optional[int] = None) -> Dict[str, Tuple[int, str]]:
+        """Store files in the local Git LFS object store and write pointer blobs
+
+        Returns path -> (mode, sha) of the pointer blob, exactly what git-lfs'
+        clean filter would produce, so the object can later be pushed with
+        ``git lfs push``. Files are streamed, never read into memory whole,
+        and several are stored at once (sha256 and file I/O release the GIL).
+        Files that no longer exist are left out of the result.
+        """
+        if not self.repo or not paths:
+            return {}
+
+        git_dir = get_git_dir(str(self.project_path))
+
+        def store(path):
+            full_path = self.project_path / path
+            try:
+                st = os.lstat(full_path)
+                oid, size = store_lfs_object(git_dir, full_path)
+            except FileNotFoundError:
+                return path, None
+            return path, (self._file_mode(st), self._hash_bytes(lfs_pointer(oid, size)))
+
+        count = min(len(paths), workers or os.cpu_count() or 1)
+        if count <= 1:
+            stored = [store(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                stored = list(executor.map(store, paths))
+        return {path: pointer for path, pointer in stored if pointer is not None}
+
+    def track_lfs(self, paths: List[str]) -> bool:
+        """Mark paths as Git LFS files in .gitattributes, like ``git lfs track``
+
+        Paths already using the lfs filter are left alone. Returns True if
+        .gitattributes was changed.
+        """
+        if not self.repo or not paths:
+            return False
+
+        filters = self._check_attr(['filter'], paths)
+        untracked = [path for path in paths if filters.get(path, {}).get('filter') != 'lfs']
+        if not untracked:
+            return False
+
+        attributes = self.project_path / '.gitattributes'
+        try:
+            existing = attributes.read_bytes()
+        except FileNotFoundError:
+            existing = b''
+        lines = ''.join(f"{lfs_attribute_pattern(path)} {LFS_ATTRIBUTES}\n" for path in untracked)
+        with open(attributes, 'ab') as f:
+            if existing and not existing.endswith(b'\n'):
+                f.write(b'\n')
+            f.write(lines.encode('utf-8'))
+        return True
+
+    def commit_groups(self, groups: List[Tuple[str, Dict[str, Optional[Tuple[int, str]]]]]) -> List[Optional[str]]:
+        """Create one commit per group from already-written blobs
+
+        Each group is ``(message, {path: (mode, sha) or None})`` where None
+        removes the path. Commits are built on the in-memory index, so each
+        one contains only its own paths and the index file is written once at
+        the end. Returns the new commit sha per group (None if it failed).
+        """
+        if not self.repo:
+            return [None] * len(groups)
+
+        index = self.repo.index
+        all_paths = [path for _, entries in groups for path in entries]
+        if not self._has_commit_hooks():
+            # Hold git's own index.lock for the whole batch, so a concurrent git
+            # command fails fast instead of interleaving with these commits
+            with self._writing_index(index):
+                # Start every path from HEAD so user-staged content of later groups
+                # does not leak into earlier commits
+                self._reset_entries(index, all_paths, self._head_tree())
+                return self._commit_each(index, groups, self._commit_entries)
+
+        # Hooks may run git themselves (git add, lint-staged, formatters), so
+        # index.lock is only held while this process writes the index
+        with self._writing_index(index):
+            self._reset_entries(index, all_paths, self._head_tree())
+        return self._commit_each(index, groups, self._commit_entries_with_hooks)
+
+    def _commit_each(self, index: IndexFile, groups, commit_entries) -> List[Optional[str]]:
+        shas = []
+        for message, entries in groups:
+            try:
+                shas.append(commit_entries(index, message, entries))
+            except RepoBusyError:
+                raise
+            except OSError as e:
+                # A ref lock is held by someone else; the rest would fail too
+                print(f"Commit failed for {', '.join(entries)}: {e}")
+                self._reset_failed_group(index, entries)
+                shas.extend([None] * (len(groups) - len(shas)))
+                break
+            except Exception as e:
+                print(f"Commit failed for {', '.join(entries)}: {e}")
+                self._reset_failed_group(index, entries)
+                shas.append(None)
+        return shas
+
+    def _commit_entries(self, index: IndexFile, message: str, entries) -> str:
+        """Commit on the in-memory index; the caller holds index.lock"""
+        self._apply_entries(index, entries)
+        return index.commit(message, skip_hooks=True).hexsha
+
+    def _commit_entries_with_hooks(self, index: IndexFile, message: str, entries) -> str:
+        """Commit like git commit does: the hooks see the group's entries in the index file"""
+        from git.index.fun import run_commit_hook
+        with self._writing_index(index):
+            self._apply_entries(index, entries)
+        run_commit_hook('pre-commit', index)
+        # Pick up whatever the hook staged
+        index.update()
+        editmsg_path = Path(self.repo.git_dir) / 'COMMIT_EDITMSG'
+        editmsg_path.write_text(message, encoding='utf-8')
+        run_commit_hook('commit-msg', index, str(editmsg_path))
+        message = editmsg_path.read_text(encoding='utf-8')
+        commit = index.commit(message, skip_hooks=True)
+        try:
+            run_commit_hook('post-commit', index)
+        except git.exc.HookExecutionError as e:
+            # Like git, a failing post-commit hook does not undo the commit
+            print(f"post-commit hook failed: {e}")
+        return commit.hexsha
+
+    def _reset_failed_group(self, index: IndexFile, entries):
+        if self._has_commit_hooks():
+            index.update()
+            with self._writing_index(index):
+                self._reset_entries(index, list(entries), self._head_tree())
+        else:
+            self._reset_entries(index, list(entries), self._head_tree())
+
+    def _has_commit_hooks(self) -> bool:
+        hooks_dir = Path(self.repo.git_dir) / 'hooks'
+        try:
+            hooks_path = self.repo.config_reader().get_value('core', 'hooksPath', '')
+        except Exception:
+            hooks_path = ''
+        if hooks_path:
+            hooks_dir = Path(self.repo.working_tree_dir) / os.path.expanduser(hooks_path)
+        return any(os.access(hooks_dir / name, os.X_OK) for name in ('pre-commit', 'commit-msg', 'post-commit'))
+
+    @contextmanager
+    def _writing_index(self, index: IndexFile):
+        """Hold index.lock around changes to the in-memory index, then write it"""
+        index_lock = LockedFD(index.path)
+        try:
+            stream = index_lock.open(write=True, stream=True)
+        except OSError as e:
+            raise RepoBusyError(str(e))
+        try:
+            yield
+            # The cached TREE extension no longer matches the entries
+            index._serialize(stream, ignore_extension_data=True)
+        except BaseException:
+            index_lock.rollback()
+            raise
+        index_lock.commit()
+
+    def get_streamable_paths(self, paths: List[str]) -> List[str]:
+        """Paths whose blob is the file's bytes as they are on disk
+
+        Those are regular files with no clean filter, end-of-line conversion,
+        ident or working-tree-encoding attribute, and only when core.autocrlf
+        is off. Their contents can be streamed to git fast-import directly;
+        everything else has to go through git hash-object.
+        """
+        if not self.repo or not paths:
+            return []
+        autocrlf = str(self.repo.config_reader().get_value('core', 'autocrlf', 'false')).lower()
+        if autocrlf in ('true', 'input'):
+            return []
+        attributes = self._check_attr(CONVERSION_ATTRIBUTES, paths)
+        streamable = []
+        for path in paths:
+            if any(value != 'unspecified' for value in attributes.get(path, {}).values()):
+                continue
+            try:
+                if stat.S_ISREG(os.lstat(self.project_path / path).st_mode):
+                    streamable.append(path)
+            except FileNotFoundError:
+                continue
+        return streamable
+
+    def fast_import_groups(self, groups: List[Tuple[str, Dict[str, Optional[tuple]]]],
+                           ref: Optional[str] = None) -> Tuple[List[Optional[str]], Dict[str, Tuple[int, str]]]:
+        """commit_groups / commit_snapshot_groups through one git fast-import process
+
+        Entries are ``(mode, sha, stat_result)``; a sha of None means the
+        file's bytes are streamed from the working tree (see
+        get_streamable_paths) and its mode taken from stat_result. Blobs, trees and every group's commit end up
+        in a single packfile instead of thousands of loose objects, and the
+        branch (or the shadow ref when ref is given) is updated once at the
+        end, only if that is a fast-forward. The index, or the shadow index,
+        is then updated for the committed paths. No commit hooks run.
+
+        Returns the commit sha per group (all None if the import failed) and
+        path -> (mode, sha) for the streamed files.
+        """
+        if not self.repo or not groups:
+            return [None] * len(groups), {}
+
+        if ref is None:
+            try:
+                target = self.repo.active_branch.path
+            except TypeError:
+                raise ValueError("fast-import needs a checked-out branch; HEAD is detached")
+            parent = self.resolve_ref('HEAD')
+            index = self.repo.index
+            index_lock = LockedFD(index.path)
+            try:
+                stream = index_lock.open(write=True, stream=True)
+            except OSError as e:
+                raise RepoBusyError(str(e))
+        else:
+            target = ref
+            parent = self.resolve_ref(ref) or self.resolve_ref('HEAD')
+            index = IndexFile(self.repo, str(self._ensure_shadow_index(ref)))
+            index_lock = None
+
+        try:
+            shas, blobs = self._run_fast_import(groups, target, parent)
+            if shas[0] is not None:
+                for _, entries in groups:
+                    self._apply_entries(index, {
+                        path: None if entry is None else blobs.get(path, entry[:2]) + tuple(entry[2:])
+                        for path, entry in entries.items()
+                    })
+                if index_lock is not None:
+                    index._serialize(stream, ignore_extension_data=True)
+                else:
+                    index.write(ignore_extension_data=True)
+        except BaseException:
+            if index_lock is not None:
+                index_lock.rollback()
+            raise
+        if index_lock is not None:
+            if shas[0] is not None:
+                index_lock.commit()
+            else:
+                index_lock.rollback()
+        return shas, blobs
+
+    def _run_fast_import(self, groups, target: str, parent: Optional[str]) -> Tuple[List[Optional[str]], Dict[str, tuple]]:
+        author = self.repo.git.var('GIT_AUTHOR_IDENT')
+        committer = self.repo.git.var('GIT_COMMITTER_IDENT')
+        state_dir = get_state_dir(str(self.project_path))
+        marks_path = state_dir / 'fast-import.marks'
+        with tempfile.TemporaryFile(dir=str(state_dir)) as errors:
+            process = subprocess.Popen(
+                ['git', 'fast-import', '--quiet', '--done', f"--export-marks={marks_path}"],
+                cwd=str(self.project_path), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors
+            )
+            blobs = {}
+            commit_marks = []
+            try:
+                out = process.stdin
+                mark = 0
+                for message, entries in groups:
+                    blob_marks = {}
+                    for path, entry in entries.items():
+                        if entry is not None and entry[1] is None:
+                            mark += 1
+                            mode = self._file_mode(entry[2] if len(entry) > 2 and entry[2] else os.lstat(self.project_path / path))
+                            blobs[path] = (mode, self._stream_blob(out, mark, path))
+                            blob_marks[path] = mark
+
+                    mark += 1
+                    commit_marks.append(mark)
+                    data = message.encode('utf-8')
+                    out.write(f"commit {target}\nmark :{mark}\nauthor {author}\ncommitter {committer}\n".encode('utf-8'))
+                    out.write(b'data %d\n' % len(data) + data + b'\n')
+                    if parent and len(commit_marks) == 1:
+                        out.write(f"from {parent}\n".encode('ascii'))
+                    for path, entry in entries.items():
+                        quoted = self._fast_import_path(path)
+                        if entry is None:
+                            out.write(b'D ' + quoted + b'\n')
+                        elif path in blob_marks:
+                            out.write(f"M {blobs[path][0]:o} :{blob_marks[path]} ".encode('ascii') + quoted + b'\n')
+                        else:
+                            out.write(f"M {entry[0]:o} {entry[1]} ".encode('ascii') + quoted + b'\n')
+                out.write(b'done\n')
+                out.close()
+            except Exception as e:
+                process.kill()
+                process.wait()
+                print(f"Commit failed, fast-import aborted: {e}")
+                return [None] * len(groups), {}
+
+            if process.wait() != 0:
+                errors.seek(0)
+                print(f"Commit failed, fast-import exited with {process.returncode}: "
+                      f"{errors.read().decode('utf-8', 'replace').strip()}")
+                return [None] * len(groups), {}
+
+        marks = {}
+        with open(marks_path, 'r', encoding='ascii') as f:
+            for line in f:
+                mark, sha = line.split()
+                marks[mark] = sha
+        os.unlink(marks_path)
+        return [marks[f":{mark}"] for mark in commit_marks], blobs
+
+    def _stream_blob(self, out, mark: int, path: str, chunk_size: int = 1 << 20) -> str:
+        """Write one file as a fast-import blob; returns its blob id"""
+        with open(self.project_path / path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            digest = hashlib.sha1(b'blob %d\0' % size)
+            out.write(b'blob\nmark :%d\ndata %d\n' % (mark, size))
+            remaining = size
+            while remaining:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise OSError(f"{path} shrank while it was being committed")
+                digest.update(chunk)
+                out.write(chunk)
+                remaining -= len(chunk)
+            out.write(b'\n')
+        return digest.hexdigest()
+
+    @staticmethod
+    def _fast_import_path(path: str) -> bytes:
+        # Paths are taken literally unless they start with a quote or hold a newline
+        if path.startswith('"') or '\n' in path:
+            escaped = path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            return f'"{escaped}"'.encode('utf-8', 'surrogateescape')
+        return path.encode('utf-8', 'surrogateescape')
+
+    def _check_attr(self, attributes: List[str], paths: List[str]) -> Dict[str, Dict[str, str]]:
+        """path -> {attribute: value} from one ``git check-attr --stdin`` call"""
+        result = subprocess.run(
+            ['git', 'check-attr', '--stdin', '-z'] + list(attributes),
+            cwd=str(self.project_path), input=''.join(path + '\0' for path in paths).encode('utf-8', 'surrogateescape'),
+            capture_output=True, check=True
+        )
+        fields = result.stdout.decode('utf-8', 'surrogateescape').split('\0')
+        values = {}
+        for i in range(0, len(fields) - 2, 3):
+            values.setdefault(fields[i], {})[fields[i + 1]] = fields[i + 2]
+        return values
+
+    def get_shadow_ref(self) -> str:
+        """Shadow ref that snapshot mode commits to for the current branch"""
+        try:
+            branch = self.repo.active_branch.name
+        except TypeError:
+            branch = 'detached'
+        return SHADOW_REF_PREFIX + branch
+
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """Get the commit sha a ref points to, or None if it does not exist"""
+        try:
+            return self.repo.git.rev_parse('--verify', '--quiet', f"{ref}^{{commit}}")
+        except git.GitCommandError:
+            return None
+
+    def get_shadow_index_path(self, ref: str) -> Path:
+        """Alternate index file that mirrors a shadow ref's tree"""
+        name = ref[len(SHADOW_REF_PREFIX):] if ref.startswith(SHADOW_REF_PREFIX) else ref
+        return get_state_dir(str(self.project_path)) / 'shadow' / f"{name}.index"
+
+    def get_snapshot_changes(self, ref: str) -> Dict[str, str]:
+        """Changes in the working tree since the last snapshot on ref
+
+        Runs ``git status`` against the shadow index (via GIT_INDEX_FILE), so
+        the comparison is stat-cached and the user's index is never read.
+        """
+        if not self.repo:
+            return {}
+
+        env = {'GIT_INDEX_FILE': str(self._ensure_shadow_index(ref))}
+        output = self.repo.git.status('--porcelain', '-z', '--untracked-files=all', '--no-renames', env=env)
+        changes = {}
+        for entry in output.split('\0'):
+            if len(entry) < 4:
+                continue
+            code, path = entry[:2], entry[3:]
+            # Only the worktree column matters; the index column compares to HEAD
+            if code == '??':
+                changes[path] = 'added'
+            elif code[1] == 'D':
+                changes[path] = 'deleted'
+            elif code[1] in 'MT':
+                changes[path] = 'modified'
+        return changes
+
+    def commit_snapshot_groups(self, groups: List[Tuple[str, Dict[str, Optional[Tuple[int, str]]]]],
+                               ref: str) -> List[Optional[str]]:
+        """Like commit_groups, but commits onto a shadow ref
+
+        Trees are built in the shadow index, commits are chained from the
+        ref's current tip (or HEAD for the first snapshot) and the ref is
+        moved once with a compare-and-swap. HEAD and the user's index are
+        left untouched and no commit hooks run.
+        """
+        if not self.repo:
+            return [None] * len(groups)
+
+        old_sha = self.resolve_ref(ref)
+        parent_sha = old_sha or self.resolve_ref('HEAD')
+        parent = self.repo.commit(parent_sha) if parent_sha else None
+        index = IndexFile(self.repo, str(self._ensure_shadow_index(ref)))
+
+        new_tip = None
+        shas = []
+        for message, entries in groups:
+            try:
+                self._apply_entries(index, entries)
+                commit = Commit.create_from_tree(self.repo, index.write_tree(), message,
+                                                 parent_commits=[parent] if parent else [], head=False)
+                parent = commit
+                new_tip = commit.hexsha
+                shas.append(commit.hexsha)
+            except Exception as e:
+                print(f"Snapshot failed for {', '.join(entries)}: {e}")
+                self._reset_entries(index, list(entries), parent.tree if parent else None)
+                shas.append(None)
+
+        if new_tip:
+            self.repo.git.update_ref('-m', 'autocommit: snapshot', ref, new_tip, old_sha or NULL_SHA)
+        index.write(ignore_extension_data=True)
+        return shas
+
+    def materialize_snapshots(self, ref: str, squash: bool = False, message: Optional[str] = None) -> Optional[str]:
+        """Move a shadow ref's snapshots onto the current branch
+
+        Without squash the branch is fast-forwarded to the snapshots, which
+        requires that it has not moved since the first one. With squash a
+        single commit with the latest snapshot's tree is added on top of
+        HEAD. The user's index is reset to the new HEAD, the working tree is
+        not touched, and the shadow ref is deleted. Returns the new HEAD sha.
+        """
+        shadow_sha = self.resolve_ref(ref)
+        if shadow_sha is None:
+            return None
+        head_sha = self.resolve_ref('HEAD')
+
+        if not squash:
+            if head_sha and not self.repo.is_ancestor(head_sha, shadow_sha):
+                raise ValueError("Branch has moved since the snapshots were taken; use squash instead")
+            new_sha = shadow_sha
+        else:
+            shadow = self.repo.commit(shadow_sha)
+            if message is None:
+                count = self.count_commits(f"{head_sha}..{shadow_sha}" if head_sha else shadow_sha)
+                message = f"Squash {count} autocommit snapshot(s)"
+            parents = [self.repo.commit(head_sha)] if head_sha else []
+            new_sha = Commit.create_from_tree(self.repo, shadow.tree, message, parent_commits=parents, head=False).hexsha
+
+        self.repo.git.update_ref('-m', 'autocommit: materialize snapshots', 'HEAD', new_sha, head_sha or NULL_SHA)
+        self.repo.git.reset('-q')
+        self.discard_snapshots(ref)
+        return new_sha
+
+    def discard_snapshots(self, ref: str):
+        """Delete a shadow ref and its shadow index"""
+        if self.resolve_ref(ref):
+            self.repo.git.update_ref('-d', ref)
+        try:
+            self.get_shadow_index_path(ref).unlink()
+        except FileNotFoundError:
+            pass
+
+    def count_commits(self, revision_range: str) -> int:
+        return int(self.repo.git.rev_list('--count', revision_range))
+
+    def _ensure_shadow_index(self, ref: str) -> Path:
+        index_path = self.get_shadow_index_path(ref)
+        if not index_path.exists():
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            base = self.resolve_ref(ref) or self.resolve_ref('HEAD')
+            env = {'GIT_INDEX_FILE': str(index_path)}
+            if base:
+                self.repo.git.read_tree(base, env=env)
+            else:
+                self.repo.git.read_tree('--empty', env=env)
+        return index_path
+
+    def _apply_entries(self, index, entries: Dict[str, Optional[tuple]]):
+        # Entries are (mode, sha) or (mode, sha, stat_result); with stat data
+        # git can trust the entry without re-hashing the file
+        for path, entry in entries.items():
+            if entry is None:
+                index.entries.pop((path, 0), None)
+                continue
+            mode, sha = entry[0], entry[1]
+            base = BaseIndexEntry((mode, bytes.fromhex(sha), 0, path))
+            st = entry[2] if len(entry) > 2 else None
+            if st is None:
+                index.entries[(path, 0)] = IndexEntry.from_base(base)
+            else:
+                index.entries[(path, 0)] = IndexEntry((
+                    mode, base.binsha, base.flags, path,
+                    self._pack_time(st.st_ctime_ns), self._pack_time(st.st_mtime_ns),
+                    st.st_dev & 0xffffffff, st.st_ino & 0xffffffff,
+                    st.st_uid & 0xffffffff, st.st_gid & 0xffffffff, st.st_size & 0xffffffff,
+                ))
+
+    def _head_tree(self):
+        try:
+            return self.repo.head.commit.tree
+        except ValueError:
+            return None
+
+    def _reset_entries(self, index, paths: List[str], tree):
+        for path in paths:
+            try:
+                blob = tree[path] if tree is not None else None
+            except KeyError:
+                blob = None
+            if blob is None:
+                index.entries.pop((path, 0), None)
+            else:
+                index.entries[(path, 0)] = IndexEntry.from_base(BaseIndexEntry((blob.mode, blob.binsha, 0, path)))
+
+    def _hash_batch(self, batch: List[Tuple[str, os.stat_result]]) -> Dict[str, Tuple[int, str]]:
+        try:
+            result = subprocess.run(
+                ['git', 'hash-object', '-w', '--stdin-paths'],
+                cwd=str(self.project_path), input=''.join(path + '\n' for path, _ in batch),
+                capture_output=True, text=True, check=True
+            )
+        except subprocess.CalledProcessError:
+            # A file removed after it was listed fails the whole batch; retry without it
+            present = [(path, st) for path, st in batch if os.path.lexists(self.project_path / path)]
+            if len(present) == len(batch):
+                raise
+            return self._hash_batch(present) if present else {}
+        shas = result.stdout.split()
+        if len(shas) != len(batch):
+            raise RuntimeError(f"git hash-object returned {len(shas)} ids for {len(batch)} paths")
+        return {path: (self._file_mode(st), sha) for (path, st), sha in zip(batch, shas)}
+
+    @staticmethod
+    def _split_batches(files: List[Tuple[str, os.stat_result]], workers: int) -> List[list]:
+        """Spread files over at most workers batches of similar total size"""
+        count = min(workers, (len(files) + MIN_PATHS_PER_WORKER - 1) // MIN_PATHS_PER_WORKER)
+        if count <= 1:
+            return [files] if files else []
+        # Largest first, each into the currently lightest batch
+        batches = [[] for _ in range(count)]
+        heap = [(0, i) for i in range(count)]
+        for path, st in sorted(files, key=lambda item: item[1].st_size, reverse=True):
+            size, i = heapq.heappop(heap)
+            batches[i].append((path, st))
+            heapq.heappush(heap, (size + st.st_size + FILE_OVERHEAD_BYTES, i))
+        return batches
+
+    def _hash_bytes(self, data: bytes) -> str:
+        result = subprocess.run(
+            ['git', 'hash-object', '-w', '--stdin', '--no-filters'],
+            cwd=str(self.project_path), input=data, capture_output=True, check=True
+        )
+        return result.stdout.decode('ascii').strip()
+
+    @staticmethod
+    def _pack_time(time_ns: int) -> bytes:
+        seconds, nanoseconds = divmod(time_ns, 1000000000)
+        return struct.pack(">LL", seconds & 0xffffffff, nanoseconds)
+
+    @staticmethod
+    def _file_mode(st: os.stat_result) -> int:
+        return MODE_EXECUTABLE if st.st_mode & stat.S_IXUSR else MODE_FILE
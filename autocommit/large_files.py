@@ -0,0 +1,64 @@
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+# Pointer format written by git-lfs' clean filter
+LFS_SPEC = 'https://git-lfs.github.com/spec/v1'
+
+LFS_ATTRIBUTES = 'filter=lfs diff=lfs merge=lfs -text'
+
+def format_size(size: int) -> str:
+    """Human readable byte count, e.g. 1.5 GB"""
+    value = float(size)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+
+def lfs_pointer(oid: str, size: int) -> bytes:
+    """Contents of the Git LFS pointer file for an object"""
+    return f"version {LFS_SPEC}\noid sha256:{oid}\nsize {size}\n".encode('ascii')
+
+def lfs_object_path(git_dir: Path, oid: str) -> Path:
+    """Where git-lfs keeps the local copy of an object"""
+    return Path(git_dir) / 'lfs' / 'objects' / oid[0:2] / oid[2:4] / oid
+
+def store_lfs_object(git_dir: Path, path: Path, chunk_size: int = 1 << 20) -> Tuple[str, int]:
+    """Copy a file into the local LFS object store; returns (sha256, size)
+
+    The file is hashed while it is copied, a chunk at a time, so memory use
+    does not depend on its size. The object is moved into place only once
+    it is complete, and an object that is already stored is not replaced.
+    """
+    tmp_dir = Path(git_dir) / 'lfs' / 'tmp'
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='autocommit-', dir=str(tmp_dir))
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out, open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        oid = digest.hexdigest()
+        target = lfs_object_path(git_dir, oid)
+        if target.exists():
+            os.unlink(tmp_path)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return oid, size
+
+def lfs_attribute_pattern(path: str) -> str:
+    """A .gitattributes pattern matching exactly one repository path"""
+    escaped = ''.join('\\' + char if char in '*?[]\\!#' else char for char in path)
+    return '/' + escaped.replace(' ', '[[:space:]]')
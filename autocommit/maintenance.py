@@ -0,0 +1,297 @@
+import os
+import json
+import asyncio
+import time
+import signal
+import logging
+import subprocess
+import threading
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+from .paths import get_state_dir
+
+# (name, git arguments), in the order they run. Each step is safe to
+# interrupt: git writes new packs and graphs to temporary files first.
+MAINTENANCE_TASKS = (
+    ('loose-objects', ['maintenance', 'run', '--quiet', '--task=loose-objects']),
+    ('multi-pack-index', ['multi-pack-index', 'write', '--no-progress']),
+    ('incremental-repack', ['maintenance', 'run', '--quiet', '--task=incremental-repack']),
+    ('commit-graph', ['commit-graph', 'write', '--reachable', '--split', '--changed-paths', '--no-progress']),
+    ('prune', ['prune', '--expire=2.weeks.ago']),
+)
+
+# Run before the interval is up once this many loose objects pile up (git's gc.auto)
+LOOSE_OBJECTS_LIMIT = 6700
+
+def count_loose_objects(project_path: str) -> int:
+    """Number of loose objects, from ``git count-objects``"""
+    result = subprocess.run(['git', 'count-objects'], cwd=project_path,
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.split()[0])
+
+def is_machine_idle(max_load: float = 0.5) -> bool:
+    """Whether the 1-minute load per CPU is below max_load and we are not on battery"""
+    import psutil
+    try:
+        battery = psutil.sensors_battery()
+    except (AttributeError, NotImplementedError):
+        battery = None
+    if battery is not None and not battery.power_plugged:
+        return False
+    return psutil.getloadavg()[0] / (os.cpu_count() or 1) < max_load
+
+class MaintenanceRunner:
+    """Time-budgeted, cancellable git maintenance for one repository
+
+    Runs MAINTENANCE_TASKS one git process at a time. Between tasks, and
+    every poll_interval seconds while one runs, should_cancel() is checked;
+    when it returns True, cancel() is called or the budget is used up, the
+    running git process is terminated and the remaining tasks are left for
+    the next run. The time and result of the last run are kept in
+    .git/autocommit/maintenance.json.
+
+    run_async() does the same on an event loop: git runs as an asyncio
+    subprocess, should_cancel() is called in an executor thread, and
+    cancelling the task terminates the running git process.
+    """
+
+    STATE_FILENAME = 'maintenance.json'
+
+    def __init__(self, project_path: str, budget_seconds: float = 300.0,
+                 should_cancel: Optional[Callable[[], bool]] = None, poll_interval: float = 0.5):
+        self.project_path = Path(project_path)
+        self.budget_seconds = budget_seconds
+        self.should_cancel = should_cancel
+        self.poll_interval = poll_interval
+        self.state_path = get_state_dir(str(self.project_path)) / self.STATE_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self._cancelled = threading.Event()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def cancel(self):
+        """Stop the current run as soon as possible"""
+        self._cancelled.set()
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_due(self, interval_hours: float = 24.0) -> bool:
+        """Whether the last complete run is older than interval_hours or loose objects piled up"""
+        state = self.load_state()
+        if time.time() - state.get('last_complete', 0) >= interval_hours * 3600:
+            return True
+        try:
+            return count_loose_objects(str(self.project_path)) >= LOOSE_OBJECTS_LIMIT
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            return False
+
+    def run(self, tasks: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the tasks (default: all, resuming after an interrupted run)"""
+        state, tasks, deadline, result = self._begin(tasks)
+        try:
+            for name, args in self._selected(tasks):
+                reason = self._stop_reason(deadline)
+                if reason:
+                    result['stopped'] = reason
+                    break
+                if self._record(result, name, self._run_task(name, args, deadline)):
+                    break
+        finally:
+            self._running = False
+        return self._finish(state, tasks, result)
+
+    async def run_async(self, tasks: Optional[List[str]] = None,
+                        executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """run() for an event loop; should_cancel() is called in executor"""
+        state, tasks, deadline, result = self._begin(tasks)
+        try:
+            for name, args in self._selected(tasks):
+                reason = await self._stop_reason_async(deadline, executor)
+                if reason:
+                    result['stopped'] = reason
+                    break
+                outcome = await self._run_task_async(name, args, deadline, executor)
+                if self._record(result, name, outcome):
+                    break
+        except asyncio.CancelledError:
+            self._running = False
+            result['stopped'] = 'cancelled'
+            self._finish(state, tasks, result)
+            raise
+        finally:
+            self._running = False
+        return self._finish(state, tasks, result)
+
+    def _begin(self, tasks: Optional[List[str]]):
+        state = self.load_state()
+        names = [name for name, _ in MAINTENANCE_TASKS]
+        if tasks is None:
+            tasks = state.get('pending') or names
+        unknown = set(tasks) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown maintenance task: {', '.join(sorted(unknown))}")
+
+        self._cancelled.clear()
+        self._running = True
+        self._started = time.monotonic()
+        result = {'started_at': time.time(), 'completed': [], 'failed': [], 'stopped': None, 'timings': {}}
+        return state, tasks, self._started + self.budget_seconds, result
+
+    @staticmethod
+    def _selected(tasks: List[str]):
+        return [(name, args) for name, args in MAINTENANCE_TASKS if name in tasks]
+
+    def _record(self, result: Dict[str, Any], name: str, outcome: str) -> bool:
+        """Record a task's outcome; True if the run has to stop"""
+        result['timings'][name] = time.monotonic() - self._task_started
+        if outcome == 'ok':
+            result['completed'].append(name)
+        elif outcome == 'failed':
+            result['failed'].append(name)
+        else:
+            result['stopped'] = outcome
+            return True
+        return False
+
+    def _finish(self, state: Dict[str, Any], tasks: List[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        result['duration'] = time.monotonic() - self._started
+        result['pending'] = [name for name, _ in MAINTENANCE_TASKS if name in tasks
+                             and name not in result['completed'] and name not in result['failed']]
+        state['last_run'] = result['started_at']
+        state['last_result'] = result
+        state['pending'] = result['pending']
+        if not result['pending']:
+            state['last_complete'] = result['started_at']
+        self._save_state(state)
+        if result['stopped']:
+            self.logger.info(f"Maintenance stopped ({result['stopped']}), {len(result['pending'])} task(s) left")
+        return result
+
+    def _stop_reason(self, deadline: float) -> Optional[str]:
+        if self._cancelled.is_set():
+            return 'cancelled'
+        if self.should_cancel is not None:
+            try:
+                if self.should_cancel():
+                    return 'cancelled'
+            except Exception as e:
+                self.logger.error(f"Maintenance cancel check failed: {e}")
+                return 'cancelled'
+        if time.monotonic() >= deadline:
+            return 'budget'
+        return None
+
+    def _run_task(self, name: str, args: List[str], deadline: float) -> str:
+        """'ok', 'failed', or the reason the task was interrupted"""
+        self._task_started = time.monotonic()
+        self.logger.debug(f"Maintenance task {name}: git {' '.join(args)}")
+        process = subprocess.Popen(['git'] + args, cwd=str(self.project_path),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   start_new_session=(os.name != 'nt'))
+        try:
+            while True:
+                try:
+                    _, stderr = process.communicate(timeout=self.poll_interval)
+                    break
+                except subprocess.TimeoutExpired:
+                    reason = self._stop_reason(deadline)
+                    if reason:
+                        self._terminate(process)
+                        return reason
+        except BaseException:
+            # Ctrl+C does not reach git in its own session
+            self._terminate(process)
+            raise
+        if process.returncode != 0:
+            self.logger.warning(f"Maintenance task {name} failed: {stderr.decode('utf-8', 'replace').strip()}")
+            return 'failed'
+        return 'ok'
+
+    async def _stop_reason_async(self, deadline: float, executor: Optional[Executor]) -> Optional[str]:
+        if self.should_cancel is None or self._cancelled.is_set():
+            return self._stop_reason(deadline)
+        # should_cancel() may scan processes, which must not block the loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._stop_reason, deadline)
+
+    async def _run_task_async(self, name: str, args: List[str], deadline: float,
+                              executor: Optional[Executor]) -> str:
+        self._task_started = time.monotonic()
+        self.logger.debug(f"Maintenance task {name}: git {' '.join(args)}")
+        process = await asyncio.create_subprocess_exec('git', *args, cwd=str(self.project_path),
+                                                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                                       start_new_session=(os.name != 'nt'))
+        communicate = asyncio.ensure_future(process.communicate())
+        try:
+            while True:
+                done, _ = await asyncio.wait({communicate}, timeout=self.poll_interval)
+                if done:
+                    _, stderr = communicate.result()
+                    break
+                reason = await self._stop_reason_async(deadline, executor)
+                if reason:
+                    await self._terminate_async(process, communicate)
+                    return reason
+        except BaseException:
+            await asyncio.shield(self._terminate_async(process, communicate))
+            raise
+        if process.returncode != 0:
+            self.logger.warning(f"Maintenance task {name} failed: {stderr.decode('utf-8', 'replace').strip()}")
+            return 'failed'
+        return 'ok'
+
+    async def _terminate_async(self, process: asyncio.subprocess.Process, communicate: asyncio.Future):
+        if process.returncode is None:
+            self._signal(process, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(asyncio.shield(communicate), 5)
+            except asyncio.TimeoutError:
+                self._signal(process, getattr(signal, 'SIGKILL', signal.SIGTERM))
+        await asyncio.gather(communicate, return_exceptions=True)
+
+    @staticmethod
+    def _signal(process, signum: int):
+        try:
+            if os.name != 'nt':
+                os.killpg(process.pid, signum)
+            elif signum == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def _terminate(self, process: subprocess.Popen):
+        # git maintenance spawns children, so signal the whole process group
+        try:
+            if os.name != 'nt':
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            if os.name != 'nt':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+            process.wait()
+        except ProcessLookupError:
+            process.wait()
+
+    def _save_state(self, state: Dict[str, Any]):
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            self.logger.error(f"Failed to save maintenance state: {e}")
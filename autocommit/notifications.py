@@ -10,6 +10,8 @@ import json
 from datetime import datetime
 import subprocess
 import platform
+import threading
+import time
 
 class EmailNotifier:
     def __init__(self, smtp_server: str, smtp_port: int, username: str, password: str, from_email: str):
@@ -71,16 +73,139 @@ class EmailNotifier:
 
         return html
 
+class DBusErrorReply(Exception):
+    """The notification service answered with a D-Bus error message"""
+
+class DBusNotificationBackend:
+    """Send desktop notifications over a persistent D-Bus session connection
+
+    Talks to org.freedesktop.Notifications directly instead of spawning
+    notify-send for every event. Requires the optional ``jeepney`` package
+    (``pip install gravitycommit[linux]``).
+    """
+
+    BUS_NAME = 'org.freedesktop.Notifications'
+    OBJECT_PATH = '/org/freedesktop/Notifications'
+    INTERFACE = 'org.freedesktop.Notifications'
+
+    def __init__(self, app_name: str = 'GravityCommit', timeout: float = 2.0, retry_interval: float = 60.0):
+        self.app_name = app_name
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger(__name__)
+        self._connection = None
+        self._address = None
+        self._retry_after = 0.0
+        self._notification_ids = {}
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Check whether a notification service can be reached on the session bus"""
+        with self._lock:
+            return self._connect()
+
+    def notify(self, title: str, message: str, replace_key: Optional[str] = None, expire_timeout: int = -1) -> bool:
+        """Show a notification, replacing the previous one sent with the same replace_key"""
+        with self._lock:
+            if not self._connect():
+                return False
+
+            replaces_id = self._notification_ids.get(replace_key, 0) if replace_key else 0
+            try:
+                notification_id = self._call_notify(title, message, replaces_id, expire_timeout)
+            except DBusErrorReply as e:
+                # The bus works but the service refused; let the caller fall back
+                self.logger.warning(f"D-Bus notification failed: {e}")
+                return False
+            except Exception as e:
+                # The bus or the notification daemon went away; reconnect once
+                self.logger.debug(f"D-Bus notification failed, reconnecting: {e}")
+                self._disconnect()
+                if not self._connect():
+                    return False
+                try:
+                    notification_id = self._call_notify(title, message, replaces_id, expire_timeout)
+                except DBusErrorReply as e:
+                    self.logger.warning(f"D-Bus notification failed: {e}")
+                    return False
+                except Exception as e:
+                    self.logger.warning(f"D-Bus notification failed: {e}")
+                    self._disconnect()
+                    self._retry_after = time.monotonic() + self.retry_interval
+                    return False
+
+            if replace_key:
+                self._notification_ids[replace_key] = notification_id
+            return True
+
+    def close(self):
+        """Close the session bus connection"""
+        with self._lock:
+            self._disconnect()
+            self._retry_after = 0.0
+
+    def _call_notify(self, title: str, message: str, replaces_id: int, expire_timeout: int) -> int:
+        from jeepney import MessageType, HeaderFields, new_method_call
+
+        msg = new_method_call(
+            self._address, 'Notify', 'susssasa{sv}i',
+            (self.app_name, replaces_id, '', title, message, [], {}, expire_timeout)
+        )
+        reply = self._connection.send_and_get_reply(msg, timeout=self.timeout)
+        if reply.header.message_type == MessageType.error:
+            error_name = reply.header.fields.get(HeaderFields.error_name, 'unknown error')
+            raise DBusErrorReply(f"{error_name}: {reply.body[0] if reply.body else ''}")
+        if not reply.body:
+            raise DBusErrorReply("Notify returned no notification id")
+        return reply.body[0]
+
+    def _connect(self) -> bool:
+        if self._connection is not None:
+            return True
+        if time.monotonic() < self._retry_after:
+            return False
+
+        try:
+            from jeepney import DBusAddress
+            from jeepney.io.blocking import open_dbus_connection
+        except ImportError:
+            self.logger.debug("jeepney not installed, D-Bus notifications unavailable")
+            self._retry_after = float('inf')
+            return False
+
+        try:
+            self._connection = open_dbus_connection(bus='SESSION')
+            self._address = DBusAddress(self.OBJECT_PATH, bus_name=self.BUS_NAME, interface=self.INTERFACE)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Could not connect to D-Bus session bus: {e}")
+            self._connection = None
+            self._retry_after = time.monotonic() + self.retry_interval
+            return False
+
+    def _disconnect(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+
 class DesktopNotifier:
-    def __init__(self):
+    def __init__(self, use_dbus: bool = True):
         self.system = platform.system().lower()
         self.logger = logging.getLogger(__name__)
+        self.dbus = DBusNotificationBackend() if use_dbus and self.system == 'linux' else None
+
+    def send_notification(self, title: str, message: str, commit_info: Dict[str, Any] = None, replace_key: Optional[str] = None):
+        """Send desktop notification
 
-    def send_notification(self, title: str, message: str, commit_info: Dict[str, Any] = None):
-        """Send desktop notification"""
+        Notifications sharing a replace_key (the title by default) update
+        each other in place where the platform supports it.
+        """
         try:
             if self.system == 'linux':
-                return self._notify_linux(title, message)
+                return self._notify_linux(title, message, replace_key or title)
             elif self.system == 'darwin':  # macOS
                 return self._notify_macos(title, message)
             elif self.system == 'windows':
@@ -92,7 +217,13 @@ class DesktopNotifier:
             self.logger.error(f"Failed to send desktop notification: {e}")
             return False
 
-    def _notify_linux(self, title: str, message: str) -> bool:
+    def _notify_linux(self, title: str, message: str, replace_key: Optional[str] = None) -> bool:
+        """Send notification on Linux over D-Bus, falling back to notify-send"""
+        if self.dbus and self.dbus.notify(title, message, replace_key=replace_key):
+            return True
+        return self._notify_linux_subprocess(title, message)
+
+    def _notify_linux_subprocess(self, title: str, message: str) -> bool:
         """Send notification on Linux using notify-send"""
         try:
             cmd = ['notify-send', title, message]
@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import Optional
+
+def get_git_dir(project_path: str) -> Optional[Path]:
+    """Locate the git directory of a working tree without importing GitPython
+
+    Handles both a regular .git directory and the ``gitdir:`` file used by
+    worktrees and submodules. Returns None if the path is not a repository.
+    """
+    dot_git = Path(project_path) / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+        if content.startswith('gitdir:'):
+            git_dir = Path(content[len('gitdir:'):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (Path(project_path) / git_dir).resolve()
+            return git_dir
+    return None
+
+def get_state_dir(project_path: str, create: bool = True) -> Optional[Path]:
+    """Directory for GravityCommit's per-repository state (.git/autocommit)"""
+    git_dir = get_git_dir(project_path)
+    if git_dir is None:
+        return None
+    state_dir = git_dir / 'autocommit'
+    if create:
+        state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
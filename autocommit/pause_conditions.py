@@ -0,0 +1,55 @@
+import os
+import re
+import logging
+from typing import List, Optional
+
+class PauseConditions:
+    """Host conditions under which scheduled commits hold off, e.g. while a build runs
+
+    processes are regular expressions searched in the name and command line
+    of every other process; max_load is the 1-minute load average above
+    which ticks wait (0 ignores the load). The load is checked first since
+    it is free, the process list only when it is needed.
+    """
+
+    def __init__(self, processes: Optional[List[str]] = None, max_load: float = 0.0):
+        self.logger = logging.getLogger(__name__)
+        self.configure(processes or [], max_load)
+
+    def configure(self, processes: List[str], max_load: float):
+        self.processes = list(processes)
+        self.max_load = max_load
+        self._patterns = [re.compile(pattern) for pattern in self.processes]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patterns) or self.max_load > 0
+
+    def check(self) -> Optional[str]:
+        """Why commits should wait right now, or None"""
+        if self.max_load > 0:
+            try:
+                load = os.getloadavg()[0]
+            except (AttributeError, OSError):
+                load = 0.0
+            if load > self.max_load:
+                return f"load average {load:.2f} > {self.max_load:g}"
+        if self._patterns:
+            name = self._matching_process()
+            if name:
+                return f"process '{name}' runs"
+        return None
+
+    def _matching_process(self) -> Optional[str]:
+        import psutil
+        own_pid = os.getpid()
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            info = proc.info
+            if info['pid'] == own_pid:
+                continue
+            name = info.get('name') or ''
+            cmdline = ' '.join(info.get('cmdline') or [])
+            for pattern in self._patterns:
+                if pattern.search(name) or pattern.search(cmdline):
+                    return name or cmdline
+        return None
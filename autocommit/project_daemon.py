@@ -0,0 +1,597 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from .config_manager import ConfigManager
+from .commit_generator import CommitGenerator
+from .commit_pipeline import CommitPipeline, echo_run
+from .git_operations import GitOperations
+from .project_monitor import ProjectMonitor
+from .adaptive_interval import AdaptiveInterval
+from .scheduler import LatencyHistogram, Scheduler, phase_for
+from .schedule_store import ScheduleStore
+from .pause_conditions import PauseConditions
+from .paths import get_state_dir
+from .tick_slots import TickSlots, TickSlotsBusy
+from .project_registry import ProjectRegistry
+from .control_socket import ControlServer
+from .maintenance import MaintenanceRunner, is_machine_idle
+
+if TYPE_CHECKING:
+    from .ci_cd_integration import CICDManager
+
+class ProjectDaemon:
+    """Auto-commit loop for one project, with its state served over the control socket
+
+    Used by both ``autocommit daemon`` and the container daemon. The CLI
+    talks to a running instance through ControlClient instead of rebuilding
+    its own Scheduler.
+
+    Ticks that find the project closed on an idle machine start repository
+    maintenance in the background when it is due. It is cancelled as soon
+    as the project is open again.
+
+    start()/stop() run it on its own threads; run_async() runs it as a task
+    on an event loop, which is how DaemonRuntime serves many projects from
+    one process.
+
+    Ticks of all daemons on a host are spread out: each project gets its own
+    phase within the interval (tick_spread) plus random jitter, and at most
+    max_concurrent_ticks of them commit at the same time.
+
+    With adaptive_interval on, the interval widens while ticks find nothing
+    and tightens while they commit a lot, within min_interval/max_interval.
+
+    Time-based schedules come from the project config (see ScheduleStore).
+    Runs missed while the daemon was down or the host slept are run once on
+    start or wake-up, or skipped, per their catch_up policy.
+
+    With a ci_manager, every tick that commits runs its post_commit CI hooks
+    with the new sha, and triggers coalesced per tick are sent as it ends.
+
+    pause stops all scheduled runs, for a while or until resume, and is kept
+    in .git/autocommit/pause.json so a restarted daemon stays paused.
+    Scheduled ticks also hold off, without scanning the project, while a
+    pause condition (pause_when_processes, pause_when_load_above) holds.
+    """
+
+    # How often a running maintenance checks whether the project reopened
+    REOPEN_CHECK_INTERVAL = 2.0
+
+    def __init__(self, project_path: str, always_open: bool = False, echo: Callable[[str], None] = print,
+                 ci_manager: Optional['CICDManager'] = None):
+        self.project_path = Path(project_path).resolve()
+        self.always_open = always_open
+        self.echo = echo
+        self.ci_manager = ci_manager
+        self.logger = logging.getLogger(__name__)
+        self.config = ConfigManager(str(self.project_path))
+        self.git_ops = GitOperations(str(self.project_path))
+        self.commit_gen = CommitGenerator(str(self.project_path))
+        self.pipeline = CommitPipeline(str(self.project_path), self.git_ops, self.commit_gen,
+                                       strategy=self.config.get_commit_strategy(),
+                                       mode=self.config.get_commit_mode(),
+                                       large_file_threshold=self._large_file_threshold(),
+                                       large_file_policy=self.config.get_large_file_policy(),
+                                       backend=self.config.get_commit_backend())
+        if ci_manager is not None:
+            self.pipeline.add_post_hook(self._submit_ci_triggers)
+        self.monitor = ProjectMonitor(str(self.project_path))
+        self.adaptive = AdaptiveInterval(self.config.get_interval(), self.config.get_min_interval(),
+                                         self.config.get_max_interval(), self.config.get_adaptive_interval())
+        self.scheduler = Scheduler(self.adaptive.current,
+                                   phase=phase_for(str(self.project_path)) if self.config.get_tick_spread() else None,
+                                   jitter=self.config.get_tick_jitter_seconds(),
+                                   on_resume=self._pause_ended)
+        self.pause_conditions = PauseConditions(self.config.get_pause_when_processes(),
+                                                self.config.get_pause_when_load_above())
+        self.tick_slots = TickSlots(self.config.get_max_concurrent_ticks())
+        self.schedules = ScheduleStore(str(self.project_path), self.config)
+        self._schedule_jobs = {}  # schedule id -> Job
+        self.slot_wait = LatencyHistogram()
+        self.tick_duration = LatencyHistogram()
+        self.registry = ProjectRegistry()
+        self.control = ControlServer(str(self.project_path), self._control_handlers())
+        self.state = {
+            'pid': os.getpid(),
+            'started_at': time.time(),
+            'ticks': 0,
+            'last_tick': None,
+            'last_result': None,
+            'project_open': None,
+            'pause_condition': None,
+        }
+        self._tick_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.maintenance = MaintenanceRunner(str(self.project_path), should_cancel=self._should_cancel_maintenance)
+        self._maintenance_thread = None
+        self._maintenance_future = None
+        self._loop = None
+        self._executor = None
+        self._tick_async_lock = None
+        self._last_reopen_check = 0.0
+        self._maintenance_forced = False
+        self._restore_pause()
+
+    def start(self):
+        """Start the scheduler and the control socket"""
+        self.control.start()
+        self._register()
+        self._update_registry(daemon_pid=os.getpid())
+        self.scheduler.start(self.tick)
+        self._schedule_jobs = {}
+        self._sync_schedules()
+
+    def stop(self):
+        """Stop the scheduler and the control socket"""
+        if self._loop is not None:
+            # run_async() cleans up once its scheduler returns
+            self.scheduler.stop()
+            return
+        self._stop_event.set()
+        self.maintenance.cancel()
+        self.scheduler.stop()
+        if self._maintenance_thread:
+            self._maintenance_thread.join(timeout=10)
+        self.control.stop()
+        self._update_registry(daemon_pid=None)
+
+    async def run_async(self, executor: Optional[Executor] = None):
+        """Serve the project on the running event loop until stop() or cancellation
+
+        Ticks, control commands and anything else that blocks run in executor;
+        waits for a tick slot and the ping and status commands stay on the loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._executor = executor
+        self._tick_async_lock = asyncio.Lock()
+        await self.control.start_async(executor, self._loop_control_handlers())
+        self._register()
+        self._update_registry(daemon_pid=os.getpid())
+        self._schedule_jobs = {}
+        self._sync_schedules()
+        try:
+            await self.scheduler.run_async(self.tick_async, executor)
+        finally:
+            self._stop_event.set()
+            self.maintenance.cancel()
+            if self._maintenance_future is not None:
+                await asyncio.gather(asyncio.wrap_future(self._maintenance_future), return_exceptions=True)
+            self.control.stop()
+            self._update_registry(daemon_pid=None)
+            self._loop = None
+
+    def run_forever(self):
+        """Run until interrupted by Ctrl+C or SIGTERM"""
+        from .runtime import DaemonRuntime
+        DaemonRuntime([self], echo=self.echo).run_forever()
+
+    def tick(self, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """Run one commit cycle; force skips the project-open check"""
+        with self._tick_lock:
+            started = time.time()
+            project_open, condition, result = self._begin_tick(force)
+            if result is None:
+                result = self._commit_in_slot(dry_run)
+            return self._end_tick(started, force, dry_run, project_open, condition, result)
+
+    async def tick_async(self, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """tick() for run_async(), waiting for the tick slot on the event loop
+
+        A tick blocked on the slot in a worker would hold one of the threads
+        shared by every project and control command for up to an interval.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._tick_async_lock:
+            started = time.time()
+            project_open, condition, result = await loop.run_in_executor(self._executor, self._begin_tick, force)
+            if result is None:
+                try:
+                    waited = await self.tick_slots.acquire_async(timeout=self._slot_timeout())
+                except TickSlotsBusy as e:
+                    result = self._no_free_slot(e)
+                else:
+                    try:
+                        result = await loop.run_in_executor(self._executor, self._commit_with_slot,
+                                                            dry_run, waited)
+                    finally:
+                        self.tick_slots.release()
+            return await loop.run_in_executor(self._executor, self._end_tick, started, force, dry_run,
+                                              project_open, condition, result)
+
+    def _begin_tick(self, force: bool):
+        """Reload the config and check whether to commit
+
+        Returns (project_open, pause condition, result); result is None when
+        the tick should go on to commit.
+        """
+        # Pick up edits to .autocommit without restarting the daemon
+        if self.config.refresh():
+            self.echo("Configuration reloaded")
+            self._apply_schedule_config()
+
+        condition = None if force else self._check_pause_conditions()
+        if condition:
+            # Leave the disk and the index to whatever is running
+            self.echo(f"Paused while {condition}, skipping commit")
+            self.maintenance.cancel()
+            return self.state['project_open'], condition, {'committed': 0, 'failed': 0,
+                                                           'skipped': f'paused while {condition}'}
+        project_open = True if self.always_open else self.monitor.is_project_open()
+        if force or project_open:
+            return project_open, None, None
+        self.echo("Project not open, skipping commit")
+        return project_open, None, {'committed': 0, 'failed': 0, 'skipped': 'project not open'}
+
+    def _end_tick(self, started: float, force: bool, dry_run: bool, project_open: Optional[bool],
+                  condition: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        if condition is None:
+            if project_open:
+                if not self._maintenance_forced:
+                    self.maintenance.cancel()
+            elif self.config.get_maintenance_enabled() and not dry_run:
+                self._maybe_start_maintenance()
+
+        if self.ci_manager is not None:
+            self._flush_ci_triggers()
+        result['duration'] = time.time() - started
+        self.tick_duration.record(result['duration'] * 1000)
+        # Only scheduled ticks that looked at the project say something about its change rate
+        if not (force or dry_run or 'skipped' in result or result.get('error')):
+            if self.adaptive.observe(result['committed']):
+                self.scheduler.set_interval(self.adaptive.current)
+        self.state['ticks'] += 1
+        self.state['last_tick'] = started
+        self.state['last_result'] = result
+        self.state['project_open'] = project_open
+        self._update_registry(last_tick=started, project_open=project_open,
+                              last_commit_sha=self.git_ops.get_head_sha())
+        self.control.publish(dict(result, type='tick', time=started))
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Snapshot of the daemon's in-memory state"""
+        next_run_at = self.scheduler.next_run_at
+        return dict(
+            self.state,
+            project=str(self.project_path),
+            interval=self.scheduler.interval_minutes,
+            configured_interval=self.config.get_interval(),
+            adaptive_interval=self.adaptive.to_dict(),
+            commit_strategy=self.pipeline.strategy,
+            commit_mode=self.pipeline.mode,
+            paused=self.scheduler.is_paused() or bool(self.state['pause_condition']),
+            paused_until=self.scheduler.paused_until,
+            pause=dict(self.scheduler.get_pause(), condition=self.state['pause_condition'],
+                       when_processes=self.pause_conditions.processes,
+                       when_load_above=self.pause_conditions.max_load),
+            maintenance={'running': self.maintenance.running,
+                         'last_result': self.maintenance.load_state().get('last_result')},
+            next_tick_in=max(0.0, next_run_at - time.time()) if next_run_at else None,
+            max_concurrent_ticks=self.tick_slots.limit,
+            tick_latency=self.get_tick_latency(),
+        )
+
+    def get_tick_latency(self) -> Dict[str, Any]:
+        """How late scheduled ticks start, how long they wait for a slot, and how long they take"""
+        job = self.scheduler.interval_job
+        return {
+            'start_delay': job.lateness.snapshot() if job else None,
+            'slot_wait': self.slot_wait.snapshot(),
+            'duration': self.tick_duration.snapshot(),
+        }
+
+    def _commit_in_slot(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Commit once one of the host-wide tick slots is free"""
+        try:
+            waited = self.tick_slots.acquire(timeout=self._slot_timeout())
+        except TickSlotsBusy as e:
+            return self._no_free_slot(e)
+        try:
+            return self._commit_with_slot(dry_run, waited)
+        finally:
+            self.tick_slots.release()
+
+    def _commit_with_slot(self, dry_run: bool, waited: float) -> Dict[str, Any]:
+        self.slot_wait.record(waited * 1000)
+        result = self._commit_changes(dry_run)
+        result['slot_wait'] = waited
+        return result
+
+    def _no_free_slot(self, error: TickSlotsBusy) -> Dict[str, Any]:
+        self.echo(f"Skipping tick: {error}")
+        return {'committed': 0, 'failed': 0, 'skipped': 'no free tick slot'}
+
+    def _slot_timeout(self) -> float:
+        # Waiting longer than an interval would only collide with the next tick
+        return self.scheduler.interval_minutes * 60
+
+    def _submit_ci_triggers(self, run):
+        """Pipeline post-hook: hand the tick's newest commit to the CI hooks"""
+        if run.committed_groups:
+            self.ci_manager.post_commit(run.committed_groups[-1].sha)
+
+    def _flush_ci_triggers(self):
+        try:
+            self.ci_manager.end_tick()
+        except Exception as e:
+            self.logger.error(f"Failed to send CI triggers: {e}")
+
+    def _commit_changes(self, dry_run: bool = False) -> Dict[str, Any]:
+        self.pipeline.strategy = self.config.get_commit_strategy()
+        self.pipeline.mode = self.config.get_commit_mode()
+        self.pipeline.large_file_threshold = self._large_file_threshold()
+        self.pipeline.large_file_policy = self.config.get_large_file_policy()
+        self.pipeline.backend = self.config.get_commit_backend()
+        run = self.pipeline.run(dry_run=dry_run)
+        echo_run(run, self.echo)
+        return run.to_dict()
+
+    def start_maintenance(self, force: bool = False) -> bool:
+        """Run maintenance in the background
+
+        Without force it only starts when due and the machine is idle, and is
+        cancelled when the project is opened. A forced run only stops at the
+        end of its budget, on maintenance_cancel or when the daemon stops.
+        """
+        if self.maintenance.running:
+            return False
+        if not force:
+            if not self.maintenance.is_due(self.config.get_maintenance_interval_hours()):
+                return False
+            if not is_machine_idle():
+                self.logger.debug("Machine busy, postponing maintenance")
+                return False
+        self.maintenance.budget_seconds = self.config.get_maintenance_budget_seconds()
+        self._maintenance_forced = force
+        if self._loop is not None:
+            self._maintenance_future = asyncio.run_coroutine_threadsafe(self._run_maintenance_async(), self._loop)
+            return True
+        self._maintenance_thread = threading.Thread(target=self._run_maintenance, name='autocommit-maintenance',
+                                                    daemon=True)
+        self._maintenance_thread.start()
+        return True
+
+    def _maybe_start_maintenance(self):
+        try:
+            self.start_maintenance()
+        except Exception as e:
+            self.logger.error(f"Could not start maintenance: {e}")
+
+    def _run_maintenance(self):
+        self.echo("Starting repository maintenance")
+        self.control.publish({'type': 'maintenance_started'})
+        try:
+            result = self.maintenance.run()
+        except Exception as e:
+            self.logger.error(f"Maintenance failed: {e}")
+            return
+        self._maintenance_finished(result)
+
+    async def _run_maintenance_async(self):
+        self.echo("Starting repository maintenance")
+        self.control.publish({'type': 'maintenance_started'})
+        try:
+            result = await self.maintenance.run_async(executor=self._executor)
+        except Exception as e:
+            self.logger.error(f"Maintenance failed: {e}")
+            return
+        self._maintenance_finished(result)
+
+    def _maintenance_finished(self, result: Dict[str, Any]):
+        if result['stopped']:
+            self.echo(f"Maintenance stopped ({result['stopped']}) after {', '.join(result['completed']) or 'no tasks'}")
+        else:
+            self.echo(f"Maintenance finished in {result['duration']:.1f}s")
+        self.control.publish(dict(result, type='maintenance_finished'))
+
+    def _should_cancel_maintenance(self) -> bool:
+        if self._stop_event.is_set():
+            return True
+        if self._maintenance_forced or self.always_open:
+            return False
+        # Scanning processes is not free, so only look every few seconds
+        now = time.monotonic()
+        if now - self._last_reopen_check < self.REOPEN_CHECK_INTERVAL:
+            return False
+        self._last_reopen_check = now
+        return self.monitor.is_project_open()
+
+    def _large_file_threshold(self) -> int:
+        return int(self.config.get_large_file_threshold_mb() * 1024 * 1024)
+
+    def _register(self):
+        """Add the project to the registry if it was set up without it, keeping its mode"""
+        try:
+            self.registry.register(str(self.project_path), interval=self.config.get_interval())
+        except Exception as e:
+            self.logger.error(f"Failed to register project: {e}")
+
+    def _update_registry(self, **fields):
+        try:
+            self.registry.update_status(str(self.project_path), **fields)
+        except Exception as e:
+            self.logger.error(f"Failed to update project registry: {e}")
+
+    def _control_handlers(self) -> Dict[str, Callable[..., Any]]:
+        return {
+            'ping': lambda: 'pong',
+            'status': self.get_status,
+            'pause': self._handle_pause,
+            'resume': self._handle_resume,
+            'commit_now': lambda dry_run=False: self.tick(force=True, dry_run=dry_run),
+            'reload': self._handle_reload,
+            'schedule_list': self._handle_schedule_list,
+            'schedule_clear': self._handle_schedule_clear,
+            'maintenance': lambda: {'started': self.start_maintenance(force=True)},
+            'maintenance_cancel': self._handle_maintenance_cancel,
+        }
+
+    def _loop_control_handlers(self) -> Dict[str, Callable[..., Any]]:
+        """Commands run_async() answers on the event loop, never queued behind busy workers"""
+        async def commit_now(dry_run=False):
+            return await self.tick_async(force=True, dry_run=dry_run)
+
+        return {
+            'ping': lambda: 'pong',
+            'status': self.get_status,
+            'commit_now': commit_now,
+        }
+
+    def _handle_pause(self, duration: Optional[float] = None, reason: str = 'manual') -> Dict[str, Any]:
+        self.scheduler.pause_scheduling(duration, reason)
+        self.maintenance.cancel()
+        self._save_pause()
+        self.control.publish({'type': 'paused', 'until': self.scheduler.paused_until, 'reason': reason})
+        return {'paused': True, 'paused_until': self.scheduler.paused_until}
+
+    def _handle_resume(self) -> Dict[str, Any]:
+        self.scheduler.resume_scheduling()
+        return {'paused': False}
+
+    def _pause_ended(self):
+        """Called by the scheduler on resume, including the end of a timed pause"""
+        self._save_pause()
+        self.echo("Auto-commits resumed")
+        self.control.publish({'type': 'resumed'})
+
+    def _check_pause_conditions(self) -> Optional[str]:
+        """Why scheduled ticks should hold off right now, publishing when that changes"""
+        reason = None
+        if self.pause_conditions.enabled:
+            try:
+                reason = self.pause_conditions.check()
+            except Exception as e:
+                self.logger.error(f"Failed to check pause conditions: {e}")
+        if reason != self.state['pause_condition']:
+            self.state['pause_condition'] = reason
+            self.control.publish({'type': 'paused', 'reason': reason} if reason else {'type': 'resumed'})
+        return reason
+
+    def _pause_path(self) -> Optional[Path]:
+        state_dir = get_state_dir(str(self.project_path), create=False)
+        return state_dir / 'pause.json' if state_dir else None
+
+    def _save_pause(self):
+        path = self._pause_path()
+        if path is None:
+            return
+        pause = self.scheduler.get_pause()
+        try:
+            if not pause['paused']:
+                if path.exists():
+                    path.unlink()
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(pause, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.error(f"Failed to save pause state: {e}")
+
+    def _restore_pause(self):
+        path = self._pause_path()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                pause = json.load(f)
+        except (OSError, TypeError, ValueError):
+            return
+        until = pause.get('until')
+        if until is not None and until <= time.time():
+            self._save_pause()
+            return
+        self.scheduler.pause_scheduling((until - time.time()) / 60 if until else None, pause.get('reason') or 'manual')
+        self.scheduler.paused_at = pause.get('since') or self.scheduler.paused_at
+        self.scheduler.paused_until = until
+
+    def _apply_schedule_config(self):
+        self.adaptive.configure(self.config.get_interval(), self.config.get_min_interval(),
+                                self.config.get_max_interval(), self.config.get_adaptive_interval())
+        self.scheduler.set_interval(self.adaptive.current)
+        self.scheduler.set_jitter(self.config.get_tick_jitter_seconds())
+        self.pause_conditions.configure(self.config.get_pause_when_processes(),
+                                        self.config.get_pause_when_load_above())
+        self.tick_slots.limit = self.config.get_max_concurrent_ticks()
+        self._sync_schedules()
+
+    def _sync_schedules(self):
+        """Make the scheduler's calendar jobs match the configured schedules"""
+        try:
+            specs = {spec['id']: spec for spec in self.schedules.list()}
+        except Exception as e:
+            self.logger.error(f"Failed to load schedules: {e}")
+            return
+        for sid in list(self._schedule_jobs):
+            if sid not in specs:
+                self.scheduler.cancel_job(self._schedule_jobs.pop(sid))
+        for sid, spec in specs.items():
+            job = self._schedule_jobs.get(sid)
+            if job is not None:
+                job.catch_up = spec['catch_up']
+                continue
+            job = self._schedule_jobs[sid] = self.scheduler.add_schedule(spec, self._schedule_callback(sid))
+            missed = self.schedules.missed_run(spec)
+            if missed is None:
+                continue
+            if spec['catch_up'] == 'once':
+                self.echo(f"Catching up on the {job.description} commit missed at {missed:%Y-%m-%d %H:%M}")
+                self.scheduler.trigger(job)
+            else:
+                job.skipped += 1
+                self.schedules.mark_skipped(sid)
+
+    def _schedule_callback(self, sid: str) -> Callable:
+        if self._loop is None:
+            return lambda: self._start_schedule(sid) and self.tick(force=True)
+
+        async def run_schedule():
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(self._executor, self._start_schedule, sid):
+                await self.tick_async(force=True)
+        return run_schedule
+
+    def _start_schedule(self, sid: str) -> bool:
+        """Record a schedule's run; False if a pause condition holds it back"""
+        job = self._schedule_jobs.get(sid)
+        self.schedules.record_run(sid)
+        condition = self._check_pause_conditions()
+        if condition:
+            self.echo(f"Paused while {condition}, skipping scheduled commit ({job.description if job else sid})")
+            return False
+        self.echo(f"Scheduled commit ({job.description if job else sid})")
+        return True
+
+    def _handle_schedule_list(self) -> List[Dict[str, Any]]:
+        """Schedules with the next run the scheduler already computed"""
+        state = self.schedules.load_state()
+        jobs = sorted(self._schedule_jobs.items(), key=lambda item: item[1].deadline)
+        return [{
+            'id': sid,
+            'description': job.description,
+            'catch_up': job.catch_up,
+            'next_run': job.target.timestamp() if job.target else None,
+            'last_run': state.get(sid, {}).get('last_run'),
+            'runs': job.runs,
+            'skipped': job.skipped,
+        } for sid, job in jobs]
+
+    def _handle_reload(self) -> Dict[str, Any]:
+        reloaded = self.config.refresh()
+        self._apply_schedule_config()
+        return {'reloaded': reloaded, 'interval': self.scheduler.interval_minutes}
+
+    def _handle_maintenance_cancel(self) -> Dict[str, Any]:
+        running = self.maintenance.running
+        self.maintenance.cancel()
+        return {'cancelled': running}
+
+    def _handle_schedule_clear(self) -> bool:
+        self.schedules.clear()
+        self._sync_schedules()
+        return True
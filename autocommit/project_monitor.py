@@ -20,7 +20,7 @@ class ProjectMonitor:
         """Check if the project is currently open in an editor"""
         try:
             # Check manual override from config
-            if self.config_manager.config.get('manual_override_open', False):
+            if self.config_manager.get_manual_override_open():
                 return True
 
             # First check for VSCode remote environment indicators
@@ -80,7 +80,7 @@ class ProjectMonitor:
 
     def get_all_supported_editors(self) -> List[str]:
         """Get list of all supported editor process names including additional ones"""
-        additional_editors = self.config_manager.config.get('additional_editor_processes', [])
+        additional_editors = self.config_manager.get_additional_editor_processes()
         return self.editor_processes + additional_editors
 
     def _is_editor_process(self, proc: psutil.Process) -> bool:
@@ -135,7 +135,7 @@ class ProjectMonitor:
         ]
 
         # Add custom environment variables from config
-        custom_env_vars = self.config_manager.config.get('custom_env_vars', [])
+        custom_env_vars = self.config_manager.get_custom_env_vars()
         all_indicators = vscode_indicators + custom_env_vars
 
         for indicator in all_indicators:
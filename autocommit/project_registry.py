@@ -0,0 +1,126 @@
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .config_manager import get_global_config_path
+
+class ProjectRegistry:
+    """Host-wide index of projects managed by GravityCommit
+
+    A small SQLite database next to the user-global configuration, keyed by
+    project path. setup/container-setup/remove maintain membership and
+    running daemons record their latest status, so listing projects never
+    has to scan the filesystem or open a repository.
+    """
+
+    STATUS_FIELDS = ('mode', 'interval', 'last_tick', 'last_commit_sha', 'project_open', 'daemon_pid')
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            db_path = os.environ.get('GRAVITYCOMMIT_REGISTRY') or get_global_config_path().parent / 'projects.db'
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    def register(self, project_path: str, mode: Optional[str] = None, interval: Optional[float] = None):
+        """Add a project, or update its mode and interval if already registered
+
+        Without a mode a new project is registered as 'service' and an
+        existing one keeps its mode.
+        """
+        path = self._key(project_path)
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO projects (path, mode, interval, registered_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                   mode = CASE WHEN ? THEN excluded.mode ELSE projects.mode END,
+                   interval = COALESCE(excluded.interval, projects.interval)""",
+                (path, mode or 'service', interval, time.time(), mode is not None)
+            )
+
+    def unregister(self, project_path: str) -> bool:
+        """Remove a project; returns False if it was not registered"""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM projects WHERE path = ?", (self._key(project_path),))
+            return cursor.rowcount > 0
+
+    def update_status(self, project_path: str, **fields):
+        """Record cached status for a registered project (see STATUS_FIELDS)"""
+        unknown = set(fields) - set(self.STATUS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown registry fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        values = [int(value) if isinstance(value, bool) else value for value in fields.values()]
+        with self._connect() as conn:
+            conn.execute(f"UPDATE projects SET {assignments} WHERE path = ?", values + [self._key(project_path)])
+
+    def get(self, project_path: str) -> Optional[Dict[str, Any]]:
+        """Get the registry entry for a project"""
+        row = self._connect().execute(
+            "SELECT * FROM projects WHERE path = ?", (self._key(project_path),)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        """Get every registered project, ordered by path"""
+        rows = self._connect().execute("SELECT * FROM projects ORDER BY path").fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def is_pid_running(pid: Optional[int]) -> bool:
+        """Cheap liveness check for a recorded daemon pid"""
+        if not pid:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            # Several daemons update their rows concurrently
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS projects (
+                       path TEXT PRIMARY KEY,
+                       mode TEXT NOT NULL DEFAULT 'service',
+                       interval REAL,
+                       registered_at REAL,
+                       last_tick REAL,
+                       last_commit_sha TEXT,
+                       project_open INTEGER,
+                       daemon_pid INTEGER
+                   )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(project_path: str) -> str:
+        return str(Path(project_path).resolve())
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        if entry.get('project_open') is not None:
+            entry['project_open'] = bool(entry['project_open'])
+        return entry
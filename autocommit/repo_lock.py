@@ -0,0 +1,132 @@
+import os
+import time
+import random
+import logging
+from pathlib import Path
+from typing import Optional
+from .paths import get_git_dir, get_state_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Marker files git leaves in the git directory while an operation is in progress
+IN_PROGRESS_MARKERS = (
+    ('rebase-merge', 'rebase'),
+    ('rebase-apply', 'rebase'),
+    ('MERGE_HEAD', 'merge'),
+    ('CHERRY_PICK_HEAD', 'cherry-pick'),
+    ('REVERT_HEAD', 'revert'),
+    ('BISECT_LOG', 'bisect'),
+)
+
+def try_lock_file(path: Path) -> Optional[int]:
+    """Take an exclusive, non-blocking lock on a file; the open fd, or None if held elsewhere
+
+    Locks belong to the open file, so two fds in one process exclude each
+    other as well.
+    """
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+def unlock_file(fd: int):
+    """Release and close an fd returned by try_lock_file()"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+class RepoBusyError(Exception):
+    """Raised when a repository stays busy for longer than the lock timeout"""
+
+def detect_git_operation(project_path: str, check_index_lock: bool = True) -> Optional[str]:
+    """Name of the git operation in progress in a repository, or None"""
+    git_dir = get_git_dir(project_path)
+    if git_dir is None:
+        return None
+    for marker, operation in IN_PROGRESS_MARKERS:
+        if (git_dir / marker).exists():
+            return operation
+    if check_index_lock and (git_dir / 'index.lock').exists():
+        return 'index.lock held'
+    return None
+
+class RepoLock:
+    """Advisory lock shared by every autocommit process working on one repository
+
+    An flock on .git/autocommit/repo.lock serializes daemons, commit-now
+    and materialize against each other. Acquiring also waits until no
+    rebase, merge, cherry-pick or bisect is in progress and, unless
+    check_index_lock is False, until git's own index.lock is gone. Waits use
+    capped exponential backoff and give up with RepoBusyError after timeout
+    seconds.
+    """
+
+    def __init__(self, project_path: str, timeout: float = 30.0, initial_delay: float = 0.05,
+                 max_delay: float = 2.0, check_index_lock: bool = True):
+        self.project_path = Path(project_path)
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.check_index_lock = check_index_lock
+        self.lock_path = get_state_dir(str(self.project_path)) / 'repo.lock'
+        self.logger = logging.getLogger(__name__)
+        self._fd = None
+
+    def acquire(self) -> float:
+        """Take the lock; returns the seconds spent waiting"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        delay = self.initial_delay
+        reason = None
+        while True:
+            if self._try_lock():
+                reason = detect_git_operation(str(self.project_path), self.check_index_lock)
+                if reason is None:
+                    return time.monotonic() - started
+                self.release()
+            else:
+                reason = 'another autocommit process holds the repository lock'
+
+            if time.monotonic() + delay > deadline:
+                raise RepoBusyError(f"Repository busy ({reason}) for {self.timeout:.0f}s")
+            self.logger.debug(f"Repository busy ({reason}), retrying in {delay:.2f}s")
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(self.max_delay, delay * 2)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            unlock_file(self._fd)
+        finally:
+            self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def _try_lock(self) -> bool:
+        self._fd = try_lock_file(self.lock_path)
+        return self._fd is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,105 @@
+import signal
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable
+
+class DaemonRuntime:
+    """One asyncio event loop serving any number of ProjectDaemons
+
+    Each project runs as its own task (ProjectDaemon.run_async) and can be
+    added or removed while the runtime is running. Ticks, control commands
+    and process scans share one small thread pool, so hundreds of projects
+    cost a handful of threads, and the loop sleeps until the next deadline
+    or control request instead of polling.
+    """
+
+    def __init__(self, daemons: Iterable = (), max_workers: int = 4, echo: Callable[[str], None] = print):
+        self.daemons = {str(daemon.project_path): daemon for daemon in daemons}
+        self.max_workers = max_workers
+        self.echo = echo
+        self.logger = logging.getLogger(__name__)
+        self._loop = None
+        self._stopped = None
+        self._executor = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def add(self, daemon):
+        """Serve another project; safe to call from any thread"""
+        self.daemons[str(daemon.project_path)] = daemon
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._spawn, daemon)
+
+    def remove(self, project_path: str):
+        """Stop serving a project; safe to call from any thread"""
+        daemon = self.daemons.pop(project_path, None)
+        if daemon is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel, project_path)
+
+    def stop(self):
+        """Stop every project and return from run(); safe to call from any thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def run(self):
+        """Serve all projects until stop(), SIGINT or SIGTERM"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='autocommit-worker')
+        handled = self._install_signal_handlers()
+        for daemon in list(self.daemons.values()):
+            self._spawn(daemon)
+        try:
+            await self._stopped.wait()
+        finally:
+            self.echo("Stopping daemon...")
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for signum in handled:
+                self._loop.remove_signal_handler(signum)
+            # Let ticks that are already committing finish
+            await self._loop.run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+            self._loop = None
+
+    def run_forever(self):
+        """run() on a new event loop in the calling thread"""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            pass
+
+    def _spawn(self, daemon):
+        key = str(daemon.project_path)
+        if key in self._tasks:
+            return
+        task = self._loop.create_task(daemon.run_async(self._executor))
+        task.add_done_callback(lambda done: self._finished(key, done))
+        self._tasks[key] = task
+
+    def _cancel(self, key: str):
+        task = self._tasks.get(key)
+        if task is not None:
+            task.cancel()
+
+    def _finished(self, key: str, task: asyncio.Task):
+        self._tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Daemon for {key} failed: {task.exception()}")
+
+    def _install_signal_handlers(self) -> list:
+        handled = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._stopped.set)
+                handled.append(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows, or not the main thread
+                pass
+        return handled
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from .config_manager import ConfigManager
+from .paths import get_state_dir
+from .scheduler import parse_time, schedule_id, schedule_next_time
+
+class ScheduleStore:
+    """Time-based commit schedules of a project
+
+    The specs live in the project configuration ('schedules'), so they
+    survive restarts and the daemon picks up changes on reload. When each
+    one last fired is kept in .git/autocommit/schedules.json, which is how a
+    restarted daemon knows which runs it missed while it was down.
+    """
+
+    def __init__(self, project_path: str, config: Optional[ConfigManager] = None):
+        self.project_path = project_path
+        self.config = config or ConfigManager(project_path)
+        self.logger = logging.getLogger(__name__)
+        state_dir = get_state_dir(project_path, create=False)
+        self.state_path = state_dir / 'schedules.json' if state_dir else None
+        # Catch-up runs record themselves from the scheduler thread while the
+        # daemon is still going through the other schedules
+        self.lock = threading.RLock()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Configured schedules with their id and effective catch-up policy"""
+        default_policy = self.config.get_schedule_catch_up()
+        schedules = []
+        for spec in self.config.get_schedules():
+            spec.setdefault('catch_up', default_policy)
+            spec['id'] = schedule_id(spec)
+            schedules.append(spec)
+        return schedules
+
+    def add(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a schedule, replacing one with the same id; ValueError if invalid"""
+        spec = self._normalize(spec)
+        sid = schedule_id(spec)
+        schedules = [existing for existing in self.config.get_schedules() if schedule_id(existing) != sid]
+        self.config.set_schedules(schedules + [spec])
+        return dict(spec, id=sid)
+
+    def remove(self, sid: str) -> bool:
+        schedules = self.config.get_schedules()
+        kept = [spec for spec in schedules if schedule_id(spec) != sid]
+        if len(kept) == len(schedules):
+            return False
+        self.config.set_schedules(kept)
+        return True
+
+    def clear(self) -> int:
+        count = len(self.config.get_schedules())
+        if count:
+            self.config.set_schedules([])
+        return count
+
+    def last_run(self, sid: str) -> Optional[float]:
+        return self.load_state().get(sid, {}).get('last_run')
+
+    def record_run(self, sid: str, when: Optional[float] = None):
+        when = when or time.time()
+        with self.lock:
+            state = self.load_state()
+            state[sid] = {'since': when, 'last_run': when}
+            self._save_state(state)
+
+    def missed_run(self, spec: Dict[str, Any], now: Optional[float] = None) -> Optional[datetime]:
+        """The time a schedule should have fired since it last ran (or was first seen), if any
+
+        A schedule seen for the first time starts counting from now.
+        """
+        now = now or time.time()
+        sid = spec.get('id') or schedule_id(spec)
+        with self.lock:
+            state = self.load_state()
+            entry = state.get(sid)
+            if entry is None:
+                state[sid] = {'since': now, 'last_run': None}
+                self._save_state(state)
+                return None
+        missed = schedule_next_time(spec)(datetime.fromtimestamp(entry['since']))
+        return missed if missed.timestamp() <= now else None
+
+    def mark_skipped(self, sid: str, when: Optional[float] = None):
+        """Forget missed runs without recording a run"""
+        with self.lock:
+            state = self.load_state()
+            state.setdefault(sid, {'last_run': None})['since'] = when or time.time()
+            self._save_state(state)
+
+    def load_state(self) -> Dict[str, Any]:
+        if self.state_path is None:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]):
+        if self.state_path is None:
+            return
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            self.logger.error(f"Failed to save schedule state: {e}")
+
+    def _normalize(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        schedule_next_time(spec)  # raises ValueError if invalid
+        normalized = {'type': spec['type']}
+        if spec['type'] == 'hourly':
+            normalized['minute'] = spec['minute']
+        else:
+            hour, minute = parse_time(spec['time'])
+            normalized['time'] = f"{hour:02d}:{minute:02d}"
+            if spec['type'] == 'weekly':
+                normalized['day'] = spec['day'].lower()
+        if spec.get('catch_up') is not None:
+            normalized['catch_up'] = spec['catch_up']
+        return normalized
@@ -1,121 +1,663 @@
 import time
+import heapq
+import random
+import asyncio
+import hashlib
+import itertools
 import threading
-import schedule
-from datetime import datetime, time as dt_time
-from typing import Callable, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
 import logging
+from .config_manager import WEEKDAYS
+
+_job_ids = itertools.count(1)
+
+# Jitter never delays a run by more than this fraction of its interval
+MAX_JITTER_FRACTION = 0.25
+
+def phase_for(key: str) -> float:
+    """Deterministic phase in [0, 1) for a key such as a project path"""
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big') / 2 ** 32
+
+def parse_time(time_str: str):
+    """(hour, minute) from HH:MM, or ValueError"""
+    hour, minute = map(int, time_str.split(':'))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Time out of range: {time_str}")
+    return hour, minute
+
+def next_daily(hour: int, minute: int, after: datetime) -> datetime:
+    """First HH:MM strictly after a moment"""
+    target = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= after:
+        target += timedelta(days=1)
+    return target
+
+def next_weekly(weekday: int, hour: int, minute: int, after: datetime) -> datetime:
+    """First weekday (0 = Monday) at HH:MM strictly after a moment"""
+    target = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    target += timedelta(days=(weekday - after.weekday()) % 7)
+    if target <= after:
+        target += timedelta(days=7)
+    return target
+
+def next_hourly(minute: int, after: datetime) -> datetime:
+    """First :MM strictly after a moment"""
+    target = after.replace(minute=minute, second=0, microsecond=0)
+    if target <= after:
+        target += timedelta(hours=1)
+    return target
+
+def schedule_id(spec: Dict[str, Any]) -> str:
+    """Stable identifier of a schedule spec, e.g. 'friday@17:30'"""
+    if spec['type'] == 'hourly':
+        return f"hourly:{spec['minute']:02d}"
+    if spec['type'] == 'weekly':
+        return f"{spec['day'].lower()}@{spec['time']}"
+    return f"daily@{spec['time']}"
+
+def describe_schedule(spec: Dict[str, Any]) -> str:
+    if spec['type'] == 'hourly':
+        return f"hourly at minute {spec['minute']}"
+    if spec['type'] == 'weekly':
+        return f"{spec['day'].capitalize()} at {spec['time']}"
+    return f"daily at {spec['time']}"
+
+def schedule_next_time(spec: Dict[str, Any]) -> Callable[[datetime], datetime]:
+    """Function giving the first time a schedule spec fires after a moment, or ValueError"""
+    kind = spec.get('type')
+    if kind == 'hourly':
+        minute = spec.get('minute')
+        if not isinstance(minute, int) or not 0 <= minute <= 59:
+            raise ValueError("Minute must be between 0 and 59")
+        return lambda after: next_hourly(minute, after)
+    if kind not in ('daily', 'weekly'):
+        raise ValueError(f"Unknown schedule type: {kind}")
+    try:
+        hour, minute = parse_time(spec.get('time', ''))
+    except (ValueError, AttributeError):
+        raise ValueError(f"Invalid time format: {spec.get('time')}. Use HH:MM")
+    if kind == 'daily':
+        return lambda after: next_daily(hour, minute, after)
+    day = str(spec.get('day', '')).lower()
+    if day not in WEEKDAYS:
+        raise ValueError(f"Invalid day: {spec.get('day')}")
+    weekday = WEEKDAYS.index(day)
+    return lambda after: next_weekly(weekday, hour, minute, after)
+
+class LatencyHistogram:
+    """Cumulative latency histogram, e.g. how late runs start or how long they wait"""
+
+    BUCKETS_MS = [10, 100, 500, 1000, 5000, 30000, 60000, 300000]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float):
+        with self._lock:
+            index = len(self.BUCKETS_MS)
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    index = i
+                    break
+            self.counts[index] += 1
+            self.total += 1
+            self.sum_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f"<={bound}ms": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+            buckets[f">{self.BUCKETS_MS[-1]}ms"] = self.counts[-1]
+            return {
+                'count': self.total,
+                'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+                'max_ms': self.max_ms,
+                'buckets': buckets
+            }
+
+class Job:
+    """A callback run by a Scheduler, either every interval seconds or at calendar times
+
+    phase (a fraction of the interval) pins an interval job to a fixed offset
+    on the wall-clock grid, e.g. 0.5 with a 10 minute interval runs at :05,
+    :15, ...; jitter adds up to that many random seconds to each run without
+    moving the grid. catch_up says what a calendar job does about a time
+    it missed while the host slept: run 'once' or 'skip' it.
+    """
+
+    def __init__(self, callback: Callable, description: str, interval: Optional[float] = None,
+                 next_time: Optional[Callable[[datetime], datetime]] = None,
+                 phase: Optional[float] = None, jitter: float = 0.0):
+        self.id = next(_job_ids)
+        self.callback = callback
+        self.description = description
+        self.interval = interval
+        self.next_time = next_time
+        self.phase = phase
+        self.jitter = jitter
+        self.slot = None          # monotonic, before jitter
+        self.deadline = None      # monotonic, slot plus jitter
+        self.sequence = None      # identifies the job's live heap entry
+        self.target = None        # wall-clock datetime, calendar jobs only
+        self.catch_up = 'once'
+        self.triggered = False    # run now without moving target
+        self.regular_slot = None  # interval jobs: the slot a triggered run displaced
+        self.running = False
+        self.cancelled = False
+        self.runs = 0
+        self.skipped = 0
+        self.last_run = None
+        self.lateness = LatencyHistogram()
+        self.due = None  # from deadline to the callback starting
 
 class Scheduler:
-    def __init__(self, interval_minutes: int = 10):
+    """Runs jobs at deadlines kept in a min-heap on the monotonic clock
+
+    One thread sleeps on a condition variable until the earliest deadline,
+    so adding, cancelling or rescheduling a job and stop() take effect at
+    once. Callbacks run on a small thread pool. Periodic jobs keep their
+    phase (the next deadline is the previous one plus the interval, not the
+    end of the run plus the interval), and a job is never run twice at the
+    same time: slots that come due while it is still running are skipped.
+    Every instance has its own jobs. A phase and jitter spread the runs of
+    many schedulers on the same interval apart instead of firing together.
+
+    run_async() drives the same heap from an asyncio event loop instead of
+    a thread, so one loop can serve the schedulers of many projects.
+
+    Deadlines are monotonic, which stands still while the host is
+    suspended, so with calendar jobs the scheduler wakes at least every
+    CLOCK_CHECK_INTERVAL seconds to compare it with the wall clock. When the
+    two drifted apart (suspend, or the clock was set) calendar jobs are
+    re-anchored to their wall-clock targets and missed ones caught up.
+
+    While paused, due jobs are rescheduled without running. A timed pause
+    ends on its own at paused_until, calling on_resume.
+    """
+
+    # Rebuild the heap once this many of its entries are stale
+    COMPACT_THRESHOLD = 64
+    CLOCK_CHECK_INTERVAL = 60.0
+    CLOCK_JUMP_TOLERANCE = 1.0
+
+    def __init__(self, interval_minutes: int = 10, max_workers: int = 4,
+                 clock: Callable[[], float] = time.monotonic, phase: Optional[float] = None,
+                 jitter: float = 0.0, on_resume: Optional[Callable[[], None]] = None):
         self.interval_minutes = interval_minutes
+        self.phase = phase
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.clock = clock
         self.callback = None
         self.thread = None
         self.running = False
-        self.schedule_jobs = []
+        self.on_resume = on_resume
+        self.paused = False
+        self.paused_at = None
+        self.paused_until = None  # wall-clock time, None until resumed
+        self.pause_reason = None
         self.logger = logging.getLogger(__name__)
+        self._cond = threading.Condition()
+        self._heap = []           # (deadline, sequence, job)
+        self._sequence = itertools.count()
+        self._jobs = {}           # id -> Job
+        self._stale = 0
+        self._interval_job = None
+        self._calendar_jobs = 0
+        self._wall_offset = time.time() - clock()
+        self._executor = None
+        self._loop = None
+        self._wake = None
+
+    @property
+    def next_run_at(self) -> Optional[float]:
+        """Wall-clock time of the next interval run"""
+        job = self._interval_job
+        if job is None or job.deadline is None:
+            return None
+        return time.time() + (job.deadline - self.clock())
 
     def start(self, callback: Callable):
-        """Start the scheduler with a callback function"""
+        """Start the scheduler with a callback run every interval_minutes (if > 0)"""
         self.callback = callback
-        self.running = True
-
+        with self._cond:
+            self.running = True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='autocommit-job')
         if self.interval_minutes > 0:
-            # Traditional interval-based scheduling
-            self.thread = threading.Thread(target=self._run_interval)
-            self.thread.daemon = True
-            self.thread.start()
-        else:
-            # Time-based scheduling
-            self._setup_time_based_schedule()
+            self._add_interval_job(self._run_callback)
+        self.thread = threading.Thread(target=self._run, name='autocommit-scheduler', daemon=True)
+        self.thread.start()
 
     def stop(self):
-        """Stop the scheduler"""
-        self.running = False
-        if self.thread:
+        """Stop the scheduler; running callbacks finish in the background"""
+        with self._cond:
+            self.running = False
+            self._heap = []
+            self._jobs = {}
+            self._stale = 0
+            self._interval_job = None
+            self._calendar_jobs = 0
+            self._notify()
+        if self.thread and self.thread is not threading.current_thread():
             self.thread.join(timeout=1)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
-        # Clear all scheduled jobs
-        schedule.clear()
-        self.schedule_jobs = []
+    async def run_async(self, callback: Callable, executor: Optional[Executor] = None):
+        """Run on the current event loop until stop() or cancellation
 
-    def _run_interval(self):
-        """Run interval-based scheduling"""
-        while self.running:
-            time.sleep(self.interval_minutes * 60)
-            if self.running and self.callback:
+        Plain callbacks run in executor (the loop's default one if None);
+        coroutine functions are awaited on the loop. Cancelling cancels the
+        jobs' coroutines; callbacks already running in a thread finish there.
+        """
+        loop = asyncio.get_running_loop()
+        self.callback = callback
+        with self._cond:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self.running = True
+        if self.interval_minutes > 0:
+            self._add_interval_job(self._run_callback_async if asyncio.iscoroutinefunction(callback)
+                                   else self._run_callback)
+        in_flight = set()
+        try:
+            while self.running:
+                self._wake.clear()
+                self._check_clock_jump()
+                self._expire_pause()
+                for job in self._take_due(self.clock()):
+                    task = loop.create_task(self._execute_async(job, executor))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                with self._cond:
+                    delay = self._wait_time(self.clock())
+                if delay is not None and delay <= 0:
+                    continue
                 try:
-                    self.callback()
-                except Exception as e:
-                    self.logger.error(f"Scheduler callback error: {e}")
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self.running = False
+                self._loop = None
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    @property
+    def interval_job(self) -> Optional[Job]:
+        return self._interval_job
+
+    def set_jitter(self, jitter: float):
+        """Change the jitter of the interval job; takes effect from its next run"""
+        self.jitter = jitter
+        if self._interval_job is not None:
+            self._interval_job.jitter = jitter
+
+    def set_interval(self, interval_minutes: int):
+        """Change the interval; the next run moves to the last run plus the new interval
+
+        With a phase, it moves to the next point of the new interval's grid.
+        """
+        if interval_minutes == self.interval_minutes:
+            return
+        self.logger.info(f"Interval changed to {interval_minutes} minutes")
+        self.interval_minutes = interval_minutes
+        job = self._interval_job
+        if job is None:
+            return
+        if interval_minutes <= 0:
+            self.cancel_job(job)
+            self._interval_job = None
+            return
+        with self._cond:
+            now = self.clock()
+            if job.triggered:
+                # Rescheduled from the regular slot; this replaces the pending triggered run
+                job.triggered = False
+                job.slot = job.regular_slot
+            previous = job.slot - job.interval if job.slot is not None else now
+            job.interval = interval_minutes * 60
+            job.description = f"every {interval_minutes} minutes"
+            if job.phase is not None:
+                self._push(job, self._aligned_slot(job, now))
+            else:
+                self._push(job, max(now, previous + job.interval))
 
-    def _setup_time_based_schedule(self):
-        """Setup time-based scheduling using schedule library"""
-        # This would be configured through config
-        pass
+    def add_job(self, callback: Callable, description: str, interval: Optional[float] = None,
+                next_time: Optional[Callable[[datetime], datetime]] = None,
+                phase: Optional[float] = None, jitter: float = 0.0) -> Job:
+        """Schedule a callback every interval seconds, or at each datetime next_time() returns"""
+        if (interval is None) == (next_time is None):
+            raise ValueError("A job needs either an interval or a next_time function")
+        if interval is not None and interval <= 0:
+            raise ValueError("Interval must be positive")
+        if phase is not None and not 0 <= phase < 1:
+            raise ValueError("Phase must be in [0, 1)")
+        job = Job(callback, description, interval=interval, next_time=next_time, phase=phase, jitter=jitter)
+        with self._cond:
+            self._jobs[job.id] = job
+            if interval is None:
+                self._calendar_jobs += 1
+            self._push(job, self._first_slot(job))
+        return job
 
-    def schedule_at_time(self, time_str: str, callback: Callable):
+    def add_schedule(self, spec: Dict[str, Any], callback: Callable) -> Job:
+        """Schedule a callback from a spec like {"type": "daily", "time": "14:00"}, or ValueError"""
+        job = self.add_job(callback, describe_schedule(spec), next_time=schedule_next_time(spec))
+        job.catch_up = spec.get('catch_up', 'once')
+        return job
+
+    def trigger(self, job: Job):
+        """Run a job as soon as possible without moving its next regular run"""
+        with self._cond:
+            if job.id not in self._jobs:
+                return
+            if not job.triggered:
+                job.regular_slot = job.slot
+            job.triggered = True
+            self._push(job, self.clock())
+
+    def cancel_job(self, job: Job):
+        with self._cond:
+            if self._jobs.pop(job.id, None) is not None:
+                job.cancelled = True
+                if job.interval is None:
+                    self._calendar_jobs -= 1
+                self._stale += 1
+                self._compact()
+                self._notify()
+
+    def schedule_at_time(self, time_str: str, callback: Callable) -> Optional[Job]:
         """Schedule a callback at a specific time (HH:MM format)"""
-        try:
-            hour, minute = map(int, time_str.split(':'))
-            schedule.every().day.at(time_str).do(callback)
-            self.schedule_jobs.append(f"daily at {time_str}")
+        job = self._add_schedule({'type': 'daily', 'time': time_str}, callback)
+        if job:
             self.logger.info(f"Scheduled daily commit at {time_str}")
-        except ValueError as e:
-            self.logger.error(f"Invalid time format: {time_str}. Use HH:MM")
+        return job
 
-    def schedule_weekly(self, day: str, time_str: str, callback: Callable):
+    def schedule_weekly(self, day: str, time_str: str, callback: Callable) -> Optional[Job]:
         """Schedule a callback on a specific day and time"""
-        days_map = {
-            'monday': schedule.every().monday,
-            'tuesday': schedule.every().tuesday,
-            'wednesday': schedule.every().wednesday,
-            'thursday': schedule.every().thursday,
-            'friday': schedule.every().friday,
-            'saturday': schedule.every().saturday,
-            'sunday': schedule.every().sunday
-        }
-
-        if day.lower() not in days_map:
-            self.logger.error(f"Invalid day: {day}")
-            return
-
-        try:
-            days_map[day.lower()].at(time_str).do(callback)
-            self.schedule_jobs.append(f"{day} at {time_str}")
+        job = self._add_schedule({'type': 'weekly', 'day': day, 'time': time_str}, callback)
+        if job:
             self.logger.info(f"Scheduled weekly commit on {day} at {time_str}")
-        except Exception as e:
-            self.logger.error(f"Failed to schedule weekly: {e}")
+        return job
 
-    def schedule_hourly(self, minute: int, callback: Callable):
+    def schedule_hourly(self, minute: int, callback: Callable) -> Optional[Job]:
         """Schedule a callback every hour at a specific minute"""
-        if not 0 <= minute <= 59:
-            self.logger.error("Minute must be between 0 and 59")
-            return
+        job = self._add_schedule({'type': 'hourly', 'minute': minute}, callback)
+        if job:
+            self.logger.info(f"Scheduled hourly commit at minute {minute}")
+        return job
 
-        schedule.every().hour.at(f":{minute:02d}").do(callback)
-        self.schedule_jobs.append(f"hourly at minute {minute}")
-        self.logger.info(f"Scheduled hourly commit at minute {minute}")
+    def _add_schedule(self, spec: Dict[str, Any], callback: Callable) -> Optional[Job]:
+        try:
+            return self.add_schedule(spec, callback)
+        except ValueError as e:
+            self.logger.error(str(e))
+            return None
 
-    def pause_scheduling(self):
-        """Pause all scheduled jobs"""
-        # This would require more complex state management
-        self.logger.info("Scheduling paused")
+    def pause_scheduling(self, duration_minutes: Optional[float] = None, reason: str = 'manual'):
+        """Pause all scheduled jobs, optionally resuming after duration_minutes"""
+        with self._cond:
+            self.paused = True
+            self.paused_at = time.time()
+            self.paused_until = self.paused_at + duration_minutes * 60 if duration_minutes else None
+            self.pause_reason = reason
+            self._notify()
+        self.logger.info("Scheduling paused" + (f" for {duration_minutes:g} minutes" if duration_minutes else ""))
 
     def resume_scheduling(self):
         """Resume all scheduled jobs"""
-        # This would require more complex state management
+        with self._cond:
+            if not self.paused:
+                return
+            self.paused = False
+            self.paused_at = None
+            self.paused_until = None
+            self.pause_reason = None
+            self._notify()
         self.logger.info("Scheduling resumed")
+        if self.on_resume:
+            try:
+                self.on_resume()
+            except Exception as e:
+                self.logger.error(f"Resume callback error: {e}")
+
+    def is_paused(self) -> bool:
+        """Check whether scheduling is paused, resuming automatically once a timed pause ends"""
+        self._expire_pause()
+        return self.paused
+
+    def get_pause(self) -> Dict[str, Any]:
+        with self._cond:
+            return {'paused': self.paused, 'since': self.paused_at, 'until': self.paused_until,
+                    'reason': self.pause_reason}
+
+    def get_jobs(self) -> List[Job]:
+        """All jobs, soonest first"""
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda job: job.deadline)
 
     def get_scheduled_jobs(self) -> list:
-        """Get list of currently scheduled jobs"""
-        return self.schedule_jobs.copy()
+        """Get list of currently scheduled time-based jobs"""
+        return [job.description for job in self.get_jobs() if job is not self._interval_job]
 
     def clear_schedule(self):
-        """Clear all scheduled jobs"""
-        schedule.clear()
-        self.schedule_jobs = []
+        """Clear all scheduled time-based jobs"""
+        for job in self.get_jobs():
+            if job is not self._interval_job:
+                self.cancel_job(job)
         self.logger.info("All scheduled jobs cleared")
 
     def run_pending(self):
-        """Run any pending scheduled jobs (for time-based scheduling)"""
-        schedule.run_pending()
+        """Run due jobs in the calling thread (for use without start())"""
+        self._expire_pause()
+        for job in self._take_due(self.clock()):
+            self._execute(job)
+
+    def _run(self):
+        while True:
+            self._check_clock_jump()
+            self._expire_pause()
+            with self._cond:
+                if not self.running:
+                    return
+                executor = self._executor
+                now = self.clock()
+                if not self._heap or self._heap[0][0] > now:
+                    self._cond.wait(self._wait_time(now))
+                    continue
+            for job in self._take_due(now):
+                try:
+                    executor.submit(self._execute, job)
+                except RuntimeError:
+                    # Shut down by stop() in the meantime
+                    job.running = False
+                    return
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """Seconds until the earliest deadline, capped while calendar jobs need clock checks"""
+        wait = self._heap[0][0] - now if self._heap else None
+        if self._calendar_jobs:
+            wait = self.CLOCK_CHECK_INTERVAL if wait is None else min(wait, self.CLOCK_CHECK_INTERVAL)
+        if self.paused and self.paused_until is not None:
+            # Wake up to end a timed pause on time
+            until = max(0.0, self.paused_until - time.time())
+            wait = until if wait is None else min(wait, until)
+        return wait
+
+    def _expire_pause(self):
+        if self.paused and self.paused_until is not None and time.time() >= self.paused_until:
+            self.resume_scheduling()
+
+    def _check_clock_jump(self):
+        """Re-anchor jobs if the wall clock moved against the monotonic one"""
+        offset = time.time() - self.clock()
+        drift = offset - self._wall_offset
+        self._wall_offset = offset
+        if abs(drift) < self.CLOCK_JUMP_TOLERANCE:
+            return
+        self.logger.info(f"Wall clock moved {drift:+.0f}s (suspend or clock change), re-anchoring jobs")
+        with self._cond:
+            now = self.clock()
+            wall_now = datetime.now()
+            for job in list(self._jobs.values()):
+                if job.interval is not None:
+                    if job.phase is not None:
+                        job.triggered = False
+                        self._push(job, self._aligned_slot(job, now))
+                elif job.target is not None and job.target <= wall_now:
+                    if job.catch_up == 'once':
+                        self.logger.info(f"Catching up on '{job.description}' missed at {job.target:%Y-%m-%d %H:%M}")
+                        self._push(job, now)
+                    else:
+                        job.skipped += 1
+                        self._push(job, self._calendar_deadline(job, wall_now))
+                elif job.target is not None:
+                    self._push(job, now + (job.target - wall_now).total_seconds())
+
+    def _take_due(self, now: float) -> List[Job]:
+        """Pop the jobs that are due, reschedule them, and mark the ones to run as running"""
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, sequence, job = heapq.heappop(self._heap)
+                if job.cancelled or job.sequence != sequence:
+                    self._stale = max(0, self._stale - 1)
+                    continue
+                job.sequence = None
+                job.due = deadline
+                self._push(job, self._next_slot(job, now))
+                if job.running:
+                    job.skipped += 1
+                    self.logger.warning(f"Job '{job.description}' still running, skipping this run")
+                elif self.paused:
+                    self.logger.debug(f"Scheduling paused, skipping '{job.description}'")
+                else:
+                    job.running = True
+                    due.append(job)
+        return due
+
+    def _execute(self, job: Job):
+        job.lateness.record(max(0.0, self.clock() - job.due) * 1000)
+        job.last_run = time.time()
+        try:
+            job.callback()
+        except Exception as e:
+            self.logger.error(f"Scheduler callback error: {e}")
+        finally:
+            with self._cond:
+                job.running = False
+                job.runs += 1
+
+    async def _execute_async(self, job: Job, executor: Optional[Executor]):
+        if not asyncio.iscoroutinefunction(job.callback):
+            await asyncio.get_running_loop().run_in_executor(executor, self._execute, job)
+            return
+        job.lateness.record(max(0.0, self.clock() - job.due) * 1000)
+        job.last_run = time.time()
+        try:
+            await job.callback()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Scheduler callback error: {e}")
+        finally:
+            with self._cond:
+                job.running = False
+                job.runs += 1
+
+    def _run_callback(self):
+        if self.running and self.callback:
+            self.callback()
+
+    async def _run_callback_async(self):
+        if self.running and self.callback:
+            await self.callback()
+
+    def _add_interval_job(self, callback: Callable):
+        self._interval_job = self.add_job(callback, f"every {self.interval_minutes} minutes",
+                                          interval=self.interval_minutes * 60,
+                                          phase=self.phase, jitter=self.jitter)
+
+    def _first_slot(self, job: Job) -> float:
+        if job.interval is None:
+            return self._calendar_deadline(job, datetime.now())
+        if job.phase is not None:
+            return self._aligned_slot(job, self.clock())
+        return self.clock() + job.interval
+
+    def _aligned_slot(self, job: Job, now: float) -> float:
+        """Next point of the wall-clock grid interval * k + phase * interval"""
+        wall = time.time()
+        offset = job.phase * job.interval
+        wait = (offset - wall) % job.interval
+        return now + (wait or job.interval)
+
+    def _next_slot(self, job: Job, now: float) -> float:
+        if job.interval is None:
+            if job.triggered:
+                # An out-of-band run leaves the upcoming target alone
+                job.triggered = False
+                return now + (job.target - datetime.now()).total_seconds()
+            # Never fire the same calendar slot twice if the clocks disagree slightly
+            return self._calendar_deadline(job, max(datetime.now(), job.target))
+        if job.triggered:
+            job.triggered = False
+            if job.regular_slot > now:
+                return job.regular_slot
+            # The triggered run stands in for the regular one it overran
+            job.slot = job.regular_slot
+        slot = job.slot + job.interval
+        if slot <= now:
+            # Fell behind (a long run or a stalled process): skip to the next slot in phase
+            missed = int((now - slot) // job.interval) + 1
+            job.skipped += missed
+            slot += missed * job.interval
+        return slot
+
+    def _jitter(self, job: Job) -> float:
+        if job.jitter <= 0:
+            return 0.0
+        limit = job.jitter if job.interval is None else min(job.jitter, job.interval * MAX_JITTER_FRACTION)
+        return random.uniform(0, limit)
+
+    def _calendar_deadline(self, job: Job, after: datetime) -> float:
+        job.target = job.next_time(after)
+        return self.clock() + (job.target - datetime.now()).total_seconds()
+
+    def _push(self, job: Job, slot: float):
+        """Set a job's slot and jittered deadline; the caller holds the lock. Old heap entries go stale."""
+        if job.sequence is not None:
+            self._stale += 1
+        job.slot = slot
+        deadline = job.deadline = slot + self._jitter(job)
+        job.sequence = next(self._sequence)
+        heapq.heappush(self._heap, (deadline, job.sequence, job))
+        self._compact()
+        self._notify()
+
+    def _notify(self):
+        """Wake whatever waits for the next deadline; the caller holds the lock"""
+        self._cond.notify_all()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _compact(self):
+        if self._stale > self.COMPACT_THRESHOLD and self._stale >= len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap
+                          if not entry[2].cancelled and entry[1] == entry[2].sequence]
+            heapq.heapify(self._heap)
+            self._stale = 0
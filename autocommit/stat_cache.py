@@ -0,0 +1,305 @@
+import os
+import json
+import stat
+import time
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from .paths import get_git_dir, get_state_dir
+
+# Entries modified this close to when they were recorded may have changed
+# again within the filesystem's timestamp granularity ("racily clean")
+RACY_WINDOW_NS = 2000000000
+
+StatSignature = Tuple[int, int, int, int]
+
+def stat_signature(st: os.stat_result) -> StatSignature:
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+def blob_sha(path: Path, st: Optional[os.stat_result] = None, chunk_size: int = 1 << 20) -> str:
+    """Git blob id of a file or symlink, hashed in chunks"""
+    st = st or os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        data = os.readlink(path).encode('utf-8', 'surrogateescape')
+        return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+    digest = hashlib.sha1(b'blob %d\0' % st.st_size)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _ancestors(paths: Iterable[str]) -> set:
+    """Every directory ('' for the root) containing one of paths"""
+    directories = set()
+    for path in paths:
+        parent = os.path.dirname(path.rstrip('/'))
+        while parent not in directories:
+            directories.add(parent)
+            if not parent:
+                break
+            parent = os.path.dirname(parent)
+    return directories
+
+class StatCache:
+    """Stat information for the last committed state of a working tree
+
+    Kept in .git/autocommit/stat_cache.json. For every tracked file it
+    records (mtime_ns, ctime_ns, size, inode) and the blob id, and for every
+    directory holding tracked files its mtime. find_candidates() lstat()s
+    tracked files in-process and only lists directories whose mtime moved,
+    so finding "nothing changed" needs neither git nor a full directory
+    walk. Entries recorded within RACY_WINDOW_NS of their mtime are
+    verified by hashing until they settle. The cache is trusted only while
+    HEAD and .git/index are unchanged since it was recorded.
+    """
+
+    FILENAME = 'stat_cache.json'
+    VERSION = 1
+
+    def __init__(self, project_path: str):
+        self.project_path = Path(project_path)
+        self.path = get_state_dir(str(self.project_path)) / self.FILENAME
+        self.index_path = get_git_dir(str(self.project_path)) / 'index'
+        self.logger = logging.getLogger(__name__)
+        self.files = {}  # path -> [mtime_ns, ctime_ns, size, ino, sha, racy]
+        self.dirs = {}   # directory ('' for the root) -> [mtime_ns, racy]
+        self.head = None
+        self.index_signature = None
+        self.dirty = False
+        self._file_signature = None
+        self._scanned_dirs = {}
+
+    def load(self) -> bool:
+        """Read the cache file if it changed; returns False if there is none"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._clear()
+            return False
+        if stat_signature(st) == self._file_signature:
+            return True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                raise ValueError(f"unsupported version {data.get('version')}")
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable stat cache {self.path}: {e}")
+            self._clear()
+            return False
+        self.files = data['files']
+        self.dirs = data['dirs']
+        self.head = data['head']
+        self.index_signature = data['index']
+        self._file_signature = stat_signature(st)
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Atomically write the cache if anything changed"""
+        if not self.dirty:
+            return
+        data = {
+            'version': self.VERSION,
+            'head': self.head,
+            'index': self.index_signature,
+            'files': self.files,
+            'dirs': self.dirs,
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{self.FILENAME}.", suffix='.tmp', dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._file_signature = stat_signature(os.stat(self.path))
+        self.dirty = False
+
+    def is_valid(self, head_sha: Optional[str]) -> bool:
+        """Whether the recorded state still describes HEAD and the index"""
+        return self.load() and self.head == head_sha and self.index_signature == self._index_signature()
+
+    def find_candidates(self, head_sha: Optional[str]) -> Optional[Dict[str, Optional[StatSignature]]]:
+        """Paths that may differ from the recorded state
+
+        Maps each path (directories end with '/') to the stat signature seen
+        now, or None if it is gone. Returns None when the cache cannot be
+        trusted and the caller must fall back to a full git status.
+        """
+        if not self.is_valid(head_sha):
+            return None
+
+        now = time.time_ns()
+        candidates = {}
+        root = str(self.project_path) + os.sep
+        lstat = os.lstat
+        for path, entry in self.files.items():
+            try:
+                st = lstat(root + path)
+            except FileNotFoundError:
+                candidates[path] = None
+                continue
+            if (st.st_mtime_ns != entry[0] or st.st_ctime_ns != entry[1]
+                    or st.st_size != entry[2] or st.st_ino != entry[3]):
+                candidates[path] = stat_signature(st)
+            elif entry[5]:
+                # Git LFS files have no blob id of their own and settle by time alone
+                if entry[4] is not None and blob_sha(Path(root + path), st) != entry[4]:
+                    candidates[path] = stat_signature(st)
+                elif now - st.st_mtime_ns > RACY_WINDOW_NS:
+                    entry[5] = False
+                    self.dirty = True
+
+        # New entries only show up in directories whose mtime moved
+        self._scanned_dirs = {}
+        for directory, (mtime_ns, racy) in list(self.dirs.items()):
+            full_path = self.project_path / directory
+            try:
+                st = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if st.st_mtime_ns == mtime_ns and not racy:
+                continue
+            self._scanned_dirs[directory] = st.st_mtime_ns
+            try:
+                entries = list(os.scandir(full_path))
+            except OSError:
+                continue
+            for entry in entries:
+                if directory == '' and entry.name == '.git':
+                    continue
+                rel_path = f"{directory}/{entry.name}" if directory else entry.name
+                if rel_path in self.files or rel_path in self.dirs:
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    signature = stat_signature(entry.stat(follow_symlinks=False))
+                except OSError:
+                    continue
+                candidates[rel_path + '/' if is_dir else rel_path] = signature
+        return candidates
+
+    def confirm(self, candidates: Dict[str, Optional[StatSignature]], changes: Dict[str, str]):
+        """Record candidates that git reported as unchanged as clean"""
+        now = time.time_ns()
+        for path, signature in candidates.items():
+            if path in changes or path.rstrip('/') in changes or signature is None:
+                continue
+            entry = self.files.get(path)
+            if entry is not None:
+                entry[:4] = list(signature)
+                entry[5] = now - signature[0] <= RACY_WINDOW_NS
+                self.dirty = True
+        pending = [path for path in changes if changes[path] != 'deleted']
+        self.settle_scanned_dirs(pending)
+        self.save()
+
+    def settle_scanned_dirs(self, pending: Iterable[str] = ()):
+        """Remember the mtimes of scanned directories with nothing left to commit"""
+        busy = _ancestors(pending)
+        now = time.time_ns()
+        for directory, mtime_ns in self._scanned_dirs.items():
+            if directory in busy:
+                continue
+            self.dirs[directory] = [mtime_ns, now - mtime_ns <= RACY_WINDOW_NS]
+            self.dirty = True
+        self._scanned_dirs = {}
+
+    def record_commits(self, committed: Dict[str, Optional[Tuple[StatSignature, str]]], head_sha: Optional[str]):
+        """Update entries after paths were committed
+
+        ``committed`` maps each path to (signature taken before hashing, blob
+        sha), or None if the path was deleted. The sha is None for files
+        committed as Git LFS pointers, whose contents never hash to it.
+        """
+        now = time.time_ns()
+        for path, value in committed.items():
+            if value is None:
+                self.files.pop(path, None)
+                continue
+            signature, sha = value
+            self.files[path] = list(signature) + [sha, now - signature[0] <= RACY_WINDOW_NS]
+            self._add_parent_dirs(path)
+        self.head = head_sha
+        self.index_signature = self._index_signature()
+        self.dirty = True
+        self.save()
+
+    def rebuild(self, tracked: Dict[str, str], changes: Dict[str, str], head_sha: Optional[str],
+                signatures: Dict[str, Optional[os.stat_result]], dir_mtimes: Dict[str, int]):
+        """Replace the cache with a freshly verified state
+
+        ``tracked`` maps tracked paths to their index blob ids and
+        ``changes`` is a full git status taken after ``signatures`` and
+        ``dir_mtimes`` were collected, so anything modified in between is
+        either reported by git or caught by a later stat mismatch.
+        """
+        now = time.time_ns()
+        self.files = {}
+        self.dirs = {}
+        for path, sha in tracked.items():
+            st = signatures.get(path)
+            if path in changes or st is None:
+                # Never matches a real stat, so it stays a candidate until committed
+                self.files[path] = [-1, -1, -1, -1, sha, False]
+                continue
+            signature = stat_signature(st)
+            self.files[path] = list(signature) + [sha, now - signature[0] <= RACY_WINDOW_NS]
+
+        busy = _ancestors(path for path, change in changes.items() if change != 'deleted')
+        for directory, mtime_ns in dir_mtimes.items():
+            # Directories with uncommitted new entries are rescanned every time
+            racy = directory in busy or now - mtime_ns <= RACY_WINDOW_NS
+            self.dirs[directory] = [mtime_ns, racy]
+        self.head = head_sha
+        self.index_signature = self._index_signature()
+        self.dirty = True
+        self.save()
+
+    def tracked_directories(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Current mtimes of the root and every directory holding one of paths"""
+        directories = {''}
+        for path in paths:
+            parent = os.path.dirname(path)
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = os.path.dirname(parent)
+        mtimes = {}
+        for directory in directories:
+            try:
+                mtimes[directory] = os.stat(self.project_path / directory).st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def _add_parent_dirs(self, path: str):
+        parent = os.path.dirname(path)
+        while parent and parent not in self.dirs:
+            try:
+                mtime_ns = os.stat(self.project_path / parent).st_mtime_ns
+            except FileNotFoundError:
+                break
+            # Recorded after the fact, so keep rescanning until it settles
+            self.dirs[parent] = [mtime_ns, True]
+            parent = os.path.dirname(parent)
+
+    def _index_signature(self):
+        try:
+            return list(stat_signature(os.stat(self.index_path)))
+        except FileNotFoundError:
+            return None
+
+    def _clear(self):
+        self.files = {}
+        self.dirs = {}
+        self.head = None
+        self.index_signature = None
+        self._file_signature = None
@@ -3,6 +3,7 @@ from typing import Dict, Any
 import git
 from git import Repo
 import datetime
+from .commit_graph import CommitHistory
 
 class Statistics:
     def __init__(self, project_path: str):
@@ -17,10 +18,18 @@ class Statistics:
             raise ValueError(f"Directory {self.project_path} is not a git repository")
 
     def get_commit_count(self) -> int:
-        """Return total number of commits in the repository"""
+        """Return total number of commits in the repository
+
+        Counted from the commit-graph when there is one, so only commits
+        made since it was written are parsed.
+        """
         if not self.repo:
             return 0
-        return sum(1 for _ in self.repo.iter_commits())
+        history = CommitHistory(self.repo)
+        try:
+            return history.count()
+        finally:
+            history.close()
 
     def get_commit_stats(self) -> Dict[str, Any]:
         """Return statistics about commits such as counts by author and date"""
@@ -0,0 +1,99 @@
+import os
+import time
+import asyncio
+import random
+import logging
+from pathlib import Path
+from typing import Iterator, Optional
+from .config_manager import get_global_config_path
+from .repo_lock import try_lock_file, unlock_file
+
+class TickSlotsBusy(Exception):
+    """Raised when no tick slot frees up before the timeout"""
+
+def get_tick_slots_dir() -> Path:
+    """Directory of the host-wide tick slot lock files"""
+    override = os.environ.get('GRAVITYCOMMIT_TICK_SLOTS')
+    if override:
+        return Path(override)
+    return get_global_config_path().parent / 'tick-slots'
+
+class TickSlots:
+    """Host-wide counting semaphore limiting how many commit ticks run at once
+
+    Slot i is an flock on <dir>/slot-i.lock, so every autocommit process of
+    the user (separate daemons, or the projects of one DaemonRuntime) shares
+    the same limit, and a slot held by a process that dies is freed by the
+    kernel. A limit of 0 disables the cap.
+    """
+
+    def __init__(self, limit: int, directory: Optional[Path] = None, initial_delay: float = 0.05,
+                 max_delay: float = 2.0):
+        self.limit = limit
+        self.directory = Path(directory) if directory is not None else get_tick_slots_dir()
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(__name__)
+        self._fd = None
+        self.slot = None
+
+    def acquire(self, timeout: float = 60.0) -> float:
+        """Take a slot; returns the seconds spent waiting, or raises TickSlotsBusy"""
+        if self.limit <= 0:
+            return 0.0
+        started = time.monotonic()
+        for delay in self._attempts(timeout):
+            time.sleep(delay)
+        return time.monotonic() - started
+
+    async def acquire_async(self, timeout: float = 60.0) -> float:
+        """acquire() that waits on the running event loop instead of blocking a thread"""
+        if self.limit <= 0:
+            return 0.0
+        started = time.monotonic()
+        for delay in self._attempts(timeout):
+            await asyncio.sleep(delay)
+        return time.monotonic() - started
+
+    def _attempts(self, timeout: float) -> Iterator[float]:
+        """Try every slot until one is free, yielding how long to back off in between"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        delay = self.initial_delay
+        while not self._try_slots():
+            if time.monotonic() + delay > deadline:
+                raise TickSlotsBusy(f"All {self.limit} tick slots busy for {timeout:.0f}s")
+            yield delay * random.uniform(0.5, 1.0)
+            delay = min(self.max_delay, delay * 2)
+
+    def _try_slots(self) -> bool:
+        # Start at a random slot so waiters do not all hammer slot 0
+        first = random.randrange(self.limit)
+        for i in range(self.limit):
+            slot = (first + i) % self.limit
+            fd = try_lock_file(self.directory / f"slot-{slot}.lock")
+            if fd is not None:
+                self._fd = fd
+                self.slot = slot
+                return True
+        return False
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            unlock_file(self._fd)
+        finally:
+            self._fd = None
+            self.slot = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
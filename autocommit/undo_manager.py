@@ -3,6 +3,7 @@ from typing import List, Optional
 import git
 from git import Repo
 import click
+from .commit_graph import CommitHistory
 
 class UndoManager:
     def __init__(self, project_path: str):
@@ -22,7 +23,7 @@ class UndoManager:
             return []
 
         commits = []
-        for commit in list(self.repo.iter_commits())[:limit]:
+        for commit in self._recent_commits(limit):
             commits.append({
                 'hash': commit.hexsha[:8],
                 'message': commit.message.strip(),
@@ -32,11 +33,32 @@ class UndoManager:
             })
         return commits
 
+    def is_pushed(self, commit_hash: str) -> bool:
+        """Check whether a commit is already on a remote-tracking branch"""
+        if not self.repo:
+            return False
+        history = CommitHistory(self.repo)
+        try:
+            return history.is_pushed(commit_hash)
+        finally:
+            history.close()
+
+    def count_pushed(self, count: int) -> int:
+        """How many of the last count commits are already on a remote-tracking branch"""
+        if not self.repo or not self.repo.remotes:
+            return 0
+        history = CommitHistory(self.repo)
+        try:
+            return sum(1 for sha in history.walk(limit=count) if history.is_pushed(sha))
+        finally:
+            history.close()
+
     def undo_last_commit(self, keep_changes: bool = False) -> bool:
         """Undo the last commit, optionally keeping changes staged"""
         if not self.repo:
             return False
 
+        self._warn_if_pushed(1)
         try:
             if keep_changes:
                 # Use git reset --soft HEAD~1 to keep changes staged
@@ -56,6 +78,7 @@ class UndoManager:
         if not self.repo or count < 1:
             return False
 
+        self._warn_if_pushed(count)
         try:
             target_commit = f'HEAD~{count}'
             if keep_changes:
@@ -93,13 +116,19 @@ class UndoManager:
 
         try:
             # Get the commits that would be undone
-            commits = list(self.repo.iter_commits())[:count]
+            commits = self._recent_commits(count)
+            history = CommitHistory(self.repo)
+            try:
+                pushed = {commit.hexsha for commit in commits if history.is_pushed(commit.hexsha)}
+            finally:
+                history.close()
 
             click.echo(f"\nPreview of undoing {count} commit(s):")
             click.echo("-" * 50)
 
             for i, commit in enumerate(commits, 1):
-                click.echo(f"{i}. {commit.hexsha[:8]} - {commit.message.strip()[:50]}...")
+                marker = " (already pushed)" if commit.hexsha in pushed else ""
+                click.echo(f"{i}. {commit.hexsha[:8]} - {commit.message.strip()[:50]}...{marker}")
                 click.echo(f"   Author: {commit.author.name}")
                 click.echo(f"   Date: {commit.committed_datetime.strftime('%Y-%m-%d %H:%M')}")
                 click.echo(f"   Files changed: {len(list(commit.stats.files.keys()))}")
@@ -107,3 +136,17 @@ class UndoManager:
 
         except Exception as e:
             click.echo(f"✗ Failed to preview undo: {e}")
+
+    def _recent_commits(self, limit: int) -> list:
+        # Walk the commit-graph and parse only the commits that are shown
+        history = CommitHistory(self.repo)
+        try:
+            return [self.repo.commit(sha) for sha in history.walk(limit=limit)]
+        finally:
+            history.close()
+
+    def _warn_if_pushed(self, count: int):
+        pushed = self.count_pushed(count)
+        if pushed:
+            click.echo(f"⚠ {pushed} of the commits being undone are already pushed; "
+                       "the remote will still have them")
@@ -28,12 +28,12 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "gitpython>=3.1.0",
-        "schedule>=1.1.0",
         "psutil>=5.8.0",
         "click>=8.0.0",
     ],
     extras_require={
         "windows": ["pywin32>=227"],
+        "linux": ["jeepney>=0.7"],
     },
     entry_points={
         "console_scripts": [
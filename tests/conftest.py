@@ -0,0 +1,7 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_user_state(tmp_path, monkeypatch):
+    """Keep daemons under test away from the real global config and tick slots"""
+    monkeypatch.setenv('GRAVITYCOMMIT_CONFIG', str(tmp_path / "config.json"))
+    monkeypatch.setenv('GRAVITYCOMMIT_TICK_SLOTS', str(tmp_path / "tick-slots"))
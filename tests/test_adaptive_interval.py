@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the adaptive commit interval
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from autocommit.adaptive_interval import AdaptiveInterval
+from autocommit.project_daemon import ProjectDaemon
+
+def test_adaptive_interval():
+    """Test widening, tightening, hysteresis, bounds and the daemon wiring"""
+
+    print("Testing adaptive interval:")
+    print("=" * 50)
+
+    adaptive = AdaptiveInterval(10, minimum=2, maximum=30)
+
+    # Idle ticks widen the interval, but only after a streak
+    assert not adaptive.observe(0) and not adaptive.observe(0)
+    assert adaptive.observe(0) and adaptive.current == 15
+    for _ in range(9):
+        adaptive.observe(0)
+    assert adaptive.current == 30
+    print("✓ Idle ticks widen the interval up to max_interval")
+
+    # Large ticks tighten it
+    assert not adaptive.observe(50)
+    assert adaptive.observe(50) and adaptive.current == 15
+    for _ in range(10):
+        adaptive.observe(100)
+    assert adaptive.current == 2
+    print("✓ Large ticks tighten the interval down to min_interval")
+
+    # Moderate ticks are in the dead band and break the streaks
+    before = adaptive.current
+    for committed in (0, 0, 5, 0, 0, 3, 50, 4, 50, 1):
+        assert not adaptive.observe(committed)
+    assert adaptive.current == before and adaptive.idle_streak == 0 and adaptive.busy_streak == 0
+    print("✓ Alternating ticks do not make the interval oscillate")
+
+    # A new configured interval restarts from it; disabled it is fixed
+    adaptive.configure(20, 2, 30, True)
+    assert adaptive.current == 20
+    adaptive.configure(20, 25, 30, True)
+    assert adaptive.current == 25
+    adaptive.configure(20, 2, 30, False)
+    assert adaptive.current == 20 and not any(adaptive.observe(0) for _ in range(10))
+    print("✓ Reconfiguration and the disabled policy")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.chdir(test_dir)
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        try:
+            os.system("git init -q")
+            os.system("git config user.name 'Test User'")
+            os.system("git config user.email 'test@example.com'")
+            (test_dir / ".autocommit").write_text(
+                '{"interval": 10, "adaptive_interval": true, "min_interval": 5, "max_interval": 40}')
+            os.system("git add .autocommit && git commit -q -m 'Initial commit'")
+
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+            daemon.scheduler.start(lambda: None)
+            try:
+                for _ in range(3):
+                    daemon.tick()
+                status = daemon.get_status()
+                assert daemon.scheduler.interval_minutes == 15 and status['interval'] == 15
+                assert status['configured_interval'] == 10 and status['adaptive_interval']['enabled']
+                assert 0 < status['next_tick_in'] <= 15 * 60 + 30, status['next_tick_in']
+                print("✓ Idle daemon ticks move the scheduler to 15 minutes")
+
+                # Forced ticks do not feed the policy
+                for _ in range(3):
+                    daemon.tick(force=True)
+                assert daemon.scheduler.interval_minutes == 15
+
+                for i in range(25):
+                    (test_dir / f"module_{i}.py").write_text(f"value = {i}")
+                assert daemon.tick()['committed'] == 25
+                assert daemon.scheduler.interval_minutes == 15
+                for i in range(25):
+                    (test_dir / f"module_{i}.py").write_text(f"value = {i + 1}")
+                assert daemon.tick()['committed'] == 25
+                assert daemon.scheduler.interval_minutes == 7.5
+                print("✓ Two large ticks tighten it to 7.5 minutes")
+            finally:
+                daemon.scheduler.stop()
+        finally:
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+
+    print("\n" + "=" * 50)
+    print("Adaptive interval tests completed!")
+
+if __name__ == "__main__":
+    test_adaptive_interval()
@@ -4,9 +4,14 @@ Test script to verify CI/CD integration functionality
 """
 
 import os
+import json
+import time
 import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from autocommit.ci_cd_integration import CICDManager, GitHubActions, GitLabCI, JenkinsCI
+from autocommit.ci_cd_integration import CICDManager, GitHubActions, GitLabCI, JenkinsCI, TriggerCoalescer, WorkflowStatusPoller
+from autocommit.project_daemon import ProjectDaemon
 
 def test_ci_cd_integration():
     """Test the CI/CD integration functionality"""
@@ -61,15 +66,289 @@ def test_ci_cd_integration():
         # Trigger hooks
         cicd_mgr.integrations['github'].trigger_hooks('pre_commit')
         cicd_mgr.integrations['github'].trigger_hooks('post_commit')
+        cicd_mgr.integrations['github'].wait_for_hooks(timeout=5)
 
         assert hook_executed['count'] == 2, f"Expected 2 hook executions, got {hook_executed['count']}"
 
         print("\n✓ All CI/CD Integration tests passed!")
         return True
 
+def slow_hook():
+    time.sleep(1)
+
+def failing_hook():
+    return False
+
+def test_concurrent_hooks():
+    """Test hook ordering, short-circuit, timeouts and latency histograms"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("Testing concurrent hook execution:")
+        print("=" * 50)
+
+        pipeline = GitLabCI(temp_dir, "12345", "fake-token")
+        calls = []
+
+        pipeline.add_hook('pre_commit', lambda: calls.append('first'))
+        pipeline.add_hook('pre_commit', failing_hook)
+        pipeline.add_hook('pre_commit', lambda: calls.append('never'))
+        assert pipeline.trigger_hooks('pre_commit') is False
+        assert calls == ['first'], f"pre_commit should short-circuit, got {calls}"
+        print("✓ pre_commit hooks run in order and short-circuit")
+
+        # A slow pre_commit hook is cut off by its timeout
+        pipeline.hooks['pre_commit'] = []
+        pipeline.add_hook('pre_commit', slow_hook, timeout=0.1)
+        start = time.monotonic()
+        assert pipeline.trigger_hooks('pre_commit') is False
+        assert time.monotonic() - start < 0.9, "Timed out hook should not stall the commit"
+        print("✓ pre_commit hook timeout enforced")
+
+        # post_commit hooks are fire-and-forget
+        pipeline.add_hook('post_commit', slow_hook)
+        start = time.monotonic()
+        assert pipeline.trigger_hooks('post_commit') is True
+        assert time.monotonic() - start < 0.5, "post_commit should not block the caller"
+        assert pipeline.wait_for_hooks(timeout=5)
+        print("✓ post_commit hooks do not block")
+
+        # Process-pool hooks
+        pipeline.add_hook('on_success', failing_hook, use_process=True)
+        pipeline.trigger_hooks('on_success')
+        assert pipeline.wait_for_hooks(timeout=30)
+
+        histograms = pipeline.get_hook_latency_histograms()
+        print(f"✓ Latency histograms: {sorted(histograms)}")
+        assert histograms['pre_commit:slow_hook']['timeouts'] == 1
+        assert histograms['post_commit:slow_hook']['count'] == 1
+        assert histograms['post_commit:slow_hook']['max_ms'] >= 1000
+        assert histograms['on_success:failing_hook']['failures'] == 1
+        pipeline.shutdown()
+
+        print("\n✓ All concurrent hook tests passed!")
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Stand-in for the GitHub workflow run endpoints with ETag support"""
+
+    runs = {}
+    requests = []
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        FakeGitHubHandler.requests.append((path, self.headers.get('If-None-Match')))
+        if path == '/repos/o/r/actions/runs':
+            # Only the two newest runs fit on the listing page
+            newest = sorted(self.runs, reverse=True)[:2]
+            body = {'workflow_runs': [self.runs[run_id] for run_id in newest]}
+        elif path.startswith('/repos/o/r/actions/runs/'):
+            run_id = int(path.rsplit('/', 1)[1])
+            if run_id not in self.runs:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = self.runs[run_id]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body, sort_keys=True).encode()
+        etag = f'"{hash(payload) & 0xffffffff:x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_workflow_status_poller():
+    """Test batched, conditional polling against a local GitHub stand-in"""
+
+    FakeGitHubHandler.runs = {
+        run_id: {'id': run_id, 'status': 'in_progress', 'conclusion': None} for run_id in (1, 2, 3)
+    }
+    FakeGitHubHandler.requests = []
+    server = HTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            print("Testing workflow status polling:")
+            print("=" * 50)
+
+            now = {'t': 0.0}
+            github = GitHubActions(temp_dir, 'o', 'r', 'fake-token', api_url=f"http://127.0.0.1:{server.server_port}")
+            poller = WorkflowStatusPoller(github, min_interval=5, max_interval=60, clock=lambda: now['t'])
+            for run_id in (1, 2, 3):
+                poller.track(run_id)
+
+            # One listing answers runs 3 and 2; run 1 has aged out and is fetched directly
+            changed = poller.poll()
+            assert set(changed) == {'1', '2', '3'}
+            assert len(FakeGitHubHandler.requests) == 2, FakeGitHubHandler.requests
+            print(f"✓ First poll: {len(FakeGitHubHandler.requests)} requests for 3 runs")
+
+            # Nothing is due before the poll interval elapses
+            assert poller.poll() == {}
+            assert len(FakeGitHubHandler.requests) == 2
+
+            # Unchanged runs come back as free 304s and keep their cached status
+            now['t'] = 5.0
+            assert poller.poll() == {}
+            conditional = [etag for _, etag in FakeGitHubHandler.requests[2:]]
+            assert conditional and all(conditional), "Repeat polls should be conditional"
+            assert poller.get_status(2)['status'] == 'in_progress'
+            print("✓ Repeat polls use If-None-Match")
+
+            # Completion is picked up and completed runs stop being polled
+            FakeGitHubHandler.runs[3] = {'id': 3, 'status': 'completed', 'conclusion': 'success'}
+            now['t'] = 10.0
+            changed = poller.poll()
+            assert '3' in changed and changed['3']['conclusion'] == 'success'
+            assert '3' not in poller.active_runs()
+            print("✓ Completed run detected and retired")
+
+            # Older runs are polled less often
+            now['t'] = 600.0
+            poller.poll()
+            assert poller.next_poll_in() == 60.0
+            print("✓ Poll interval widens as runs age")
+
+            # get_workflow_status shares the conditional cache
+            assert github.get_workflow_status('3')['conclusion'] == 'success'
+            assert github.get_workflow_status('3')['conclusion'] == 'success'
+            assert FakeGitHubHandler.requests[-1] == ('/repos/o/r/actions/runs/3', FakeGitHubHandler.requests[-1][1])
+            assert FakeGitHubHandler.requests[-1][1], "Second status lookup should be conditional"
+
+            # The conditional cache keeps only the most recently used responses
+            github.STATUS_CACHE_SIZE = 2
+            for run_id in ('1', '2', '3', '2'):
+                github.get_workflow_status(run_id)
+            assert [key[0] for key in github._status_cache] == ['/actions/runs/3', '/actions/runs/2']
+            print("✓ Status cache is bounded")
+
+            print("\n✓ All workflow status polling tests passed!")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class RecordingCICDManager(CICDManager):
+    """CICDManager that records triggers instead of calling CI services"""
+
+    def __init__(self, project_path):
+        super().__init__(project_path)
+        self.triggered = []
+        self.cancelled = []
+
+    def trigger_ci(self, platform, sha=None, **kwargs):
+        self.triggered.append((platform, sha, self._with_sha(platform, sha, kwargs)))
+        return {'id': len(self.triggered)}
+
+    def cancel_ci(self, platform, previous_result=None, **kwargs):
+        self.cancelled.append((platform, previous_result))
+        return True
+
+def test_trigger_coalescing():
+    """Test that bursts of post-commit events collapse into one trigger"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("Testing CI trigger coalescing:")
+        print("=" * 50)
+
+        manager = RecordingCICDManager(temp_dir)
+        manager.add_gitlab_ci("12345", "fake-token")
+        manager.configure_trigger_coalescing(window=0.2)
+        manager.setup_post_commit_hook('gitlab', ref='main')
+
+        # 300 per-file commits in one tick fire a single pipeline
+        for i in range(300):
+            manager.integrations['gitlab'].trigger_hooks('post_commit', f"sha{i:04d}")
+        time.sleep(0.5)
+
+        assert len(manager.triggered) == 1, f"Expected 1 trigger, got {len(manager.triggered)}"
+        platform, sha, kwargs = manager.triggered[0]
+        assert sha == "sha0299", "Trigger should carry the latest sha"
+        assert kwargs['variables']['AUTOCOMMIT_SHA'] == "sha0299"
+        assert kwargs['ref'] == 'main'
+        print(f"✓ 300 commits coalesced into {len(manager.triggered)} trigger for {sha}")
+
+        # Per-tick mode: nothing fires until the tick flushes
+        manager.configure_trigger_coalescing(window=None, min_interval={'gitlab': 60}, cancel_superseded=True)
+        manager.coalescer.submit('gitlab', 'a1', ref='main')
+        manager.coalescer.submit('gitlab', 'a2', ref='main')
+        assert len(manager.triggered) == 1
+        manager.flush_triggers()
+        assert len(manager.triggered) == 2
+        assert manager.triggered[-1][1] == 'a2'
+        assert manager.cancelled == [('gitlab', None)]
+        print("✓ Per-tick flush sends one trigger")
+
+        # Minimum spacing defers the next trigger instead of sending it
+        manager.coalescer.submit('gitlab', 'b1', ref='main')
+        manager.flush_triggers()
+        assert len(manager.triggered) == 2, "Trigger inside minimum spacing should be deferred"
+        assert manager.coalescer.pending_platforms() == ['gitlab']
+        manager.coalescer.cancel()
+        print("✓ Minimum spacing between triggers enforced")
+
+        # Flushing while other threads submit sends every event exactly once
+        coalescer = TriggerCoalescer(RecordingCICDManager(temp_dir), window=None)
+        def submit_many(offset):
+            for i in range(500):
+                coalescer.submit(f"platform{offset + i}", f"sha{i}")
+        submitters = [threading.Thread(target=submit_many, args=(n * 500,)) for n in range(4)]
+        for thread in submitters:
+            thread.start()
+        flushed = {}
+        while any(thread.is_alive() for thread in submitters) or coalescer.pending_platforms():
+            flushed.update(coalescer.flush())
+        assert len(flushed) == 2000 and len(coalescer.manager.triggered) == 2000
+        print("✓ Concurrent submit and flush")
+
+        # A daemon tick hands its newest commit to the coalescer and flushes it as it ends
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        try:
+            os.system(f"git -C '{test_dir}' init -q")
+            os.system(f"git -C '{test_dir}' config user.name 'Test User'")
+            os.system(f"git -C '{test_dir}' config user.email 'test@example.com'")
+            (test_dir / "README.md").write_text("# Test Project")
+            os.system(f"git -C '{test_dir}' add README.md && git -C '{test_dir}' commit -q -m 'Initial commit'")
+            manager = RecordingCICDManager(str(test_dir))
+            manager.add_gitlab_ci("12345", "fake-token")
+            manager.configure_trigger_coalescing(window=None)
+            manager.setup_post_commit_hook('gitlab', ref='main')
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None, ci_manager=manager)
+            daemon.pipeline.strategy = 'per-file'
+            for name in ("a.py", "b.py", "c.py"):
+                (test_dir / name).write_text(f"{name[0]} = 1")
+            assert daemon.tick()['committed'] == 3
+            head = os.popen(f"git -C '{test_dir}' rev-parse HEAD").read().strip()
+            assert [(platform, sha) for platform, sha, _ in manager.triggered] == [('gitlab', head)]
+            assert not manager.coalescer.pending_platforms()
+            assert daemon.tick()['committed'] == 0 and len(manager.triggered) == 1
+        finally:
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+        print("✓ A daemon tick sends one trigger for its commits")
+
+        print("\n✓ All CI trigger coalescing tests passed!")
+
 if __name__ == "__main__":
     try:
         test_ci_cd_integration()
+        test_concurrent_hooks()
+        test_workflow_status_poller()
+        test_trigger_coalescing()
         print("\n🎉 CI/CD Integration module testing completed successfully!")
     except Exception as e:
         print(f"\n❌ CI/CD Integration testing failed: {e}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the CLI starts without loading heavy dependencies
+"""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+# Modules that only specific commands need
+HEAVY_MODULES = ['git', 'psutil', 'requests', 'smtplib', 'email.mime', 'schedule', 'pkg_resources']
+
+# Generous ceiling for the cumulative import time of autocommit.cli
+MAX_CLI_IMPORT_US = 500000
+
+def _import_times(statement):
+    """Run a statement under -X importtime and return {module: cumulative_us}"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(Path(__file__).resolve().parent.parent), env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, env=env, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative.strip())
+    return times
+
+def test_cli_startup():
+    """Test that importing the CLI defers GitPython, psutil and requests"""
+
+    print("Testing CLI startup imports:")
+    print("=" * 50)
+
+    times = _import_times("import autocommit.cli")
+    assert 'autocommit.cli' in times, "autocommit.cli should appear in -X importtime output"
+
+    loaded = [name for name in times if any(name == heavy or name.startswith(heavy + '.') for heavy in HEAVY_MODULES)]
+    assert not loaded, f"CLI import pulled in heavy modules: {loaded}"
+    print(f"✓ No heavy modules imported ({', '.join(HEAVY_MODULES)})")
+
+    cli_us = times['autocommit.cli']
+    print(f"✓ autocommit.cli imported in {cli_us / 1000:.1f} ms (cumulative)")
+    assert cli_us < MAX_CLI_IMPORT_US, f"CLI import took {cli_us} us"
+
+    # Lazily loaded subcommands and package attributes still resolve
+    _import_times(
+        "import sys, click; from autocommit.cli import cli; "
+        "assert 'autocommit.container_commands' not in sys.modules; "
+        "assert cli.get_command(click.Context(cli), 'container-start') is not None; "
+        "assert 'autocommit.container_commands' in sys.modules; "
+        "import autocommit; autocommit.GitOperations"
+    )
+    print("✓ Lazy subcommands resolve on demand")
+
+    result = subprocess.run(
+        [sys.executable, '-m', 'autocommit.cli', 'version'],
+        capture_output=True, text=True, timeout=60,
+        cwd=str(Path(__file__).resolve().parent.parent)
+    )
+    assert result.returncode == 0 and result.stdout.startswith('GravityCommit v'), result.stderr
+    print(f"✓ {result.stdout.strip()}")
+
+    print("\n✓ All CLI startup tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_cli_startup()
+        print("\n🎉 CLI startup testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ CLI startup testing failed: {e}")
+        exit(1)
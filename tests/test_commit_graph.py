@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the commit-graph reader and graph-backed history walks
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from git import Repo
+from autocommit.commit_graph import CommitGraph, CommitHistory
+from autocommit.statistics import Statistics
+from autocommit.undo_manager import UndoManager
+
+def _git(command):
+    return os.popen(f"git {command}").read().strip()
+
+def _commit(test_dir, name, when):
+    (test_dir / name).write_text(name)
+    os.system(f"git add '{name}'")
+    os.system(f"GIT_COMMITTER_DATE='{when} +0000' GIT_AUTHOR_DATE='{when} +0000' git commit -q -m 'Add {name}'")
+
+def test_commit_graph():
+    """Test positions, parents, walks and ancestry against git itself"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q -b main")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+
+        print("Testing commit-graph reader:")
+        print("=" * 50)
+
+        # History with a merge and an octopus merge
+        when = 1700000000
+        _commit(test_dir, "base.txt", when)
+        for branch in ("a", "b", "c"):
+            os.system(f"git checkout -q -b {branch} main")
+            for i in range(3):
+                when += 60
+                _commit(test_dir, f"{branch}{i}.txt", when)
+        os.system("git checkout -q main")
+        when += 60
+        os.system(f"GIT_COMMITTER_DATE='{when} +0000' git merge -q --no-ff --no-edit a b c > /dev/null")
+        base_sha = _git("rev-parse HEAD~1")
+        os.system("git commit-graph write --reachable --split --no-progress")
+        for i in range(3):
+            when += 60
+            _commit(test_dir, f"layer2_{i}.txt", when)
+        os.system("git commit-graph write --reachable --split=no-merge --no-progress")
+        assert _git("commit-graph verify 2>&1") == ""
+
+        repo = Repo(test_dir)
+        graph = CommitGraph.load(repo.git_dir)
+        assert graph is not None and len(graph.layers) == 2 and len(graph) == 14, len(graph)
+        for line in _git("rev-list --parents HEAD").splitlines():
+            sha, *parents = line.split()
+            position = graph.position(sha)
+            assert graph.sha(position) == sha
+            assert [graph.sha(parent) for parent in graph.parents(position)] == parents
+            assert graph.commit_time(position) == int(_git(f"show -s --format=%ct {sha}"))
+        octopus = graph.position(_git("rev-parse HEAD~3"))
+        assert len(graph.parents(octopus)) == 4
+        assert graph.generation(graph.position(_git("rev-parse HEAD"))) > graph.generation(octopus)
+        assert graph.position("0" * 40) is None
+        print("✓ Parents, octopus edges and commit times match git across a 2-layer chain")
+
+        # Commits made after the graph are parsed, the rest come from the graph
+        for i in range(2):
+            when += 60
+            _commit(test_dir, f"new_{i}.txt", when)
+        history = CommitHistory(repo)
+        parsed = []
+        original_parse = history._parse
+        history._parse = lambda sha: parsed.append(sha) or original_parse(sha)
+        assert history.count() == int(_git("rev-list --count HEAD")) == 16
+        assert list(history.walk()) == _git("rev-list HEAD").splitlines()
+        assert list(history.walk(limit=4)) == _git("rev-list -n 4 HEAD").splitlines()
+        assert set(parsed) == set(_git("rev-list -n 2 HEAD").splitlines()), parsed
+        print("✓ Counts and walks match git; only the 2 commits newer than the graph were parsed")
+
+        assert history.is_ancestor(base_sha, "HEAD")
+        assert history.is_ancestor("a~2", "HEAD")
+        assert not history.is_ancestor("HEAD", "a")
+        assert not history.is_ancestor("b", "a")
+        assert history.is_ancestor("HEAD~1", "HEAD") and not history.is_ancestor("HEAD", "HEAD~1")
+        print("✓ Ancestry checks agree with generation pruning")
+
+        # "Has this been pushed?"
+        remote_dir = Path(temp_dir) / "remote.git"
+        os.system(f"git init -q --bare '{remote_dir}'")
+        os.system(f"git remote add origin '{remote_dir}'")
+        os.system("git push -q origin main 2>/dev/null")
+        when += 60
+        _commit(test_dir, "unpushed.txt", when)
+        assert CommitHistory(repo).is_pushed("HEAD~1")
+        assert not CommitHistory(repo).is_pushed("HEAD")
+        undo_mgr = UndoManager(str(test_dir))
+        assert undo_mgr.count_pushed(3) == 2
+        assert [commit['message'] for commit in undo_mgr.get_recent_commits(2)] == ["Add unpushed.txt", "Add new_1.txt"]
+        print("✓ Pushed commits detected through remote-tracking branches")
+
+        assert Statistics(str(test_dir)).get_commit_count() == 17
+        print("✓ Statistics counts commits through the graph")
+
+        # Repositories without a graph fall back to object parsing
+        for path in (Path(repo.git_dir) / "objects" / "info" / "commit-graphs").iterdir():
+            path.unlink()
+        assert CommitGraph.load(repo.git_dir) is None
+        assert CommitHistory(repo).count() == 17
+        print("✓ Works without a commit-graph")
+
+        print("\n" + "=" * 50)
+        print("Commit-graph tests completed!")
+
+if __name__ == "__main__":
+    test_commit_graph()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the commit pipeline
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from autocommit.commit_pipeline import CommitPipeline
+
+def _git_log(test_dir):
+    return os.popen(f"git -C '{test_dir}' log --format=%s").read().strip().split('\n')
+
+def test_commit_pipeline():
+    """Test stages, dry-run, deletions and pluggable stages"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        # Initialize git repository
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        (test_dir / "old.py").write_text("print('old')")
+        os.system("git add README.md old.py")
+        os.system("git commit -q -m 'Initial commit'")
+
+        # One modification, one deletion, one new file, one nested repository
+        (test_dir / "README.md").write_text("# Test Project\n\nMore docs")
+        (test_dir / "old.py").unlink()
+        (test_dir / "app.py").write_text("print('hello')")
+        (test_dir / "vendor").mkdir()
+        os.system("git -C vendor init -q")
+
+        print("Testing CommitPipeline functionality:")
+        print("=" * 50)
+
+        pipeline = CommitPipeline(str(test_dir))
+
+        # Dry run classifies and groups but writes nothing
+        run = pipeline.run(dry_run=True)
+        assert sorted(run.to_dict()['commits'][i]['files'][0] for i in range(3)) == ['README.md', 'app.py', 'old.py']
+        assert [change.path for change in run.filtered] == ['vendor/'], f"Nested repo should be filtered: {run.filtered}"
+        assert 'write_objects' not in run.timings
+        assert len(_git_log(test_dir)) == 1
+        print("✓ Dry run reports groups without committing")
+
+        # A real run commits each file separately, including the deletion
+        run = pipeline.run()
+        result = run.to_dict()
+        assert result['committed'] == 3 and result['failed'] == 0, result
+        assert list(run.timings) == ['lock'] + list(CommitPipeline.STAGES)
+        log = _git_log(test_dir)
+        assert len(log) == 4, log
+        assert any('remove old' in message for message in log)
+        status = os.popen("git status --porcelain").read().split('\n')
+        assert [line for line in status if line and not line.endswith('vendor/')] == [], status
+        print(f"✓ Committed {result['committed']} files; stage timings: "
+              + ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in run.timings.items()))
+
+        # Nothing left to do stops after the snapshot
+        run = pipeline.run()
+        assert run.stopped_at == 'filter' and not run.groups
+        print("✓ Clean tree stops early")
+
+        # Stages are pluggable
+        seen = []
+        pipeline.add_stage('audit', lambda run: seen.extend(change.path for change in run.changes), after='classify')
+        pipeline.add_filter(lambda change: not change.path.endswith('.log'))
+
+        def single_commit(run):
+            from autocommit.commit_pipeline import CommitGroup
+            run.groups = [CommitGroup(run.changes, f"Update {len(run.changes)} files")]
+
+        pipeline.replace_stage('group', single_commit)
+        pipeline.add_post_hook(lambda run: seen.append(f"hook:{len(run.committed_files)}"))
+        (test_dir / "a.py").write_text("a = 1")
+        (test_dir / "b.py").write_text("b = 2")
+        (test_dir / "debug.log").write_text("noise")
+        run = pipeline.run()
+        assert list(run.timings)[4] == 'audit'
+        assert seen == ['a.py', 'b.py', 'hook:2'], seen
+        assert _git_log(test_dir)[0] == "Update 2 files"
+        print("✓ Custom stage, filter, grouping and post-hook applied")
+
+        print("\n✓ All CommitPipeline tests passed!")
+
+def test_commit_strategies():
+    """Test per-type, per-directory and single commit strategies"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        os.system("git add README.md")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing commit strategies:")
+        print("=" * 50)
+
+        def make_changes(batch):
+            for directory in ("src", "tests"):
+                (test_dir / directory).mkdir(exist_ok=True)
+                for i in range(25):
+                    (test_dir / directory / f"module_{batch}_{i}.py").write_text(f"value = {i}")
+            (test_dir / "README.md").write_text(f"# Test Project\n\nBatch {batch}")
+
+        expected = {'single': 1, 'per-directory': 3}
+        for strategy in ('single', 'per-directory', 'per-type'):
+            make_changes(strategy)
+            before = len(_git_log(test_dir))
+            result = CommitPipeline(str(test_dir), strategy=strategy).run().to_dict()
+            created = len(_git_log(test_dir)) - before
+            assert result['committed'] == 51, result
+            assert created == len(result['commits']) and created < 10, f"{strategy} created {created} commits"
+            if strategy in expected:
+                assert created == expected[strategy], f"{strategy} created {created} commits"
+            assert os.popen("git status --porcelain").read() == ""
+            print(f"✓ {strategy}: 51 files in {created} commit(s): {result['commits'][0]['message']}")
+
+        try:
+            CommitPipeline(str(test_dir), strategy='per-moon')
+            assert False, "Unknown strategies should be rejected"
+        except ValueError:
+            pass
+
+        print("\n✓ All commit strategy tests passed!")
+
+def test_snapshot_mode():
+    """Test that snapshot mode leaves HEAD and the index alone"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q -b main")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        (test_dir / "app.py").write_text("print('v1')")
+        os.system("git add README.md app.py")
+        os.system("git commit -q -m 'Initial commit'")
+        head = os.popen("git rev-parse HEAD").read().strip()
+        index_before = (test_dir / ".git" / "index").read_bytes()
+
+        print("Testing snapshot mode:")
+        print("=" * 50)
+
+        pipeline = CommitPipeline(str(test_dir), mode='snapshot')
+        (test_dir / "app.py").write_text("print('v2')")
+        (test_dir / "notes.txt").write_text("notes")
+        run = pipeline.run()
+        assert run.ref == 'refs/autocommit/main'
+        assert run.to_dict()['committed'] == 2, run.to_dict()
+        assert os.popen("git rev-parse HEAD").read().strip() == head
+        assert (test_dir / ".git" / "index").read_bytes() == index_before
+        assert os.popen("git rev-list --count main..refs/autocommit/main").read().strip() == "2"
+        print("✓ Snapshots written to refs/autocommit/main; HEAD and index untouched")
+
+        # Unchanged files are not snapshotted again, reverts are
+        assert pipeline.run().groups == []
+        (test_dir / "app.py").write_text("print('v1')")
+        run = pipeline.run()
+        assert [group.paths for group in run.groups] == [['app.py']]
+        assert os.popen("git show refs/autocommit/main:app.py").read().strip() == "print('v1')"
+        print("✓ Only changes since the last snapshot are recorded")
+
+        # Materialize fast-forwards the branch and removes the shadow ref
+        from autocommit.git_operations import GitOperations
+        git_ops = GitOperations(str(test_dir))
+        tip = git_ops.resolve_ref(run.ref)
+        assert git_ops.materialize_snapshots(run.ref) == tip
+        assert os.popen("git rev-parse HEAD").read().strip() == tip
+        assert git_ops.resolve_ref(run.ref) is None
+        assert os.popen("git status --porcelain").read() == ""
+        print("✓ Snapshots materialized onto the branch")
+
+        print("\n✓ All snapshot mode tests passed!")
+
+def test_parallel_object_writing():
+    """Test that blobs written by several git processes match a serial run"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        os.system("git add README.md")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing parallel object writing:")
+        print("=" * 50)
+
+        from autocommit.git_operations import GitOperations
+        paths = []
+        for i in range(300):
+            path = f"gen/file_{i:03d}.txt"
+            (test_dir / "gen").mkdir(exist_ok=True)
+            (test_dir / path).write_text(f"generated {i}\n" * (i + 1))
+            paths.append(path)
+
+        git_ops = GitOperations(str(test_dir))
+        assert len(git_ops._split_batches([(path, os.lstat(path)) for path in paths], 4)) == 4
+        parallel = git_ops.hash_objects(paths, workers=4)
+        serial = git_ops.hash_objects(paths, workers=1)
+        assert parallel == serial and len(parallel) == 300
+        assert parallel["gen/file_007.txt"][1] == os.popen("git hash-object gen/file_007.txt").read().strip()
+        print("✓ 4 workers write the same blobs as 1")
+
+        run = CommitPipeline(str(test_dir), strategy='single', object_workers=4).run()
+        assert len(run.committed_files) == 300
+        assert os.popen("git status --porcelain").read() == ""
+        print("✓ Parallel-written blobs are committed in one serialized ref update")
+
+        print("\n✓ All parallel object writing tests passed!")
+
+def test_fast_import_backend():
+    """Test that the fast-import backend writes one pack and moves the ref once"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q -b main")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        (test_dir / "old.py").write_text("print('old')")
+        (test_dir / ".gitattributes").write_text("*.txt text\n")
+        os.system("git add README.md old.py .gitattributes")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing fast-import backend:")
+        print("=" * 50)
+
+        def loose_objects():
+            return int(os.popen("git count-objects").read().split()[0])
+
+        (test_dir / "gen").mkdir()
+        for i in range(50):
+            (test_dir / "gen" / f"module_{i}.py").write_text(f"value = {i}\n")
+        (test_dir / "README.md").write_text("# Test Project\n\nUpdated")
+        (test_dir / "notes.txt").write_text("converted by git\r\n")
+        (test_dir / "old.py").unlink()
+        os.symlink("README.md", test_dir / "link.md")
+
+        loose_before = loose_objects()
+        run = CommitPipeline(str(test_dir), backend='fast-import').run()
+        assert run.backend == 'fast-import' and run.error is None, run.error
+        assert len(run.committed_groups) == 54, len(run.committed_groups)
+        # Only notes.txt (text attribute) and the symlink went through hash-object
+        assert loose_objects() - loose_before == 2, loose_objects() - loose_before
+        assert os.popen("git rev-list --count HEAD").read().strip() == "55"
+        assert os.popen("git status --porcelain").read() == ""
+        assert os.popen("git show HEAD:gen/module_7.py").read() == "value = 7\n"
+        assert run.groups[-1].sha == os.popen("git rev-parse HEAD").read().strip()
+        print("✓ 54 commits written as one pack; index and branch updated")
+
+        (test_dir / "gen" / "module_7.py").write_text("value = 'seven'\n")
+        run = CommitPipeline(str(test_dir), backend='fast-import', mode='snapshot').run()
+        assert run.committed_files == ["gen/module_7.py"]
+        assert os.popen("git show refs/autocommit/main:gen/module_7.py").read() == "value = 'seven'\n"
+        assert os.popen("git show HEAD:gen/module_7.py").read() == "value = 7\n"
+        print("✓ Snapshot mode commits onto the shadow ref")
+
+        print("\n✓ All fast-import backend tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_commit_pipeline()
+        test_commit_strategies()
+        test_snapshot_mode()
+        test_parallel_object_writing()
+        test_fast_import_backend()
+        print("\n🎉 CommitPipeline testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ CommitPipeline testing failed: {e}")
+        exit(1)
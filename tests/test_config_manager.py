@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script to verify configuration manager functionality
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from autocommit.config_manager import ConfigManager
+
+def test_config_manager():
+    """Test atomic writes, batching and stat-validated reloads"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        global_path = str(Path(temp_dir) / "global.json")
+
+        print("Testing ConfigManager functionality:")
+        print("=" * 50)
+
+        config = ConfigManager(str(test_dir), global_config_path=global_path)
+        assert config.get_interval() == 10, "Default interval should be 10 minutes"
+
+        # A batch produces exactly one write
+        writes = {'count': 0}
+        original_save = config._save_config
+
+        def counting_save():
+            writes['count'] += 1
+            original_save()
+
+        config._save_config = counting_save
+        with config.batch():
+            config.set_interval(15)
+            config.set_manual_override_open(True)
+            config.set_additional_editor_processes(['helix'])
+            config.set_custom_env_vars(['MY_IDE'])
+        assert writes['count'] == 1, f"Expected 1 write, got {writes['count']}"
+        print("✓ Batched setters write the file once")
+
+        # Nothing is left behind except the config itself
+        assert [p.name for p in test_dir.iterdir()] == ['.autocommit']
+        with open(test_dir / '.autocommit', encoding='utf-8') as f:
+            assert json.load(f)['interval'] == 15
+        print("✓ Config written atomically")
+
+        # A failing batch writes nothing and rolls back
+        try:
+            with config.batch():
+                config.set_interval(99)
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert config.get_interval() == 15
+        assert writes['count'] == 1
+        print("✓ Failed batch rolled back")
+
+        # Unchanged files are served from memory
+        reads = {'count': 0}
+        original_load = config.project_layer.load
+
+        def counting_load():
+            reads['count'] += 1
+            original_load()
+
+        config.project_layer.load = counting_load
+        for _ in range(100):
+            config.get_interval()
+        assert reads['count'] == 0, "Unchanged config should not be re-read"
+        print("✓ Hot path does not re-read the file")
+
+        # Edits from another process are picked up without restarting
+        other = ConfigManager(str(test_dir), global_config_path=global_path)
+        other.set_interval(30)
+        assert config.refresh() is True
+        assert config.get_interval() == 30
+        assert config.get_manual_override_open() is True
+        print("✓ External edits picked up")
+
+        config.remove_config()
+        assert config.get_interval() == 10
+        assert not (test_dir / '.autocommit').exists()
+
+        print("\n✓ All ConfigManager tests passed!")
+
+def test_layered_config():
+    """Test defaults, user-global and per-project layers"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        global_path = Path(temp_dir) / "global.json"
+        projects = []
+        for name in ("alpha", "beta"):
+            project = Path(temp_dir) / name
+            project.mkdir()
+            projects.append(ConfigManager(str(project), global_config_path=str(global_path)))
+        alpha, beta = projects
+
+        print("Testing layered configuration:")
+        print("=" * 50)
+
+        assert alpha.get_interval() == 10
+        assert alpha.get_value_source('interval') == 'default'
+
+        # Host-wide defaults apply to every project without their own override
+        alpha.set_global_value('interval', 20)
+        alpha.set_global_value('additional_editor_processes', ['helix'])
+        assert alpha.get_interval() == 20
+        assert beta.get_interval() == 20
+        assert beta.get_additional_editor_processes() == ['helix']
+        assert alpha.global_layer is beta.global_layer, "Global layer should be parsed once per process"
+        print("✓ Global defaults shared across projects")
+
+        # Project overrides win over the global layer
+        beta.set_interval(3)
+        assert beta.get_interval() == 3
+        assert beta.get_value_source('interval') == 'project'
+        assert alpha.get_interval() == 20
+        print("✓ Project overrides take precedence")
+
+        # The merged view is memoized until a layer changes
+        merged = alpha._merged_view()
+        alpha.get_interval()
+        assert alpha._merged_view() is merged
+        alpha.set_manual_override_open(True)
+        assert alpha._merged_view() is not merged
+        print("✓ Merged view recomputed only on change")
+
+        # Invalid values are rejected by setters and dropped at load time
+        try:
+            alpha.set_interval(-5)
+            assert False, "Negative interval should be rejected"
+        except ValueError:
+            pass
+        with open(global_path, 'w', encoding='utf-8') as f:
+            json.dump({'interval': 'often', 'custom_env_vars': ['MY_IDE']}, f)
+        assert alpha.get_interval() == 10
+        assert alpha.get_custom_env_vars() == ['MY_IDE']
+        print("✓ Schema validated at load time")
+
+        print("\n✓ All layered configuration tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_config_manager()
+        test_layered_config()
+        print("\n🎉 ConfigManager module testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ ConfigManager testing failed: {e}")
+        exit(1)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the daemon control socket
+"""
+
+import os
+import sys
+import asyncio
+import time
+import socket
+import tempfile
+import subprocess
+import threading
+from pathlib import Path
+from autocommit.project_daemon import ProjectDaemon
+from autocommit.control_socket import ControlClient, ControlError, ControlServer
+from autocommit.commit_pipeline import echo_result
+
+def test_control_socket():
+    """Test controlling a running ProjectDaemon through its socket"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+
+        # Initialize git repository
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        os.system("git add README.md")
+        os.system("git commit -q -m 'Initial commit'")
+        (test_dir / ".autocommit").write_text('{"interval": 60}')
+        os.system("git add .autocommit")
+        os.system("git commit -q -m 'Add config'")
+
+        print("Testing control socket functionality:")
+        print("=" * 50)
+
+        daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+        daemon.start()
+        try:
+            client = ControlClient(str(test_dir))
+            assert client.is_available(), "Daemon should be reachable"
+
+            start = time.monotonic()
+            state = client.request('status')
+            elapsed = (time.monotonic() - start) * 1000
+            assert state['pid'] == os.getpid()
+            assert state['interval'] == 60
+            assert state['paused'] is False
+            print(f"✓ Status answered in {elapsed:.1f} ms")
+
+            # A project never set up through the CLI still shows up in the registry
+            from autocommit.project_registry import ProjectRegistry
+            entry = ProjectRegistry().get(str(test_dir))
+            assert entry and entry['mode'] == 'service' and entry['daemon_pid'] == os.getpid()
+            print("✓ Daemon registered its project")
+
+            # Pause and resume act on the running scheduler
+            client.request('pause', duration=5)
+            assert daemon.scheduler.is_paused()
+            assert client.request('status')['paused'] is True
+            client.request('resume')
+            assert not daemon.scheduler.is_paused()
+            print("✓ Pause/resume reach the daemon")
+
+            # Stream tick events while forcing a commit
+            events = []
+
+            def listen():
+                for event in ControlClient(str(test_dir)).subscribe():
+                    events.append(event)
+                    break
+
+            listener = threading.Thread(target=listen, daemon=True)
+            listener.start()
+            deadline = time.monotonic() + 5
+            while not daemon.control._subscribers and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            (test_dir / "new_file.py").write_text("print('hello')")
+            result = ControlClient(str(test_dir), timeout=60).request('commit_now')
+            assert result['committed'] == 1, f"Expected 1 commit, got {result}"
+            listener.join(5)
+            assert events and events[0]['type'] == 'tick' and events[0]['committed'] == 1
+            print("✓ commit-now executed by the daemon and streamed to subscribers")
+
+            # The CLI prints the daemon's result the way a local run would
+            (test_dir / "cli_file.py").write_text("print('cli')")
+            cli = subprocess.run([sys.executable, "-m", "autocommit.cli", "commit-now", str(test_dir)],
+                                 capture_output=True, text=True, timeout=60,
+                                 env=dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent)))
+            assert "✓ Committed cli_file.py: " in cli.stdout and "✓ Committed 1 file(s)\n" in cli.stdout, cli.stdout
+            lines = []
+            echo_result({'committed': 0, 'failed': 0, 'commits': [], 'error': 'repository busy',
+                         'large_files': [{'path': 'dump.bin', 'size': 5 * 1024 * 1024, 'action': 'skipped'}]},
+                        lines.append)
+            assert lines == ["⚠ Skipped large file dump.bin (5.0 MB)", "✗ Nothing committed: repository busy"], lines
+            lines = []
+            echo_result({'committed': 0, 'failed': 0, 'skipped': 'no free tick slot'}, lines.append)
+            assert lines == ["✗ Nothing committed: no free tick slot"], lines
+            print("✓ CLI commit-now renders the daemon result like a local run")
+
+            # A subscriber that stops reading is dropped instead of blocking ticks
+            subscribers = len(daemon.control._subscribers)
+            stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stalled.connect(str(daemon.control.socket_path))
+            stalled.sendall(b'{"cmd": "subscribe"}\n')
+            deadline = time.monotonic() + 5
+            while len(daemon.control._subscribers) == subscribers and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(daemon.control._subscribers) == subscribers + 1
+            publisher = threading.Thread(target=lambda: [daemon.control.publish({'type': 'test', 'data': 'x' * 65536})
+                                                         for _ in range(200)], daemon=True)
+            publisher.start()
+            publisher.join(10)
+            blocked = publisher.is_alive()
+            stalled.close()
+            assert not blocked, "publish() blocked on a stalled subscriber"
+            assert daemon.control._subscribers == []
+            print("✓ Stalled subscribers are dropped")
+
+            # Reload picks up config edits
+            (test_dir / ".autocommit").write_text('{"interval": 15}')
+            assert client.request('reload')['interval'] == 15
+            print("✓ Reload applied new interval")
+
+            try:
+                client.request('explode')
+                assert False, "Unknown commands should be rejected"
+            except ControlError:
+                pass
+        finally:
+            daemon.stop()
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+
+        assert not ControlClient(str(test_dir)).is_available()
+        print("✓ Socket removed on shutdown")
+
+        # On the event loop a stalled subscriber is dropped once its buffer is full
+        async def stalled_subscriber():
+            server = ControlServer(str(test_dir), {})
+            await server.start_async()
+            stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stalled.connect(str(server.socket_path))
+            stalled.sendall(b'{"cmd": "subscribe"}\n')
+            try:
+                while not server._subscribers:
+                    await asyncio.sleep(0.01)
+                writer = server._subscribers[0]
+                for _ in range(200):
+                    server.publish({'type': 'test', 'data': 'x' * 65536})
+                    await asyncio.sleep(0)
+                await asyncio.sleep(0.1)
+                return server._subscribers, writer.is_closing()
+            finally:
+                stalled.close()
+                server.stop()
+
+        subscribers, closed = asyncio.run(asyncio.wait_for(stalled_subscriber(), 10))
+        assert subscribers == [] and closed
+        print("✓ Stalled subscribers do not buffer events without limit")
+
+        print("\n✓ All control socket tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_control_socket()
+        print("\n🎉 Control socket testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Control socket testing failed: {e}")
+        exit(1)
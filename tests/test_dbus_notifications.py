@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script to verify D-Bus desktop notifications against a private session bus
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import pytest
+from autocommit.notifications import DBusNotificationBackend, DesktopNotifier
+
+jeepney = pytest.importorskip("jeepney")
+
+from jeepney import new_error, new_method_return
+from jeepney.bus_messages import message_bus
+from jeepney.io.blocking import open_dbus_connection
+
+def _start_session_bus():
+    """Start a throwaway dbus-daemon and return (process, address)"""
+    proc = subprocess.Popen(
+        ['dbus-daemon', '--session', '--nofork', '--print-address=1'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    address = proc.stdout.readline().strip()
+    return proc, address
+
+def _serve_notifications(address, received, ready, stop):
+    """Minimal org.freedesktop.Notifications implementation"""
+    conn = open_dbus_connection(bus=address)
+    conn.send_and_get_reply(message_bus.RequestName(DBusNotificationBackend.BUS_NAME))
+    ready.set()
+    next_id = 1
+    while not stop.is_set():
+        try:
+            msg = conn.receive(timeout=0.2)
+        except TimeoutError:
+            continue
+        if msg.header.fields.get(3) != 'Notify':  # 3 = MEMBER header field
+            continue
+        app_name, replaces_id, _icon, summary, body, _actions, _hints, _timeout = msg.body
+        received.append((replaces_id, summary, body))
+        if summary == 'invalid':
+            conn.send(new_error(msg, 'org.freedesktop.DBus.Error.InvalidArgs', 's', ('Bad arguments',)))
+            continue
+        if replaces_id:
+            notification_id = replaces_id
+        else:
+            notification_id = next_id
+            next_id += 1
+        conn.send(new_method_return(msg, 'u', (notification_id,)))
+    conn.close()
+
+def test_dbus_notifications():
+    """Test the D-Bus notification backend and DesktopNotifier integration"""
+    if not shutil.which('dbus-daemon'):
+        pytest.skip("dbus-daemon not available")
+
+    print("Testing D-Bus Notifications functionality:")
+    print("=" * 50)
+
+    bus_proc, address = _start_session_bus()
+    old_address = os.environ.get('DBUS_SESSION_BUS_ADDRESS')
+    os.environ['DBUS_SESSION_BUS_ADDRESS'] = address
+
+    received = []
+    ready = threading.Event()
+    stop = threading.Event()
+    server = threading.Thread(target=_serve_notifications, args=(address, received, ready, stop))
+    server.start()
+    try:
+        assert ready.wait(5), "Notification server did not start"
+
+        backend = DBusNotificationBackend()
+        assert backend.is_available(), "Session bus should be reachable"
+        print("✓ Connected to session bus")
+
+        # Notifications with the same key replace each other
+        assert backend.notify("GravityCommit", "first", replace_key="commit")
+        assert backend.notify("GravityCommit", "second", replace_key="commit")
+        assert backend.notify("GravityCommit Error", "oops", replace_key="error")
+        assert received[0][0] == 0, "First notification should not replace anything"
+        assert received[1][0] == 1, "Second notification should replace the first"
+        assert received[2][0] == 0, "A new key should create a new notification"
+        print(f"✓ Received notifications: {received}")
+
+        # One persistent connection serves every notification
+        connection = backend._connection
+        backend.notify("GravityCommit", "third", replace_key="commit")
+        assert backend._connection is connection
+        print("✓ Connection reused across notifications")
+
+        # An error reply is a failed notification, not an id
+        ids = dict(backend._notification_ids)
+        assert not backend.notify("invalid", "rejected", replace_key="commit")
+        assert backend._notification_ids == ids and backend._connection is connection
+        print("✓ D-Bus error replies are reported as failures")
+        backend.close()
+
+        # DesktopNotifier prefers D-Bus on Linux
+        notifier = DesktopNotifier()
+        if notifier.system == 'linux':
+            count = len(received)
+            assert notifier.send_notification("GravityCommit", "from DesktopNotifier")
+            assert len(received) == count + 1
+            notifier.dbus.close()
+            print("✓ DesktopNotifier delivered over D-Bus")
+    finally:
+        stop.set()
+        server.join(5)
+        bus_proc.terminate()
+        bus_proc.wait()
+        if old_address is None:
+            os.environ.pop('DBUS_SESSION_BUS_ADDRESS', None)
+        else:
+            os.environ['DBUS_SESSION_BUS_ADDRESS'] = old_address
+
+    # Without a bus the backend reports itself unavailable so callers fall back
+    os.environ['DBUS_SESSION_BUS_ADDRESS'] = 'unix:path=/nonexistent/bus'
+    try:
+        backend = DBusNotificationBackend()
+        assert not backend.notify("GravityCommit", "nobody listening")
+        print("✓ Unavailable bus reported for subprocess fallback")
+    finally:
+        if old_address is None:
+            os.environ.pop('DBUS_SESSION_BUS_ADDRESS', None)
+        else:
+            os.environ['DBUS_SESSION_BUS_ADDRESS'] = old_address
+
+    print("\n✓ All D-Bus Notifications tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_dbus_notifications()
+        print("\n🎉 D-Bus Notifications module testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ D-Bus Notifications testing failed: {e}")
+        exit(1)
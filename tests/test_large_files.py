@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the large-file policy of the commit pipeline
+"""
+
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from autocommit.commit_pipeline import CommitPipeline
+from autocommit.large_files import lfs_object_path
+
+def _git(test_dir, command):
+    return os.popen(f"git -C '{test_dir}' {command}").read()
+
+def test_large_files():
+    """Test skip, warn and lfs handling of files above the threshold"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        os.system("git add README.md")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing large file policy:")
+        print("=" * 50)
+
+        big = os.urandom(5000)
+        (test_dir / "dump.bin").write_bytes(big)
+        (test_dir / "small.py").write_text("print('small')")
+
+        # skip: the large file is left out, everything else is committed
+        pipeline = CommitPipeline(str(test_dir), large_file_threshold=1000, large_file_policy='skip')
+        run = pipeline.run()
+        assert run.committed_files == ["small.py"], run.committed_files
+        assert run.large_files == [{'path': 'dump.bin', 'size': 5000, 'action': 'skipped'}]
+        assert "dump.bin" not in _git(test_dir, "ls-files")
+        print("✓ skip leaves large files out")
+
+        # A dry run reports the same without writing anything
+        run = CommitPipeline(str(test_dir), large_file_threshold=1000, large_file_policy='skip').run(dry_run=True)
+        assert run.large_files[0]['action'] == 'skipped' and not run.groups
+        print("✓ Sizes are checked in dry runs too")
+
+        # lfs: a pointer is committed and the content stored for git-lfs
+        pipeline = CommitPipeline(str(test_dir), large_file_threshold=1000, large_file_policy='lfs')
+        run = pipeline.run()
+        assert sorted(run.committed_files) == [".gitattributes", "dump.bin"], run.committed_files
+        oid = hashlib.sha256(big).hexdigest()
+        pointer = _git(test_dir, "show HEAD:dump.bin")
+        assert pointer == f"version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize 5000\n", pointer
+        assert lfs_object_path(test_dir / ".git", oid).read_bytes() == big
+        assert "/dump.bin filter=lfs diff=lfs merge=lfs -text" in (test_dir / ".gitattributes").read_text()
+        assert "filter: lfs" in _git(test_dir, "check-attr filter -- dump.bin")
+        print("✓ lfs commits a pointer, stores the object and tracks the path")
+
+        # Without git-lfs installed git reports the file again; no empty commit follows
+        os.system("git reset -q")
+        # The pointer was indexed with the file's stat data; unless the index was
+        # written within the same second (racily clean) git trusts it, so touch
+        # the file to have git compare the contents
+        os.utime(test_dir / "dump.bin")
+        head = _git(test_dir, "rev-parse HEAD")
+        run = pipeline.run()
+        assert not run.committed_files, run.committed_files
+        assert [change.path for change in run.filtered] == ["dump.bin"], run.filtered
+        assert _git(test_dir, "rev-parse HEAD") == head
+        print("✓ An unchanged LFS file is not committed again")
+
+        # warn: committed as a regular blob
+        (test_dir / "other.bin").write_bytes(os.urandom(3000))
+        run = CommitPipeline(str(test_dir), large_file_threshold=1000, large_file_policy='warn').run()
+        assert run.committed_files == ["other.bin"], run.committed_files
+        assert run.large_files[-1] == {'path': 'other.bin', 'size': 3000, 'action': 'committed'}
+        assert _git(test_dir, "cat-file -s HEAD:other.bin").strip() == "3000"
+        print("✓ warn commits large files as usual")
+
+        # Files removed mid-tick (editor swap files) do not abort it
+        (test_dir / "notes.swp").write_text("swap")
+        (test_dir / "other.bin").write_bytes(b"replaced")
+        (test_dir / "keep.py").write_text("keep = 1")
+        pipeline = CommitPipeline(str(test_dir), large_file_threshold=1000, large_file_policy='skip')
+        pipeline.add_stage('vanish', lambda run: [(test_dir / name).unlink() for name in ("notes.swp", "other.bin")],
+                           after='snapshot')
+        run = pipeline.run()
+        assert run.error is None, run.error
+        assert sorted(run.committed_files) == ["keep.py", "other.bin"], run.committed_files
+        assert [change.path for change in run.filtered] == ["notes.swp"], run.filtered
+        assert "other.bin" not in _git(test_dir, "ls-files")
+
+        (test_dir / "late.tmp").write_text("temp")
+        (test_dir / "kept.py").write_text("kept = 1")
+        pipeline = CommitPipeline(str(test_dir))
+        pipeline.add_stage('vanish', lambda run: (test_dir / "late.tmp").unlink(), after='group')
+        run = pipeline.run()
+        assert run.error is None, run.error
+        assert run.committed_files == ["kept.py"], run.committed_files
+        assert "late.tmp" not in _git(test_dir, "ls-files")
+        print("✓ Files that disappear during a tick are skipped or committed as deleted")
+
+        try:
+            CommitPipeline(str(test_dir), large_file_policy='compress')
+            assert False, "Expected ValueError for an unknown policy"
+        except ValueError:
+            print("✓ Unknown policies are rejected")
+
+        print("\n" + "=" * 50)
+        print("Large file tests completed!")
+
+if __name__ == "__main__":
+    test_large_files()
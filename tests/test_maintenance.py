@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script to verify time-budgeted, cancellable repository maintenance
+"""
+
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+from autocommit.maintenance import MaintenanceRunner, count_loose_objects
+
+def test_maintenance():
+    """Test a full run, cancellation, the budget and resuming"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        objects_dir = test_dir / ".git" / "objects"
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        for i in range(10):
+            (test_dir / f"file_{i}.py").write_text(f"value = {i}")
+            os.system(f"git add file_{i}.py")
+            os.system(f"git commit -q -m 'Commit {i}'")
+
+        print("Testing repository maintenance:")
+        print("=" * 50)
+
+        # Only checked between tasks while git runs for less than a minute
+        runner = MaintenanceRunner(str(test_dir), poll_interval=60)
+        assert runner.is_due() and count_loose_objects(str(test_dir)) == 30
+
+        # A cancelled run stops between tasks and keeps the rest for later
+        calls = []
+        runner.should_cancel = lambda: len(calls) > 0 or calls.append(1)
+        result = runner.run()
+        assert result['stopped'] == 'cancelled' and result['completed'] == ['loose-objects'], result
+        assert result['pending'] == ['multi-pack-index', 'incremental-repack', 'commit-graph', 'prune']
+        assert list((objects_dir / "pack").glob("loose-*.pack"))
+        assert runner.is_due()
+        print("✓ Cancelled run packed loose objects and left 4 tasks pending")
+
+        # The next run resumes with the pending tasks
+        runner.should_cancel = None
+        result = runner.run()
+        assert result['stopped'] is None and result['failed'] == [], result
+        assert result['completed'] == ['multi-pack-index', 'incremental-repack', 'commit-graph', 'prune']
+        assert (objects_dir / "pack" / "multi-pack-index").exists()
+        assert (objects_dir / "info" / "commit-graphs" / "commit-graph-chain").exists()
+        assert count_loose_objects(str(test_dir)) == 0
+        assert not runner.is_due()
+        assert os.popen("git fsck --no-progress 2>&1").read() == ""
+        print("✓ Resumed run wrote the multi-pack-index and commit-graph")
+
+        # An exhausted budget stops before starting anything
+        result = MaintenanceRunner(str(test_dir), budget_seconds=0).run(['commit-graph'])
+        assert result['stopped'] == 'budget' and result['completed'] == []
+        print("✓ Budget is respected")
+
+        # A running git process is terminated as soon as cancel() is called
+        runner = MaintenanceRunner(str(test_dir), poll_interval=0.05)
+        threading.Timer(0.3, runner.cancel).start()
+        started = time.monotonic()
+        outcome = runner._run_task('slow', ['-c', 'alias.slow=!sleep 30', 'slow'], time.monotonic() + 60)
+        assert outcome == 'cancelled' and time.monotonic() - started < 5
+        print("✓ Running task terminated on cancel")
+
+        try:
+            runner.run(['gc-everything'])
+            assert False, "Expected ValueError for an unknown task"
+        except ValueError:
+            print("✓ Unknown tasks are rejected")
+
+        print("\n" + "=" * 50)
+        print("Maintenance tests completed!")
+
+if __name__ == "__main__":
+    test_maintenance()
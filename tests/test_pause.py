@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to verify pause/resume and pause conditions
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from autocommit.scheduler import Scheduler
+from autocommit.pause_conditions import PauseConditions
+from autocommit.project_daemon import ProjectDaemon
+
+BUILD_MARKER = "gravitycommit-test-build"
+
+def _fake_build():
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', BUILD_MARKER])
+
+def test_pause():
+    """Test timed auto-resume, pause conditions and persisted pauses"""
+
+    print("Testing pause and resume:")
+    print("=" * 50)
+
+    # Runs stop while paused and come back on their own after the duration
+    resumed = []
+    runs = []
+    scheduler = Scheduler(0, on_resume=lambda: resumed.append(time.monotonic()))
+    scheduler.start(None)
+    scheduler.add_job(lambda: runs.append(1), "fast", interval=0.05)
+    time.sleep(0.2)
+    assert runs
+    started = time.monotonic()
+    scheduler.pause_scheduling(0.01)  # 0.6 seconds
+    time.sleep(0.1)
+    paused_runs = len(runs)
+    time.sleep(0.3)
+    assert len(runs) == paused_runs and scheduler.get_pause()['reason'] == 'manual'
+    deadline = time.monotonic() + 5
+    while not resumed:
+        assert time.monotonic() < deadline, "Timed pause did not end"
+        time.sleep(0.02)
+    assert 0.5 <= resumed[0] - started < 1.5, resumed[0] - started
+    time.sleep(0.2)
+    assert len(runs) > paused_runs and not scheduler.paused and scheduler.paused_until is None
+    scheduler.stop()
+    print("✓ No runs while paused; a timed pause resumes on time by itself")
+
+    # Process and load conditions
+    conditions = PauseConditions([BUILD_MARKER], max_load=10 ** 6)
+    assert conditions.check() is None
+    build = _fake_build()
+    try:
+        time.sleep(0.2)
+        assert conditions.check() and 'runs' in conditions.check()
+    finally:
+        build.kill()
+        build.wait()
+    assert conditions.check() is None
+    load = os.getloadavg()[0]
+    if load > 0:
+        assert 'load average' in PauseConditions(max_load=load / 2).check()
+    assert not PauseConditions().enabled
+    print("✓ Conditions match running processes and the load average")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.chdir(test_dir)
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        try:
+            os.system("git init -q")
+            os.system("git config user.name 'Test User'")
+            os.system("git config user.email 'test@example.com'")
+            (test_dir / ".autocommit").write_text(f'{{"pause_when_processes": ["{BUILD_MARKER}"]}}')
+            os.system("git add .autocommit && git commit -q -m 'Initial commit'")
+
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+            scans = []
+            run = daemon.pipeline.run
+            daemon.pipeline.run = lambda **kwargs: scans.append(1) or run(**kwargs)
+            (test_dir / "module.py").write_text("value = 1")
+            build = _fake_build()
+            try:
+                time.sleep(0.2)
+                result = daemon.tick()
+                assert result['skipped'].startswith('paused while process') and not scans
+                status = daemon.get_status()
+                assert status['paused'] and status['pause']['condition'] and not status['pause']['paused']
+                # An explicit commit-now is not held back
+                assert daemon.tick(force=True)['committed'] == 1 and len(scans) == 1
+            finally:
+                build.kill()
+                build.wait()
+            (test_dir / "module.py").write_text("value = 2")
+            assert daemon.tick()['committed'] == 1
+            assert not daemon.get_status()['paused']
+            print("✓ Ticks skip without scanning while a build runs; status shows why")
+
+            # A manual pause survives a daemon restart
+            daemon._handle_pause(duration=5)
+            pause_file = test_dir / ".git" / "autocommit" / "pause.json"
+            assert pause_file.exists()
+            restarted = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+            assert restarted.scheduler.is_paused()
+            assert abs(restarted.scheduler.paused_until - daemon.scheduler.paused_until) < 0.01
+            assert restarted.get_status()['pause']['reason'] == 'manual'
+            restarted._handle_resume()
+            assert not pause_file.exists() and not restarted.get_status()['paused']
+            assert not ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None).scheduler.is_paused()
+            print("✓ Pauses are kept across restarts and cleared on resume")
+        finally:
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+
+    print("\n" + "=" * 50)
+    print("Pause tests completed!")
+
+if __name__ == "__main__":
+    test_pause()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify project registry functionality
+"""
+
+import os
+import time
+import tempfile
+from pathlib import Path
+from autocommit.project_registry import ProjectRegistry
+
+def test_project_registry():
+    """Test registering projects and reading cached status"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("Testing ProjectRegistry functionality:")
+        print("=" * 50)
+
+        registry = ProjectRegistry(str(Path(temp_dir) / "projects.db"))
+
+        # Register a few hundred projects
+        paths = []
+        for i in range(300):
+            project = Path(temp_dir) / f"project_{i:03d}"
+            project.mkdir()
+            paths.append(str(project))
+            registry.register(str(project), mode='container' if i % 2 else 'service', interval=5)
+        print("✓ Registered 300 projects")
+
+        # Daemons record their status
+        registry.update_status(paths[0], last_tick=time.time(), project_open=True,
+                               last_commit_sha="abc123", daemon_pid=os.getpid())
+        entry = registry.get(paths[0])
+        assert entry['project_open'] is True
+        assert entry['last_commit_sha'] == "abc123"
+        assert ProjectRegistry.is_pid_running(entry['daemon_pid'])
+        print("✓ Status recorded and read back")
+
+        # Listing answers from the index without touching the projects
+        start = time.monotonic()
+        projects = ProjectRegistry(str(Path(temp_dir) / "projects.db")).list_projects()
+        elapsed = time.monotonic() - start
+        assert len(projects) == 300
+        assert [p['path'] for p in projects] == sorted(str(Path(p).resolve()) for p in paths)
+        print(f"✓ Listed {len(projects)} projects in {elapsed * 1000:.1f} ms")
+
+        # Re-registering keeps cached status, remove drops the entry
+        registry.register(paths[1], interval=7)
+        assert registry.get(paths[1])['mode'] == 'container' and registry.get(paths[1])['interval'] == 7
+        registry.register(paths[0], mode='container')
+        assert registry.get(paths[0])['last_commit_sha'] == "abc123"
+        assert registry.get(paths[0])['interval'] == 5
+        assert registry.unregister(paths[0])
+        assert registry.get(paths[0]) is None
+        assert not registry.unregister(paths[0])
+        print("✓ Re-register and unregister")
+
+        try:
+            registry.update_status(paths[1], color='blue')
+            assert False, "Unknown fields should be rejected"
+        except ValueError:
+            pass
+
+        registry.close()
+        print("\n✓ All ProjectRegistry tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_project_registry()
+        print("\n🎉 ProjectRegistry module testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ ProjectRegistry testing failed: {e}")
+        exit(1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script to verify repository locking and busy detection
+"""
+
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+from autocommit.repo_lock import RepoLock, RepoBusyError, detect_git_operation
+from autocommit.commit_pipeline import CommitPipeline
+
+def test_repo_lock():
+    """Test the advisory lock, in-progress detection and pipeline behaviour"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        git_dir = test_dir / ".git"
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        (test_dir / "README.md").write_text("# Test Project")
+        os.system("git add README.md")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing repository locking:")
+        print("=" * 50)
+
+        # In-progress git operations are detected
+        assert detect_git_operation(str(test_dir)) is None
+        (git_dir / "MERGE_HEAD").write_text("0" * 40)
+        assert detect_git_operation(str(test_dir)) == 'merge'
+        (git_dir / "MERGE_HEAD").unlink()
+        (git_dir / "index.lock").write_text("")
+        assert detect_git_operation(str(test_dir)) == 'index.lock held'
+        assert detect_git_operation(str(test_dir), check_index_lock=False) is None
+        print("✓ Merge and index.lock detected")
+
+        # A busy repository ends the run once, without per-file failures
+        for name in ("a.py", "b.py", "c.py"):
+            (test_dir / name).write_text(f"# {name}")
+        pipeline = CommitPipeline(str(test_dir), lock_timeout=0.3)
+        run = pipeline.run()
+        assert run.stopped_at == 'lock' and 'index.lock held' in run.error, run.error
+        assert run.groups == [] and run.failed == []
+        print(f"✓ Busy repository skipped: {run.error}")
+
+        # The run proceeds once git lets go of the index
+        pipeline.lock_timeout = 10
+        threading.Timer(0.3, (git_dir / "index.lock").unlink).start()
+        run = pipeline.run()
+        assert run.to_dict()['committed'] == 3, run.to_dict()
+        assert run.timings['lock'] >= 0.2
+        print(f"✓ Committed after waiting {run.timings['lock']:.2f}s for index.lock")
+
+        # Autocommit processes exclude each other
+        holder = RepoLock(str(test_dir))
+        holder.acquire()
+        try:
+            try:
+                RepoLock(str(test_dir), timeout=0.2).acquire()
+                assert False, "Second lock should not be granted"
+            except RepoBusyError:
+                pass
+        finally:
+            holder.release()
+        with RepoLock(str(test_dir), timeout=1) as lock:
+            assert lock.held
+        print("✓ Advisory lock is exclusive across holders")
+
+        # Snapshot mode never writes the user's index, so index.lock doesn't block it
+        (git_dir / "index.lock").write_text("")
+        (test_dir / "d.py").write_text("# d")
+        started = time.monotonic()
+        run = CommitPipeline(str(test_dir), mode='snapshot', lock_timeout=5).run()
+        assert run.to_dict()['committed'] == 1 and time.monotonic() - started < 5
+        (git_dir / "index.lock").unlink()
+        print("✓ Snapshot mode ignores index.lock")
+
+        # Commit hooks run without index.lock held, so they can stage files themselves
+        hooks_dir = git_dir / "hooks"
+        (hooks_dir / "pre-commit").write_text(
+            "#!/bin/sh\n"
+            "git diff --cached --name-only | grep -q bad.py && exit 1\n"
+            "date > hooked.txt && git add hooked.txt\n")
+        (hooks_dir / "commit-msg").write_text("#!/bin/sh\necho 'Checked-by: hook' >> \"$1\"\n")
+        for name in ("pre-commit", "commit-msg"):
+            (hooks_dir / name).chmod(0o755)
+        (test_dir / "e.py").write_text("# e")
+        (test_dir / "bad.py").write_text("# bad")
+        run = CommitPipeline(str(test_dir), strategy='per-file').run()
+        result = run.to_dict()
+        # d.py is still uncommitted on the branch after the snapshot above
+        assert result['committed'] == 2 and result['failed'] == 1, result
+        assert 'hooked.txt' in os.popen("git log -2 --name-only --format=").read()
+        assert 'Checked-by: hook' in os.popen("git log -1 --format=%B").read()
+        assert not (git_dir / "index.lock").exists()
+        assert 'bad.py' not in os.popen("git diff --cached --name-only").read()
+        print("✓ Hooks can stage files; a rejected group fails alone")
+
+        print("\n✓ All repository lock tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_repo_lock()
+        print("\n🎉 Repository lock testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Repository lock testing failed: {e}")
+        exit(1)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the asyncio daemon runtime
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+from autocommit.project_daemon import ProjectDaemon
+from autocommit.runtime import DaemonRuntime
+from autocommit.control_socket import ControlClient
+from autocommit.maintenance import MaintenanceRunner
+from autocommit.tick_slots import TickSlots
+
+def _make_project(path: Path, interval: float):
+    path.mkdir()
+    os.system(f"git -C '{path}' init -q")
+    os.system(f"git -C '{path}' config user.name 'Test User'")
+    os.system(f"git -C '{path}' config user.email 'test@example.com'")
+    (path / "README.md").write_text("# Test Project")
+    (path / ".autocommit").write_text(f'{{"interval": {interval}}}')
+    os.system(f"git -C '{path}' add -A && git -C '{path}' commit -q -m 'Initial commit'")
+
+def _commit_count(path: Path) -> int:
+    return int(os.popen(f"git -C '{path}' rev-list --count HEAD").read())
+
+def _git_log(path: Path) -> str:
+    return os.popen(f"git -C '{path}' log --name-only --format=").read()
+
+def test_runtime():
+    """Test several projects ticking concurrently on one event loop"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        projects = [Path(temp_dir) / f"project_{i}" for i in range(3)]
+        for path in projects:
+            _make_project(path, 0.01)  # 0.6 seconds
+
+        print("Testing asyncio daemon runtime:")
+        print("=" * 50)
+
+        threads_before = threading.active_count()
+        daemons = [ProjectDaemon(str(path), always_open=True, echo=lambda message: None) for path in projects]
+        runtime = DaemonRuntime(daemons[:2], max_workers=2, echo=lambda message: None)
+        runner = threading.Thread(target=runtime.run_forever, daemon=True)
+        runner.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not all(ControlClient(str(path)).is_available() for path in projects[:2]):
+                assert time.monotonic() < deadline, "Control sockets did not come up"
+                time.sleep(0.05)
+            print("✓ Control sockets served from the event loop")
+
+            for path in projects:
+                (path / "module.py").write_text("value = 1")
+            deadline = time.monotonic() + 10
+            while not all(_commit_count(path) == 2 for path in projects[:2]):
+                assert time.monotonic() < deadline, "Ticks did not commit"
+                time.sleep(0.1)
+            print("✓ Both projects committed from their own tick tasks")
+
+            # Another project joins the running loop
+            runtime.add(daemons[2])
+            deadline = time.monotonic() + 10
+            while _commit_count(projects[2]) != 2:
+                assert time.monotonic() < deadline, "Added project did not commit"
+                time.sleep(0.1)
+            # The tick is counted once it has finished, just after its commit
+            while ControlClient(str(projects[2])).request('status')['ticks'] < 1:
+                assert time.monotonic() < deadline, "Added project's tick was not counted"
+                time.sleep(0.05)
+            assert ControlClient(str(projects[2])).request('status')['interval'] == 0.01
+            # Event loop, control sockets and scheduling add no per-project threads
+            assert threading.active_count() - threads_before <= 1 + runtime.max_workers
+            print(f"✓ 3 projects on {threading.active_count() - threads_before} extra threads")
+
+            # Removing a project cancels its task and closes its socket
+            runtime.remove(str(projects[0]))
+            deadline = time.monotonic() + 5
+            while ControlClient(str(projects[0])).is_available():
+                assert time.monotonic() < deadline, "Removed project still served"
+                time.sleep(0.05)
+            assert ControlClient(str(projects[1])).is_available()
+            print("✓ Removing a project cancels only its task")
+        finally:
+            runtime.stop()
+            runner.join(10)
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+
+        assert not runner.is_alive()
+        assert not any(ControlClient(str(path)).is_available() for path in projects)
+        print("✓ stop() shuts every project down")
+
+        # A tick waiting for a tick slot leaves the single worker to control commands
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        os.environ['GRAVITYCOMMIT_TICK_SLOTS'] = str(Path(temp_dir) / "tick-slots")
+        busy_project = Path(temp_dir) / "busy_project"
+        _make_project(busy_project, 0.05)  # 3 seconds, which is also how long a tick waits for a slot
+        (busy_project / ".autocommit").write_text('{"interval": 0.05, "max_concurrent_ticks": 1}')
+        os.system(f"git -C '{busy_project}' commit -q -am 'One tick at a time'")
+        (busy_project / "module.py").write_text("value = 1")
+        blocker = TickSlots(1)
+        blocker.acquire()
+        daemon = ProjectDaemon(str(busy_project), always_open=True, echo=lambda message: None)
+        runtime = DaemonRuntime([daemon], max_workers=1, echo=lambda message: None)
+        runner = threading.Thread(target=runtime.run_forever, daemon=True)
+        runner.start()
+        try:
+            client = ControlClient(str(busy_project))
+            deadline = time.monotonic() + 5
+            while not client.is_available():
+                assert time.monotonic() < deadline, "Control socket did not come up"
+                time.sleep(0.05)
+            # The first tick comes due within 4 seconds and then waits for the slot
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                assert client.request('ping') == 'pong'
+                assert client.request('status')['tick_latency']['slot_wait']['count'] == 0
+                assert client.request('schedule_list') == []
+                assert time.monotonic() - started < 1
+                time.sleep(0.2)
+            assert "module.py" not in _git_log(busy_project)
+            blocker.release()
+            deadline = time.monotonic() + 10
+            while "module.py" not in _git_log(busy_project):
+                assert time.monotonic() < deadline, "Tick did not commit once the slot was free"
+                time.sleep(0.1)
+            assert client.request('status')['tick_latency']['slot_wait']['count'] >= 1
+        finally:
+            blocker.release()
+            runtime.stop()
+            runner.join(10)
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+            os.environ.pop('GRAVITYCOMMIT_TICK_SLOTS', None)
+        print("✓ Waiting for a tick slot does not hold up control commands")
+
+        # Cancelling async maintenance terminates the running git process
+        async def cancel_maintenance():
+            maintenance = MaintenanceRunner(str(projects[0]), poll_interval=60)
+            task = asyncio.ensure_future(maintenance._run_task_async(
+                'slow', ['-c', 'alias.slow=!sleep 30', 'slow'], time.monotonic() + 60, None))
+            await asyncio.sleep(0.3)
+            started = time.monotonic()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return time.monotonic() - started
+
+        assert asyncio.run(cancel_maintenance()) < 5
+        print("✓ Cancelled maintenance task terminated its git process")
+
+        print("\n" + "=" * 50)
+        print("Runtime tests completed!")
+
+if __name__ == "__main__":
+    test_runtime()
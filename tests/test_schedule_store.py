@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script to verify persisted schedules and their catch-up
+"""
+
+import os
+import json
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from autocommit.schedule_store import ScheduleStore
+from autocommit.scheduler import Scheduler
+from autocommit.project_daemon import ProjectDaemon
+from autocommit.control_socket import ControlClient
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.05)
+
+def test_schedule_store():
+    """Test schedules in config, daemon loading, restart catch-up and clock jumps"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.chdir(test_dir)
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        try:
+            os.system("git init -q")
+            os.system("git config user.name 'Test User'")
+            os.system("git config user.email 'test@example.com'")
+            (test_dir / "README.md").write_text("# Test Project")
+            os.system("git add README.md && git commit -q -m 'Initial commit'")
+
+            print("Testing persisted schedules:")
+            print("=" * 50)
+
+            store = ScheduleStore(str(test_dir))
+            store.add({'type': 'daily', 'time': '9:05'})
+            store.add({'type': 'weekly', 'day': 'Friday', 'time': '17:30', 'catch_up': 'skip'})
+            store.add({'type': 'daily', 'time': '09:05', 'catch_up': 'once'})  # replaces the first
+            for bad in ({'type': 'daily', 'time': '25:00'}, {'type': 'weekly', 'day': 'someday', 'time': '10:00'},
+                        {'type': 'daily', 'time': '10:00', 'catch_up': 'twice'}):
+                try:
+                    store.add(bad)
+                    assert False, f"Expected ValueError for {bad}"
+                except ValueError:
+                    pass
+            saved = json.loads((test_dir / ".autocommit").read_text())['schedules']
+            assert saved == [{'type': 'weekly', 'day': 'friday', 'time': '17:30', 'catch_up': 'skip'},
+                             {'type': 'daily', 'time': '09:05', 'catch_up': 'once'}]
+            assert [spec['id'] for spec in store.list()] == ['friday@17:30', 'daily@09:05']
+            print("✓ Schedules are validated, normalized and saved in .autocommit")
+
+            # A running daemon serves them with the next run it computed
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+            daemon.start()
+            try:
+                jobs = ControlClient(str(test_dir)).request('schedule_list')
+                assert {job['id'] for job in jobs} == {'daily@09:05', 'friday@17:30'}
+                for job in jobs:
+                    assert job['next_run'] > time.time() and job['last_run'] is None
+                assert jobs[0]['next_run'] <= jobs[1]['next_run']
+
+                store.add({'type': 'hourly', 'minute': 15})
+                ControlClient(str(test_dir)).request('reload')
+                assert len(ControlClient(str(test_dir)).request('schedule_list')) == 3
+                ControlClient(str(test_dir)).request('schedule_clear')
+                assert ControlClient(str(test_dir)).request('schedule_list') == []
+                assert store.list() == []
+                print("✓ Daemon loads, reloads and clears schedules")
+            finally:
+                daemon.stop()
+
+            # Runs missed while the daemon was down: 'once' commits, 'skip' does not
+            store.add({'type': 'daily', 'time': '03:00'})
+            store.add({'type': 'hourly', 'minute': 30, 'catch_up': 'skip'})
+            two_days_ago = time.time() - 2 * 86400
+            store._save_state({'daily@03:00': {'since': two_days_ago, 'last_run': two_days_ago},
+                               'hourly:30': {'since': two_days_ago, 'last_run': two_days_ago}})
+            (test_dir / "module.py").write_text("value = 1")
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+            daemon.start()
+            try:
+                daily = daemon._schedule_jobs['daily@03:00']
+                hourly = daemon._schedule_jobs['hourly:30']
+                _wait_for(lambda: daily.runs == 1)
+                assert "module.py" in os.popen("git log --name-only --format=").read()
+                assert daily.target > datetime.now() and daily.target.hour == 3
+                assert store.last_run('daily@03:00') > two_days_ago
+                assert hourly.runs == 0 and hourly.skipped == 1
+                assert store.load_state()['hourly:30']['since'] > two_days_ago
+            finally:
+                daemon.stop()
+            print("✓ Restart runs a missed 'once' schedule and skips a 'skip' one")
+        finally:
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+
+    # Suspend: the monotonic clock stands still while the wall clock moves on
+    shift = [0.0]
+    scheduler = Scheduler(0, clock=lambda: time.monotonic() - shift[0])
+    fired = []
+    once = scheduler.add_schedule({'type': 'daily', 'time': '03:00'}, lambda: fired.append('once'))
+    skip = scheduler.add_schedule({'type': 'hourly', 'minute': 30, 'catch_up': 'skip'},
+                                  lambda: fired.append('skip'))
+    assert skip.catch_up == 'skip'
+    scheduler.run_pending()
+    assert fired == []
+    for job in (once, skip):
+        # The host slept through the job's time
+        job.target = datetime.now() - timedelta(minutes=5)
+    shift[0] = 3600.0
+    scheduler._check_clock_jump()
+    scheduler.run_pending()
+    assert fired == ['once'] and skip.skipped == 1
+    assert once.target > datetime.now() and skip.target > datetime.now()
+    scheduler._check_clock_jump()
+    scheduler.run_pending()
+    assert fired == ['once']
+    assert scheduler._wait_time(scheduler.clock()) <= Scheduler.CLOCK_CHECK_INTERVAL
+    print("✓ Wake-up from suspend catches up or skips calendar jobs")
+
+    print("\n" + "=" * 50)
+    print("Schedule store tests completed!")
+
+if __name__ == "__main__":
+    test_schedule_store()
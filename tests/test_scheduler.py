@@ -4,7 +4,9 @@ Test script to verify scheduler functionality
 """
 
 import time
-from autocommit.scheduler import Scheduler
+import threading
+from datetime import datetime
+from autocommit.scheduler import Scheduler, next_daily, next_weekly, next_hourly
 
 def test_scheduler():
     """Test the Scheduler class functionality"""
@@ -39,9 +41,113 @@ def test_scheduler():
     print("\n✓ All Scheduler tests passed!")
     return True
 
+def test_scheduler_core():
+    """Test instant stop, drift-free periods, no overlap and per-instance jobs"""
+
+    print("Testing heap scheduler core:")
+    print("=" * 50)
+
+    # stop() wakes the scheduler thread instead of waiting out the interval
+    scheduler = Scheduler(interval_minutes=60)
+    scheduler.start(lambda: None)
+    assert 3590 < scheduler.next_run_at - time.time() <= 3600
+    started = time.monotonic()
+    scheduler.stop()
+    assert not scheduler.thread.is_alive() and time.monotonic() - started < 0.5
+    print("✓ stop() returns immediately during a 60 minute wait")
+
+    # Periodic deadlines stay in phase even though each run takes time
+    scheduler = Scheduler(interval_minutes=0)
+    scheduler.start(None)
+    runs = []
+    def slow():
+        runs.append(time.monotonic())
+        time.sleep(0.03)
+    job = scheduler.add_job(slow, "slow", interval=0.1)
+    first_deadline = job.deadline
+    time.sleep(1.05)
+    scheduler.cancel_job(job)
+    assert len(runs) == 10, runs
+    offsets = [(run - first_deadline) - 0.1 * i for i, run in enumerate(runs)]
+    assert max(offsets) < 0.05, offsets
+    print(f"✓ {len(runs)} runs with no drift (max lateness {max(offsets) * 1000:.1f}ms)")
+
+    # A run that outlasts its interval is never overlapped; missed slots are skipped
+    active = {'now': 0, 'max': 0}
+    release = threading.Event()
+    def long_tick():
+        active['now'] += 1
+        active['max'] = max(active['max'], active['now'])
+        release.wait(0.35)
+        active['now'] -= 1
+    job = scheduler.add_job(long_tick, "long", interval=0.1)
+    time.sleep(0.55)
+    scheduler.cancel_job(job)
+    release.set()
+    assert active['max'] == 1 and job.skipped >= 2, (active, job.skipped)
+    print(f"✓ Long runs do not overlap ({job.skipped} slots skipped)")
+
+    # Jobs belong to their own instance
+    other = Scheduler(interval_minutes=0)
+    scheduler.schedule_at_time("14:00", lambda: None)
+    scheduler.schedule_weekly("Friday", "17:30", lambda: None)
+    other.schedule_hourly(15, lambda: None)
+    assert sorted(scheduler.get_scheduled_jobs()) == ["Friday at 17:30", "daily at 14:00"]
+    assert other.get_scheduled_jobs() == ["hourly at minute 15"]
+    other.clear_schedule()
+    assert other.get_scheduled_jobs() == [] and len(scheduler.get_scheduled_jobs()) == 2
+    assert scheduler.schedule_at_time("25:00", lambda: None) is None
+    assert scheduler.schedule_weekly("someday", "10:00", lambda: None) is None
+    scheduler.stop()
+    print("✓ Schedules are per instance; invalid times and days are rejected")
+
+    # Calendar arithmetic
+    now = datetime(2024, 3, 6, 15, 30)  # a Wednesday
+    assert next_daily(14, 0, now) == datetime(2024, 3, 7, 14, 0)
+    assert next_daily(16, 0, now) == datetime(2024, 3, 6, 16, 0)
+    assert next_weekly(2, 15, 30, now) == datetime(2024, 3, 13, 15, 30)
+    assert next_weekly(4, 9, 0, now) == datetime(2024, 3, 8, 9, 0)
+    assert next_hourly(15, now) == datetime(2024, 3, 6, 16, 15)
+    print("✓ Next daily, weekly and hourly times")
+
+    # Thousands of jobs share one thread and the heap copes with churn
+    clock = {'now': 0.0}
+    many = Scheduler(interval_minutes=0, clock=lambda: clock['now'])
+    fired = []
+    jobs = [many.add_job(lambda i=i: fired.append(i), f"job {i}", interval=1 + i % 100) for i in range(5000)]
+    for job in jobs[::2]:
+        many.cancel_job(job)
+    assert len(many._heap) < 5000
+    clock['now'] = 50.5
+    many.run_pending()
+    assert len(fired) == sum(1 for i in range(1, 5000, 2) if 1 + i % 100 <= 50.5)
+    assert all(job.deadline > 50.5 for job in jobs[1::2])
+    print(f"✓ 5000 jobs scheduled, 2500 cancelled, {len(fired)} fired by run_pending()")
+
+    # A triggered run leaves the interval job's regular slots where they were
+    clock['now'] = 0.0
+    timed = Scheduler(interval_minutes=0, clock=lambda: clock['now'])
+    runs = []
+    job = timed.add_job(lambda: runs.append(clock['now']), "every 10s", interval=10)
+    assert job.deadline == 10
+    clock['now'] = 3.0
+    timed.trigger(job)
+    timed.run_pending()
+    assert runs == [3.0] and job.deadline == 10 and not job.triggered
+    clock['now'] = 10.0
+    timed.run_pending()
+    assert runs == [3.0, 10.0] and job.deadline == 20
+    clock['now'] = 19.0
+    timed.trigger(job)
+    clock['now'] = 21.0  # the triggered run started late and overran slot 20
+    timed.run_pending()
+    assert runs == [3.0, 10.0, 21.0] and job.deadline == 30
+    print("✓ trigger() runs an interval job now without moving its next regular run")
+
 if __name__ == "__main__":
     try:
         test_scheduler()
+        test_scheduler_core()
         print("\n🎉 Scheduler module testing completed successfully!")
     except Exception as e:
         print(f"\n❌ Scheduler testing failed: {e}")
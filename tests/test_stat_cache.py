@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script to verify stat-cache based change detection
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from autocommit.git_operations import GitOperations
+from autocommit.stat_cache import StatCache
+from autocommit.commit_pipeline import CommitPipeline
+
+def test_stat_cache():
+    """Test that unchanged trees are answered without running git status"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+
+        os.chdir(test_dir)
+        os.system("git init -q")
+        os.system("git config user.name 'Test User'")
+        os.system("git config user.email 'test@example.com'")
+        for package in ("core", "utils", "docs"):
+            (test_dir / package).mkdir()
+            for i in range(20):
+                (test_dir / package / f"module_{i}.py").write_text(f"value = {i}")
+        (test_dir / ".gitignore").write_text("build/\n")
+        os.system("git add .")
+        os.system("git commit -q -m 'Initial commit'")
+
+        print("Testing StatCache functionality:")
+        print("=" * 50)
+
+        git_ops = GitOperations(str(test_dir))
+        calls = []
+        original_get_changes = git_ops.get_changes
+
+        def counting_get_changes(paths=None):
+            calls.append(paths)
+            return original_get_changes(paths)
+
+        git_ops.get_changes = counting_get_changes
+
+        # First check builds the cache with one full status
+        assert git_ops.has_changes() is False
+        assert calls == [None]
+        cache = StatCache(str(test_dir))
+        assert cache.load() and len(cache.files) == 61
+        print("✓ Cache built from one full git status")
+
+        # Unchanged tree: no git process at all
+        calls.clear()
+        assert git_ops.has_changes() is False
+        assert calls == [], f"Expected no git status, got {calls}"
+        print("✓ Unchanged tree answered from stat data alone")
+
+        # An in-place edit is narrowed to that file
+        (test_dir / "core" / "module_3.py").write_text("value = 'changed'")
+        calls.clear()
+        assert git_ops.has_changes() is True
+        assert calls == [['core/module_3.py']], calls
+        print("✓ Modified file found without a full status")
+
+        # New files are found through their directory's mtime
+        (test_dir / "core" / "module_3.py").write_text("value = 3")
+        (test_dir / "utils" / "helpers.py").write_text("def helper(): pass")
+        calls.clear()
+        changes = git_ops.detect_changes(StatCache(str(test_dir)))
+        assert changes == {'utils/helpers.py': 'added'}, changes
+        assert calls and calls[-1] is not None and 'utils/helpers.py' in calls[-1]
+        print("✓ New file found via directory mtime")
+
+        # Ignored output doesn't keep the tree dirty
+        (test_dir / "utils" / "helpers.py").unlink()
+        (test_dir / "build").mkdir()
+        (test_dir / "build" / "artifact.bin").write_bytes(b"\0" * 1024)
+        assert git_ops.has_changes() is False
+        calls.clear()
+        (test_dir / "build" / "artifact2.bin").write_bytes(b"\0" * 1024)
+        assert git_ops.has_changes() is False
+        print("✓ Ignored directories settle and are not rescanned")
+
+        # Commits made by the pipeline keep the cache valid
+        (test_dir / "docs" / "module_0.py").write_text("value = 'docs'")
+        (test_dir / "docs" / "guide.md").write_text("# Guide")
+        pipeline = CommitPipeline(str(test_dir), git_ops=git_ops)
+        assert pipeline.run().to_dict()['committed'] == 2
+        calls.clear()
+        assert git_ops.has_changes() is False
+        assert all(paths is not None for paths in calls), f"Cache should stay valid after commits: {calls}"
+        print("✓ Pipeline commits update the cache")
+
+        # Outside index changes invalidate it
+        (test_dir / "core" / "module_5.py").write_text("value = 55")
+        os.system("git add core/module_5.py")
+        calls.clear()
+        assert git_ops.has_changes() is True
+        assert calls == [None], calls
+        print("✓ Index changes by the user trigger a rebuild")
+
+        print("\n✓ All StatCache tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_stat_cache()
+        print("\n🎉 StatCache testing completed successfully!")
+    except Exception as e:
+        print(f"\n❌ StatCache testing failed: {e}")
+        exit(1)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script to verify host-wide tick slots and tick spreading
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from autocommit.tick_slots import TickSlots, TickSlotsBusy
+from autocommit.scheduler import Scheduler, phase_for
+from autocommit.project_daemon import ProjectDaemon
+
+BUILD_MARKER = "gravitycommit-test-build"
+
+HOLD_SLOT = """
+import sys, time
+from autocommit.tick_slots import TickSlots
+slots = TickSlots(int(sys.argv[2]), sys.argv[1])
+slots.acquire(timeout=5)
+print(slots.slot, flush=True)
+time.sleep(30)
+"""
+
+async def _heartbeat(ticks):
+    while True:
+        ticks.append(time.monotonic())
+        await asyncio.sleep(0.02)
+
+def test_tick_slots():
+    """Test the cap across processes, timeouts and a daemon tick waiting for a slot"""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        slots_dir = Path(temp_dir) / "tick-slots"
+
+        print("Testing host-wide tick slots:")
+        print("=" * 50)
+
+        # Another process holds one of the two slots
+        holder = subprocess.Popen([sys.executable, '-c', HOLD_SLOT, str(slots_dir), '2'],
+                                  stdout=subprocess.PIPE, text=True,
+                                  env=dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent)))
+        try:
+            held = int(holder.stdout.readline())
+            first = TickSlots(2, slots_dir)
+            assert first.acquire(timeout=1) < 0.5 and first.slot == 1 - held
+            second = TickSlots(2, slots_dir, initial_delay=0.02)
+            started = time.monotonic()
+            try:
+                second.acquire(timeout=0.3)
+                assert False, "Expected TickSlotsBusy with both slots taken"
+            except TickSlotsBusy:
+                assert time.monotonic() - started < 1
+            print("✓ Third ticker is refused while another process and this one hold both slots")
+
+            first.release()
+            assert second.acquire(timeout=1) < 0.5
+            second.release()
+            holder.kill()
+            holder.wait()
+            with TickSlots(2, slots_dir) as a, TickSlots(2, slots_dir) as b:
+                assert {a.slot, b.slot} == {0, 1}
+            print("✓ Slots are freed on release and when the holding process dies")
+        finally:
+            holder.kill()
+            holder.wait()
+
+        assert TickSlots(0, slots_dir).acquire(timeout=0) == 0.0
+        print("✓ A limit of 0 disables the cap")
+
+        # The async wait sleeps on the event loop, so other tasks keep running
+        async def wait_async():
+            holder, waiter = TickSlots(1, slots_dir), TickSlots(1, slots_dir, initial_delay=0.02)
+            holder.acquire()
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.3, holder.release)
+            ticks = []
+            beat = loop.create_task(_heartbeat(ticks))
+            waited = await waiter.acquire_async(timeout=2)
+            beat.cancel()
+            waiter.release()
+            return waited, len(ticks)
+
+        waited, beats = asyncio.run(wait_async())
+        assert waited >= 0.25 and beats >= 5, (waited, beats)
+        print("✓ acquire_async() waits without blocking the event loop")
+
+        # Phases are deterministic per project and spread over the interval
+        phases = [phase_for(f"/home/user/project_{i}") for i in range(1000)]
+        assert phases[0] == phase_for("/home/user/project_0")
+        assert all(0 <= phase < 1 for phase in phases)
+        assert all(60 <= sum(1 for p in phases if i / 10 <= p < (i + 1) / 10) <= 140 for i in range(10))
+        scheduler = Scheduler(interval_minutes=10, phase=0.25, jitter=1000)
+        scheduler.start(lambda: None)
+        job = scheduler.interval_job
+        slot_wall = time.time() + (job.slot - time.monotonic())
+        assert abs((slot_wall - 150) % 600) < 1 or abs((slot_wall - 150) % 600 - 600) < 1, slot_wall % 600
+        assert 0 <= job.deadline - job.slot <= 150  # jitter capped at a quarter of the interval
+        scheduler.set_interval(20)
+        slot_wall = time.time() + (job.slot - time.monotonic())
+        assert abs((slot_wall - 300) % 1200) < 1 or abs((slot_wall - 300) % 1200 - 1200) < 1
+        scheduler.stop()
+        print("✓ Per-project phase pins ticks to their own offset; jitter stays bounded")
+
+        # A daemon tick waits for a slot and reports how long it waited
+        test_dir = Path(temp_dir) / "test_project"
+        test_dir.mkdir()
+        os.chdir(test_dir)
+        os.environ['GRAVITYCOMMIT_REGISTRY'] = str(Path(temp_dir) / "projects.db")
+        os.environ['GRAVITYCOMMIT_TICK_SLOTS'] = str(slots_dir)
+        try:
+            os.system("git init -q")
+            os.system("git config user.name 'Test User'")
+            os.system("git config user.email 'test@example.com'")
+            (test_dir / ".autocommit").write_text('{"interval": 0.02, "max_concurrent_ticks": 1}')
+            os.system("git add .autocommit && git commit -q -m 'Initial commit'")
+            daemon = ProjectDaemon(str(test_dir), always_open=True, echo=lambda message: None)
+
+            blocker = TickSlots(1)
+            blocker.acquire()
+            (test_dir / "a.py").write_text("a = 1")
+            result = daemon.tick()
+            assert result['skipped'] == 'no free tick slot', result
+            threading.Timer(0.3, blocker.release).start()
+            result = daemon.tick()
+            assert result['committed'] == 1 and result['slot_wait'] >= 0.25, result
+            latency = daemon.get_status()['tick_latency']
+            assert latency['slot_wait']['count'] == 1 and latency['slot_wait']['max_ms'] >= 250
+            assert latency['duration']['count'] == 2
+            print(f"✓ Tick waited {result['slot_wait']:.2f}s for a slot; latency is in the status")
+
+            # A paused tick finds out before it waits for a slot, also on the event loop
+            blocker.acquire()
+            build = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', BUILD_MARKER])
+            try:
+                time.sleep(0.2)
+                daemon.pause_conditions.configure([BUILD_MARKER], 0)
+
+                async def paused_tick():
+                    daemon._tick_async_lock = asyncio.Lock()
+                    return await daemon.tick_async()
+
+                started = time.monotonic()
+                result = asyncio.run(paused_tick())
+                assert result['skipped'].startswith('paused while'), result
+                assert time.monotonic() - started < 1  # a slot wait would last the 1.2s interval
+                assert daemon.get_status()['tick_latency']['slot_wait']['count'] == 1
+            finally:
+                build.kill()
+                build.wait()
+                blocker.release()
+            print("✓ Paused ticks skip without taking or waiting for a slot")
+        finally:
+            os.environ.pop('GRAVITYCOMMIT_REGISTRY', None)
+            os.environ.pop('GRAVITYCOMMIT_TICK_SLOTS', None)
+
+        print("\n" + "=" * 50)
+        print("Tick slot tests completed!")
+
+if __name__ == "__main__":
+    test_tick_slots()